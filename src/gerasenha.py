@@ -12,13 +12,13 @@ Available classes:
 - PasswordGenerator: Show the interface.
 
 Usage:
-python3 gerasenha.py
+python3 gerasenha.py [--timing]
 """
 
 __title__ = 'Gerador de Senhas'
 __author__ = 'Odmar Miranda'
-__version__ = '2.1.1'
-__date__ = '2020-09-09'
+__version__ = '2.2.0'
+__date__ = '2026-10-17'
 __description__ = 'Gerador parametrizável de senhas.'
 __long_description__ = '''\n
 Este programa gera senhas pseudo-aleatórias de tamanho variável de
@@ -27,7 +27,7 @@ o módulo 'pwgen'.
 \n'''
 __license__ = 'GNU GPLv3 http://www.gnu.org/licenses'
 __copyright__ = '\u00A9 2014, 2020 Odmar Miranda'
-__release__ = '2020-09-09'
+__release__ = '2026-10-17'
 
 # This file is part of GeraSenha.
 #
@@ -133,10 +133,54 @@ __release__ = '2020-09-09'
 #                         Cause: Password displayed as label.
 #                         Solution: Use an entry box to password
 #                                   display.
+# 2.2.0     2026-10-17  - Password robustness band is looked up in the
+#                         'ROBUSTNESS_LIMITS' table and the progress bar
+#                         is only reconfigured when the band changes.
+#                       - Character sets are compiled once by
+#                         'pwgen.GetAlphabet'.
+#                       - 'require_all_check' checkbox makes every
+#                         selected type of character appear in the
+#                         password.
+#                       - Passwords are taken from a 'pwgen.PasswordPool',
+#                         refilled in the background.
+#                       - Passphrase mode: words drawn from a compiled
+#                         wordlist instead of characters.  The length
+#                         selector sets the number of words.
+#                       - 'check_entry' field scores a typed password
+#                         with 'pwstrength', once typing pauses.
+#                       - Batch window ('BatchPanel'): passwords are
+#                         generated by a worker thread, collected with
+#                         'root.after' polling and shown in a
+#                         'VirtualList', which only draws the visible
+#                         rows.  Results can be exported to a file.
+#                       - Faster start-up: the window is shown before
+#                         the toolbar images are loaded, images and the
+#                         help text are loaded once and cached, and
+#                         'pwstrength' is imported on first use.  Asset
+#                         paths are relative to the module, not to the
+#                         current directory.
+#                       - The help window is reused and no longer runs
+#                         a nested main loop.
+#                       - '--timing' option reports the start-up times.
+#                       - Pronounceable mode, from the n-gram model of
+#                         'pwgen.GeneratePronounceable'.
 
 # imports --------------------------------------------------------------------
+import time
+
+# Start of the imports, reported by the '--timing' option.
+_IMPORT_START = time.perf_counter()
+
+import bisect
+import functools
 import tkinter as tk
+import tkinter.filedialog
+import tkinter.font
 import tkinter.messagebox
+import os
+import queue
+import sys
+import threading
 
 from tkinter import ttk
 
@@ -148,19 +192,63 @@ Este programa é um software livre.
 Você pode redistribuí-lo ou modificá-lo dentro dos termos da Licença Pública Geral GNU como publicada pela Fundação do Software Livre (FSF), tanto na versão 3 da Licença quanto em qualquer versão posterior.
 '''
 
+# Entropy limits, in bits, of the password robustness bands and the
+# progress bar style of each band.
+ROBUSTNESS_LIMITS = (28, 36, 60, 128)
+ROBUSTNESS_STYLES = ('Useless.Horizontal.TProgressbar',
+                     'Weak.Horizontal.TProgressbar',
+                     'Acceptable.Horizontal.TProgressbar',
+                     'Good.Horizontal.TProgressbar',
+                     'Great.Horizontal.TProgressbar',
+                    )
+# Files used by the interface, relative to this module.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
+HELP_FILE = os.path.join(BASE_DIR, 'help.txt')
+# Images of the toolbar buttons ('ASSETS_DIR' files, without '.png'),
+# in button order.  Until they are loaded, the buttons show text.
+TOOLBAR_IMAGES = ('help', 'info', 'exit', 'print')
+# Pause in typing, in milliseconds, before a typed password is scored.
+STRENGTH_DELAY = 150
+# Largest number of passwords of a batch.
+BATCH_MAX = 1000000
+# Interval, in milliseconds, between reads of the batch worker results.
+BATCH_POLL = 50
+# Visible rows of the batch result list.
+BATCH_ROWS = 16
+
 # classes --------------------------------------------------------------------
 class Application():
     '''Application main window.'''
     
-    def __init__(self):
-        '''Initialize interface objects.'''
+    def __init__(self, timing=False):
+        '''Initialize interface objects.
 
+If 'timing' is true, the start-up times are reported on the standard
+error and the application is closed as soon as it is ready.
+'''
+        start = time.perf_counter()
+        self.show_timing = timing
         self.root = tk.Tk()
         self.root.title(__title__)
         self.root.option_add('*tearOff', tk.FALSE)
+        # Ready passwords for each length and pattern used.
+        self.pool = pwgen.PasswordPool(capacity=64, low_water=16)
+        # Loaded 'tk.PhotoImage' objects, by name.
+        self.images = {}
+        self.help_window = None
         self.build_interface()
         self.root.resizable(False, False)
+        built = time.perf_counter()
         self.generate_first()
+        self.timing = {'interface': built - start,
+                       'first_password': time.perf_counter() - built,
+                      }
+        self.start = start
+        # Idle callbacks run in order, so the window is mapped (by the
+        # idle handlers queued while it was built) before the images
+        # are read.
+        self.root.after_idle(self.load_images)
 
     def build_interface(self):
         '''Build and display application interface.'''
@@ -187,11 +275,6 @@ class Application():
                              background='#0000FF'
                             )
 
-        # Loads images.
-        self.exit_img = tk.PhotoImage(file='assets/exit.png')
-        self.info_img = tk.PhotoImage(file='assets/info.png')
-        self.help_img = tk.PhotoImage(file='assets/help.png')
-                
         # Main containers.
         self.toolbar_frame = ttk.Frame(self.root)
         self.toolbar_frame.grid(row=0,
@@ -212,21 +295,28 @@ class Application():
         self.help_button = ttk.Button(self.toolbar_frame,
                                       style='Tool.TButton',
                                       command = self.show_help,
-                                      image = self.help_img
+                                      text='Ajuda'
                                      )
         self.help_button.pack(side='left')
         self.about_button = ttk.Button(self.toolbar_frame,
                                        style='Tool.TButton',
                                        command = self.show_info,
-                                       image = self.info_img
+                                       text='Sobre'
                                       )
         self.about_button.pack(side='left')
         self.exit_button = ttk.Button(self.toolbar_frame,
                                       style='Tool.TButton',
                                       command = self.exit,
-                                      image = self.exit_img
+                                      text='Sair'
                                      )
         self.exit_button.pack(side='left')
+        self.batch_button = ttk.Button(self.toolbar_frame,
+                                       style='Tool.TButton',
+                                       command = self.show_batch,
+                                       text='Lote'
+                                      )
+        self.batch_button.pack(side='left')
+        self.batch = None
         
         # Main widgets.
         # GUI labels.
@@ -271,6 +361,12 @@ class Application():
                                                    onvalue=1,
                                                    variable=self.lower_value
                                                   )
+        self.require_all_value = tk.BooleanVar()
+        self.require_all_check = ttk.Checkbutton(self.main_frame,
+                                                 text='Exigir todos os tipos',
+                                                 command=self.generate_pw,
+                                                 variable=self.require_all_value
+                                                )
         self.symbols_check.grid(row=0, column=1, sticky='we', padx=5)
         self.digits_check.grid(row=0, column=2, sticky='we', padx=5)
         self.upper_letters_check.grid(row=0, column=3, sticky='we', padx=5)
@@ -290,6 +386,7 @@ class Application():
                                               maximum=5,
                                               value=0.0,
                                              )
+        self.robustness_band = None
         self.robustness_bar.grid(row=1,
                                  column=2,
                                  columnspan=2,
@@ -314,26 +411,97 @@ class Application():
                              padx=5,
                              pady=5
                             )
+        self.require_all_check.grid(row=3,
+                                    column=1,
+                                    columnspan=4,
+                                    sticky='w',
+                                    padx=5
+                                   )
+        # GUI generation mode: characters or words.
+        ttk.Label(self.main_frame, text='Modo:').grid(row=4,
+                                                      column=0,
+                                                      sticky='e'
+                                                     )
+        self.mode_value = tk.StringVar(value='chars')
+        self.chars_radio = ttk.Radiobutton(self.main_frame,
+                                           text='Caracteres',
+                                           command=self.generate_pw,
+                                           value='chars',
+                                           variable=self.mode_value
+                                          )
+        self.phrase_radio = ttk.Radiobutton(self.main_frame,
+                                            text='Frase-senha',
+                                            command=self.generate_pw,
+                                            value='phrase',
+                                            variable=self.mode_value
+                                           )
+        self.pronounce_radio = ttk.Radiobutton(self.main_frame,
+                                               text='Pronunciável',
+                                               command=self.generate_pw,
+                                               value='pronounce',
+                                               variable=self.mode_value
+                                              )
+        self.chars_radio.grid(row=4, column=1, sticky='w', padx=5)
+        self.phrase_radio.grid(row=4, column=2, sticky='w', padx=5)
+        self.pronounce_radio.grid(row=4, column=3, sticky='w', padx=5)
+        self.wordlist = None
+        # GUI strength check of a typed password.
+        ttk.Label(self.main_frame, text='Testar:').grid(row=5,
+                                                        column=0,
+                                                        sticky='e'
+                                                       )
+        self.check_value = tk.StringVar()
+        self.check_entry = ttk.Entry(self.main_frame,
+                                     textvariable=self.check_value,
+                                     show='•'
+                                    )
+        self.check_entry.grid(row=5,
+                              column=1,
+                              columnspan=2,
+                              sticky='we',
+                              padx=5,
+                              pady=5
+                             )
+        self.strength_bar = ttk.Progressbar(self.main_frame,
+                                            orient='horizontal',
+                                            mode='determinate',
+                                            maximum=5,
+                                            value=0.0,
+                                           )
+        self.strength_bar.grid(row=5, column=3, sticky='we', padx=5)
+        self.strength_label = ttk.Label(self.main_frame, anchor='w')
+        self.strength_label.grid(row=5, column=4, sticky='w', padx=5)
+        self.strength_job = None
+        self.check_value.trace_add('write', self.schedule_strength)
 
         # Bind events to corresponding handlers.
         self.help_button.bind('<Return>', self.show_help)
         self.about_button.bind('<Return>', self.show_info)
         self.exit_button.bind('<Return>', self.exit)
+        self.batch_button.bind('<Return>', self.show_batch)
         self.generate_button.bind('<Return>', self.generate_pw)
         
     # Event handlers.
     def generate_pw(self, event=None):
         '''Use 'pwgen' module to generate password and update GUI.'''
         
-        pattern = self.symbols_value.get() + \
-                  self.digits_value.get() + \
-                  self.upper_value.get() + \
-                  self.lower_value.get()
+        pattern = self.get_pattern()
 
-        if pattern > 0:
+        if self.mode_value.get() == 'phrase':
+            self.generate_phrase()
+        elif self.mode_value.get() == 'pronounce':
+            self.generate_pronounceable(pattern)
+        elif pattern > 0:
             length = int(self.length_setting.get())
             try:
-                password, entropy = pwgen.Generate(length, pattern)
+                # Compiled character sets are cached by 'pwgen'.
+                alphabet = pwgen.GetAlphabet(pattern)
+                if self.require_all_value.get():
+                    password, entropy = pwgen.Generate(length, alphabet,
+                                                       require_all=True
+                                                      )
+                else:
+                    password, entropy = self.pool.take(length, alphabet)
             except (TypeError, ValueError):
                 pass
             # Update GUI
@@ -343,10 +511,126 @@ class Application():
             self.pw_display.configure(state='readonly')
             self.ShowEntropy(entropy)
         
+    def generate_phrase(self):
+        '''Use 'pwgen' module to generate a passphrase and update GUI.
+
+The length selector gives the number of words; uppercase letters
+capitalize the words and digits add a two digit number.
+'''
+        wordlist = self.load_wordlist()
+        if wordlist is None:
+            self.mode_value.set('chars')
+            return
+        words = int(self.length_setting.get())
+        password, entropy = pwgen.GeneratePassphrase(
+            words, wordlist, '-',
+            capitalize=bool(self.upper_value.get()),
+            digits=2 if self.digits_value.get() else 0
+        )
+        self.pw_display.configure(state='normal')
+        self.pw_display.delete(0, 'end')
+        self.pw_display.insert(0, password)
+        self.pw_display.configure(state='readonly')
+        self.ShowEntropy(entropy)
+
+    def generate_pronounceable(self, pattern):
+        '''Use 'pwgen' module to generate a pronounceable password.
+
+Selected digits and symbols are inserted between the letters; nothing
+is generated unless a kind of letters is selected.
+'''
+        length = int(self.length_setting.get())
+        try:
+            password, entropy = pwgen.GeneratePronounceable(length, pattern)
+        except (TypeError, ValueError):
+            return
+        self.pw_display.configure(state='normal')
+        self.pw_display.delete(0, 'end')
+        self.pw_display.insert(0, password)
+        self.pw_display.configure(state='readonly')
+        self.ShowEntropy(entropy)
+
+    def load_wordlist(self):
+        '''Return the wordlist of the passphrase mode, opening it once.
+
+Uses 'pwgen.WORDLIST' if it exists; otherwise the user chooses a
+compiled or text wordlist, which is compiled to the per-user cache.
+'''
+        if self.wordlist is None:
+            path = pwgen.WORDLIST
+            if not os.path.exists(path):
+                path = tk.filedialog.askopenfilename(
+                    parent=self.root,
+                    title=f'{__title__} - Lista de palavras'
+                )
+                if not path:
+                    return None
+            try:
+                self.wordlist = pwgen.Wordlist(path)
+            except ValueError:
+                try:
+                    compiled = pwgen.CompileCached(path,
+                                                   pwgen.CompileWordlist,
+                                                   '.pwl'
+                                                  )
+                    self.wordlist = pwgen.Wordlist(compiled)
+                except (OSError, UnicodeError, ValueError):
+                    tk.messagebox.showerror(__title__,
+                                            'Lista de palavras inválida.'
+                                           )
+                    return None
+        return self.wordlist
+
+    def schedule_strength(self, *args):
+        '''Score the typed password when typing pauses.
+
+Each change restarts the timer, so a burst of keystrokes costs a
+single estimate.
+'''
+        if self.strength_job is not None:
+            self.root.after_cancel(self.strength_job)
+        self.strength_job = self.root.after(STRENGTH_DELAY,
+                                            self.show_strength
+                                           )
+
+    def show_strength(self):
+        '''Display the estimated strength of the typed password.'''
+
+        self.strength_job = None
+        password = self.check_value.get()
+        if not password:
+            self.strength_bar.configure(value=0.0)
+            self.strength_label.configure(text='')
+            return
+        # Imported here, as the dictionaries are only needed once the
+        # user types a password.
+        import pwstrength
+
+        bits, matches = pwstrength.Estimate(password)
+        band = bisect.bisect_right(ROBUSTNESS_LIMITS, bits)
+        self.strength_bar.configure(value=band + 1.0,
+                                    style=ROBUSTNESS_STYLES[band]
+                                   )
+        self.strength_label.configure(text=f'{bits} bits')
+
     def exit(self, event=None):
         '''Close the application.'''
+        if self.strength_job is not None:
+            self.root.after_cancel(self.strength_job)
+        if self.batch is not None:
+            self.batch.close()
+        self.pool.close()
         self.root.destroy()
 
+    def show_batch(self, event=None):
+        '''Show the batch generation window.'''
+
+        if self.batch is None:
+            self.batch = BatchPanel(self)
+        else:
+            self.batch.window.deiconify()
+            self.batch.window.lift()
+
     def show_info(self, event=None):
         '''Show application info.'''
         
@@ -364,27 +648,80 @@ Liberada em: {__release__}
     def show_help(self, event=None):
         '''Show application help.'''
         
+        # The window is built once and hidden when closed.
+        if self.help_window is not None:
+            self.help_window.deiconify()
+            self.help_window.lift()
+            return
         # Configure help window
         help = tk.Toplevel(self.root)
         help.transient(self.root)
         help.title('{0} - Ajuda'.format(__title__))
+        help.protocol('WM_DELETE_WINDOW', help.withdraw)
         # Insert widgets
         text = tk.Text(help, height=20, width=64, padx=5, pady=5, wrap='word')
         text.pack()
-        close_button = ttk.Button(help, text='Fechar', command=help.destroy)
+        close_button = ttk.Button(help, text='Fechar', command=help.withdraw)
         close_button.pack()
-        # Load help file
-        try:
-            with open('help.txt', 'r', encoding='UTF-8') as f:
-                for line in f:
-                    text.insert(tk.END, line)
-        except IOError:
-            text.insert(tk.END, 'Nenhuma ajuda disponível.')
+        text.insert(tk.END, _ReadHelp())
         text.config(state='disabled')
-        # Show help window
-        help.mainloop()
+        self.help_window = help
         
     # Helper functions
+    def load_images(self):
+        '''Load the toolbar images, after the window is shown.'''
+
+        shown = time.perf_counter()
+        buttons = (self.help_button, self.about_button, self.exit_button,
+                   self.batch_button
+                  )
+        for button, name in zip(buttons, TOOLBAR_IMAGES):
+            image = self.get_image(name)
+            if image is not None:
+                button.configure(image=image)
+        self.timing['window'] = shown - self.start
+        self.timing['images'] = time.perf_counter() - shown
+        if self.show_timing:
+            self.report_timing()
+
+    def get_image(self, name):
+        '''Return the image 'name' of 'ASSETS_DIR', loading it once.
+
+Returns None if the image can not be loaded; the button then keeps its
+text.
+'''
+        if name not in self.images:
+            try:
+                self.images[name] = tk.PhotoImage(
+                    file=os.path.join(ASSETS_DIR, name + '.png')
+                )
+            except tk.TclError:
+                self.images[name] = None
+        return self.images[name]
+
+    def report_timing(self):
+        '''Print the start-up times and close the application.'''
+
+        labels = (('import', 'importação'),
+                  ('interface', 'interface'),
+                  ('first_password', 'primeira senha'),
+                  ('window', 'janela visível'),
+                  ('images', 'imagens'),
+                 )
+        for key, label in labels:
+            print (f'{label:<16}{self.timing[key] * 1000:8.1f} ms',
+                   file=sys.stderr
+                  )
+        self.exit()
+
+    def get_pattern(self):
+        '''Return the pattern of the selected types of characters.'''
+
+        return self.symbols_value.get() + \
+               self.digits_value.get() + \
+               self.upper_value.get() + \
+               self.lower_value.get()
+
     def ShowEntropy(self, entropy):
         '''Display password robustness on GUI graphically.
         
@@ -393,26 +730,12 @@ Liberada em: {__release__}
         define password robustness.
         '''
         
-        if entropy < 28:
-            self.robustness_bar.configure(value=1.0,
-                                          style='Useless.Horizontal.TProgressbar'
+        band = bisect.bisect_right(ROBUSTNESS_LIMITS, entropy)
+        if band != self.robustness_band:
+            self.robustness_band = band
+            self.robustness_bar.configure(value=band + 1.0,
+                                          style=ROBUSTNESS_STYLES[band]
                                          )
-        elif entropy >= 28 and entropy < 36:
-            self.robustness_bar.configure(value=2.0,
-                                          style='Weak.Horizontal.TProgressbar'
-            )
-        elif entropy >= 36 and entropy < 60:
-            self.robustness_bar.configure(value=3.0,
-                                          style='Acceptable.Horizontal.TProgressbar'
-            )
-        elif entropy >= 60 and entropy < 128:
-            self.robustness_bar.configure(value=4.0,
-                                          style='Good.Horizontal.TProgressbar'
-            )
-        else:
-            self.robustness_bar.configure(value=5.0,
-                                          style='Great.Horizontal.TProgressbar'
-            )
         
     def generate_first(self):
         '''Generate first password at start-up using default parameters.'''
@@ -431,6 +754,363 @@ Liberada em: {__release__}
         
         self.root.mainloop()
 
+class VirtualList():
+    '''Scrollable list of strings that only draws the visible rows.
+
+The list keeps a fixed number of canvas text items and rewrites them
+when it is scrolled, so its cost does not depend on the number of
+items.  'items' may grow while the list is shown; call 'refresh'
+afterwards.
+'''
+
+    def __init__(self, master, rows=BATCH_ROWS, width=40):
+        '''Build the canvas and the scrollbar inside a frame.'''
+
+        self.items = []
+        self.top = 0
+        self.rows = rows
+        self.frame = ttk.Frame(master)
+        font = tkinter.font.nametofont('TkFixedFont')
+        self.row_height = font.metrics('linespace') + 1
+        self.canvas = tk.Canvas(self.frame,
+                                width=font.measure('0') * width,
+                                height=self.row_height * rows,
+                                background='white',
+                                highlightthickness=0
+                               )
+        self.texts = [self.canvas.create_text(4, self.row_height * row,
+                                              anchor='nw',
+                                              font=font
+                                             )
+                      for row in range(rows)
+                     ]
+        self.scrollbar = ttk.Scrollbar(self.frame,
+                                       orient='vertical',
+                                       command=self.yview
+                                      )
+        self.canvas.grid(row=0, column=0, sticky='wens')
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+        self.canvas.bind('<MouseWheel>', self.wheel)
+        self.canvas.bind('<Button-4>', self.wheel)
+        self.canvas.bind('<Button-5>', self.wheel)
+        self.refresh()
+
+    def grid(self, **options):
+        '''Place the list in its master.'''
+
+        self.frame.grid(**options)
+
+    def set_items(self, items):
+        '''Show a new list of items, from the first one.'''
+
+        self.items = items
+        self.top = 0
+        self.refresh()
+
+    def refresh(self):
+        '''Redraw the visible rows and the scrollbar.'''
+
+        total = len(self.items)
+        self.top = max(0, min(self.top, total - self.rows))
+        for row, text in enumerate(self.texts):
+            index = self.top + row
+            if index < total:
+                label = f'{index + 1:>7}  {self.items[index]}'
+            else:
+                label = ''
+            self.canvas.itemconfigure(text, text=label)
+        if total > self.rows:
+            self.scrollbar.set(self.top / total,
+                               (self.top + self.rows) / total
+                              )
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, command, value, unit=None):
+        '''Scroll the list, as called by the scrollbar.'''
+
+        if command == 'moveto':
+            self.top = int(float(value) * len(self.items))
+        elif unit == 'pages':
+            self.top += int(value) * self.rows
+        else:
+            self.top += int(value)
+        self.refresh()
+
+    def wheel(self, event):
+        '''Scroll the list with the mouse wheel.'''
+
+        if event.num == 4 or event.delta > 0:
+            self.yview('scroll', -3, 'units')
+        else:
+            self.yview('scroll', 3, 'units')
+
+class BatchPanel():
+    '''Batch generation window.
+
+Passwords are generated by a worker thread, 'pwgen.BATCH_SIZE' at a
+time, and handed to the interface through a queue, which is read every
+'BATCH_POLL' milliseconds.  The Tk event loop never waits for the
+generation, so the window stays responsive for large batches.
+'''
+
+    def __init__(self, app):
+        '''Build the window.'''
+
+        self.app = app
+        self.passwords = []
+        self.entropy = 0
+        self.total = 0
+        self.results = queue.SimpleQueue()
+        self.cancelled = threading.Event()
+        self.worker = None
+        self.poll_job = None
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title(f'{__title__} - Lote')
+        self.window.protocol('WM_DELETE_WINDOW', self.window.withdraw)
+        frame = ttk.Frame(self.window)
+        frame.grid(row=0, column=0, padx=5, pady=5, sticky='wens')
+        ttk.Label(frame, text='Quantidade:').grid(row=0,
+                                                  column=0,
+                                                  sticky='e'
+                                                 )
+        self.count_setting = ttk.Spinbox(frame,
+                                         from_=1,
+                                         to=BATCH_MAX,
+                                         increment=1000,
+                                         width=8
+                                        )
+        self.count_setting.set(1000)
+        self.count_setting.grid(row=0, column=1, sticky='w', padx=5)
+        self.generate_button = ttk.Button(frame,
+                                          text='Gerar',
+                                          command=self.start
+                                         )
+        self.generate_button.grid(row=0, column=2, sticky='we', padx=5)
+        self.cancel_button = ttk.Button(frame,
+                                        text='Cancelar',
+                                        command=self.cancel,
+                                        state='disabled'
+                                       )
+        self.cancel_button.grid(row=0, column=3, sticky='we', padx=5)
+        self.export_button = ttk.Button(frame,
+                                        text='Exportar',
+                                        command=self.export,
+                                        state='disabled'
+                                       )
+        self.export_button.grid(row=0, column=4, sticky='we', padx=5)
+        self.progress_bar = ttk.Progressbar(frame,
+                                            orient='horizontal',
+                                            mode='determinate',
+                                           )
+        self.progress_bar.grid(row=1,
+                               column=0,
+                               columnspan=5,
+                               sticky='we',
+                               padx=5,
+                               pady=5
+                              )
+        self.list = VirtualList(frame)
+        self.list.grid(row=2, column=0, columnspan=5, padx=5, pady=5)
+        self.status_label = ttk.Label(frame, anchor='w')
+        self.status_label.grid(row=3, column=0, columnspan=5, sticky='w')
+
+    def start(self, event=None):
+        '''Start generating a batch with the main window settings.'''
+
+        try:
+            count = int(self.count_setting.get())
+            if not 1 <= count <= BATCH_MAX:
+                raise ValueError
+        except ValueError:
+            tk.messagebox.showerror(
+                __title__,
+                f'A quantidade deve estar entre 1 e {BATCH_MAX}.',
+                parent=self.window
+            )
+            return
+        generate = self.get_generator()
+        if generate is None:
+            return
+        self.passwords = []
+        self.total = count
+        self.list.set_items(self.passwords)
+        self.progress_bar.configure(maximum=count, value=0)
+        self.cancelled.clear()
+        self.worker = threading.Thread(target=self.work,
+                                       args=(count, generate),
+                                       daemon=True
+                                      )
+        self.worker.start()
+        self.generate_button.configure(state='disabled')
+        self.cancel_button.configure(state='normal')
+        self.export_button.configure(state='disabled')
+        self.poll_job = self.window.after(BATCH_POLL, self.poll)
+
+    def get_generator(self):
+        '''Return a function that generates a list of passwords in the
+mode of the main window, or None if nothing can be generated.
+
+The settings are read here, in the Tk thread; the function, called by
+the worker thread, returns (passwords, entropy) for a given count.
+'''
+        app = self.app
+        pattern = app.get_pattern()
+        length = int(app.length_setting.get())
+        mode = app.mode_value.get()
+        if mode == 'phrase':
+            wordlist = app.load_wordlist()
+            if wordlist is None:
+                return None
+            capitalize = bool(app.upper_value.get())
+            digits = 2 if app.digits_value.get() else 0
+
+            def generate(count):
+                passwords = []
+                for i in range(count):
+                    password, entropy = pwgen.GeneratePassphrase(
+                        length, wordlist, '-', capitalize=capitalize,
+                        digits=digits
+                    )
+                    passwords.append(password)
+                return (passwords, entropy)
+            return generate
+        elif mode == 'pronounce':
+            return lambda count: pwgen.GeneratePronounceableBatch(count,
+                                                                  length,
+                                                                  pattern
+                                                                 )
+        elif pattern <= 0:
+            return None
+        require_all = bool(app.require_all_value.get())
+        return lambda count: pwgen.GenerateBatch(count, length, pattern,
+                                                 require_all=require_all
+                                                )
+
+    def work(self, count, generate):
+        '''Generate the batch (worker thread).
+
+Puts lists of passwords in 'results', then None when finished.  The
+entropy and any error are handed to the Tk thread by 'after'.
+'''
+        try:
+            while count > 0 and not self.cancelled.is_set():
+                size = min(count, pwgen.BATCH_SIZE)
+                passwords, entropy = generate(size)
+                self.app.root.after(0, self.set_entropy, entropy)
+                self.results.put(passwords)
+                count -= size
+        except (OSError, TypeError, ValueError) as error:
+            self.app.root.after(0, self.show_error, str(error))
+        finally:
+            self.results.put(None)
+
+    def set_entropy(self, entropy):
+        '''Keep the entropy of the batch passwords (Tk event loop).'''
+
+        self.entropy = entropy
+
+    def show_error(self, message):
+        '''Report an error of the worker (Tk event loop).'''
+
+        tk.messagebox.showerror(__title__, message, parent=self.window)
+
+    def poll(self):
+        '''Move the worker results to the list (Tk event loop).'''
+
+        self.poll_job = None
+        finished = False
+        while True:
+            try:
+                passwords = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if passwords is None:
+                finished = True
+                break
+            self.passwords.extend(passwords)
+        self.list.refresh()
+        self.progress_bar.configure(value=len(self.passwords))
+        self.status_label.configure(
+            text=f'{len(self.passwords):,} de {self.total:,} senhas, '
+                 f'{self.entropy} bits cada'
+        )
+        if finished:
+            self.worker = None
+            self.generate_button.configure(state='normal')
+            self.cancel_button.configure(state='disabled')
+            if self.passwords:
+                self.export_button.configure(state='normal')
+        else:
+            self.poll_job = self.window.after(BATCH_POLL, self.poll)
+
+    def cancel(self, event=None):
+        '''Stop the batch being generated.'''
+
+        self.cancelled.set()
+
+    def export(self, event=None):
+        '''Write the batch to a text file, one password per line.'''
+
+        path = tk.filedialog.asksaveasfilename(
+            parent=self.window,
+            title=f'{__title__} - Exportar',
+            defaultextension='.txt'
+        )
+        if not path:
+            return
+        try:
+            with open(path, 'w', encoding='UTF-8') as f:
+                for start in range(0, len(self.passwords), pwgen.BATCH_SIZE):
+                    f.write('\n'.join(
+                        self.passwords[start:start + pwgen.BATCH_SIZE]
+                    ) + '\n')
+        except OSError as error:
+            tk.messagebox.showerror(__title__,
+                                    f'Erro ao exportar: {error}',
+                                    parent=self.window
+                                   )
+
+    def close(self):
+        '''Stop the worker and destroy the window.'''
+
+        self.cancelled.set()
+        if self.worker is not None:
+            self.worker.join()
+        if self.poll_job is not None:
+            self.window.after_cancel(self.poll_job)
+        self.window.destroy()
+
+# functions ------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _ReadHelp():
+    '''Return the text of 'HELP_FILE', read once.'''
+
+    try:
+        with open(HELP_FILE, 'r', encoding='UTF-8') as f:
+            return f.read()
+    except OSError:
+        return 'Nenhuma ajuda disponível.'
+
+def Main(arguments=None):
+    '''Command line interface.'''
+
+    imported = time.perf_counter()
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='gerasenha',
+                                     description=__description__
+                                    )
+    parser.add_argument('--timing', action='store_true',
+                        help='mostra os tempos de início e encerra'
+                       )
+    options = parser.parse_args(arguments)
+    application = Application(options.timing)
+    application.timing['import'] = imported - _IMPORT_START
+    application.run()
+    return 0
+
 # main trap ------------------------------------------------------------------
 if __name__ == '__main__':
-    Application().run()
+    sys.exit(Main())
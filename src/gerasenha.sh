@@ -1,4 +1,3 @@
 #!/bin/bash
 
-python3 gerasenha.py 
- 
+python3 "$(dirname "$0")/gerasenha.py" "$@"
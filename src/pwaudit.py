@@ -0,0 +1,449 @@
+#!/usr/bin/python3
+
+'''
+pwaudit.py
+
+Statistical audit of the output of 'pwgen'.
+
+Streams generated passwords through chunked counters, with constant
+memory, and tests, for each pattern, the uniformity of the characters
+at each position and of the character classes, the serial correlation
+of consecutive characters and the number of collisions.  The work is
+split among processes and the result is a JSON report.
+
+Usage:
+python3 pwaudit.py --count 10000000 --output auditoria.json
+python3 pwaudit.py --backend pool --packed --patterns 4 15
+'''
+
+__title__     = 'pwaudit'
+__author__    = 'Odmar Miranda'
+__version__   = '00.01.00'
+__date__      = '2026-10-17'
+__description__ = 'Auditoria estatística das senhas geradas.'
+
+__license__   = 'GNU GPLv3 http://www.gnu.org/licenses'
+__copyright__ = '© 2014, 2026 Odmar Miranda'
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Revisions
+# Version-  ---Date---  --------------------Comments--------------------
+# 0.1.0     2026-10-17  - First version.
+
+# imports ---------------------------------------------------------------------
+import concurrent.futures
+import json
+import math
+import operator
+import os
+import platform
+import sys
+import time
+
+import pwgen
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# constants -------------------------------------------------------------------
+# Passwords generated and counted at a time.
+CHUNK_SIZE = 65536
+# Passwords audited by each task of the process pool.
+TASK_SIZE = 2**20
+# The collision test counts repeated prefixes of the passwords.  The
+# prefix is the longest one with at most 'COLLISION_CELLS' possible
+# values, and enough passwords are used to expect about
+# 'COLLISION_TARGET' collisions.
+COLLISION_CELLS = 2**24
+COLLISION_TARGET = 1000
+# Tests whose score (a standard normal deviate) exceeds this limit, in
+# absolute value, fail.  It is high because each audit runs hundreds of
+# tests.
+SCORE_LIMIT = 5.0
+
+# classes ---------------------------------------------------------------------
+class Tally():
+    '''Counters of an audit of one pattern, merged across tasks.
+
+Attributes:
+passwords (int)  - passwords counted.
+positions (list) - for each position, the count of each byte value.
+sum, squares, products (int) - sums of the character indices, of their
+                   squares and of the products of consecutive indices,
+                   for the serial correlation.
+pairs     (int)  - consecutive pairs in 'products'.
+samples, collisions (int) - passwords used by the collision test and
+                   repeated prefixes among them.
+expected  (float) - collisions expected among 'samples' prefixes.
+'''
+
+    def __init__(self, pattern, length):
+        '''Initialize empty counters.'''
+
+        alphabet = pwgen.GetAlphabet(pattern)
+        self.pattern = pattern
+        self.length = length
+        self.passwords = 0
+        self.positions = [[0] * 256 for i in range(length)]
+        self.sum = 0
+        self.squares = 0
+        self.products = 0
+        self.pairs = 0
+        nchars = len(alphabet)
+        self.prefix = max(1, min(length,
+                                 int(math.log(COLLISION_CELLS, nchars))
+                                ))
+        self.cells = nchars ** self.prefix
+        self.quota = math.isqrt(2 * self.cells * COLLISION_TARGET)
+        self.samples = 0
+        self.collisions = 0
+        self.expected = 0.0
+        self._prefixes = set()
+        self._last = None
+        # Index of each character in the alphabet; other bytes map to 0
+        # and are reported by the position counts.
+        self._indices = bytes(max(alphabet.string.find(chr(b)), 0)
+                              for b in range(256)
+                             )
+
+    def add(self, chunk):
+        '''Count the passwords of 'chunk' (bytes, concatenated).'''
+
+        length = self.length
+        size = len(chunk) // length
+        self.passwords += size
+        indices = chunk.translate(self._indices)
+        if numpy is not None:
+            self._count_numpy(chunk, indices, size)
+        else:
+            self._count(chunk, indices)
+        self.pairs += len(indices) - (self._last is None)
+        if self._last is not None:
+            self.products += self._last * indices[0]
+        self._last = indices[-1]
+
+        if self.samples < self.quota:
+            used = min(size, self.quota - self.samples)
+            self._prefixes.update(chunk[i:i + self.prefix]
+                                  for i in range(0, used * length, length)
+                                 )
+            self.samples += used
+            if self.samples == self.quota:
+                self.close()
+
+    def close(self):
+        '''Finish the collision test with the prefixes seen so far.'''
+
+        if self._prefixes:
+            self.collisions += self.samples - len(self._prefixes)
+            cells = self.cells
+            self.expected = self.samples - cells + \
+                            cells * (1 - 1 / cells) ** self.samples
+            self._prefixes = set()
+        self.quota = self.samples
+
+    def merge(self, other):
+        '''Add the counters of another (closed) 'Tally'.'''
+
+        self.passwords += other.passwords
+        for mine, theirs in zip(self.positions, other.positions):
+            for value, count in enumerate(theirs):
+                mine[value] += count
+        self.sum += other.sum
+        self.squares += other.squares
+        self.products += other.products
+        self.pairs += other.pairs
+        self.samples += other.samples
+        self.collisions += other.collisions
+        self.expected += other.expected
+
+    def _count(self, chunk, indices):
+        '''Pure Python counters.'''
+
+        length = self.length
+        values = pwgen.GetAlphabet(self.pattern).lookup
+        for position, counts in enumerate(self.positions):
+            column = chunk[position::length]
+            for value in values:
+                counts[value] += column.count(value)
+        self.sum += sum(indices)
+        self.squares += sum(map(operator.mul, indices, indices))
+        self.products += sum(map(operator.mul, indices,
+                                 memoryview(indices)[1:]
+                                ))
+
+    def _count_numpy(self, chunk, indices, size):
+        '''Vectorized counters.'''
+
+        length = self.length
+        chars = numpy.frombuffer(chunk, numpy.uint8)
+        # A single bincount: position i uses cells 256 * i to 256 * i + 255.
+        offsets = numpy.tile(numpy.arange(0, 256 * length, 256,
+                                          dtype=numpy.int64
+                                         ), size
+                            )
+        counts = numpy.bincount(chars + offsets, minlength=256 * length)
+        for position, row in enumerate(counts.reshape(length, 256)):
+            totals = self.positions[position]
+            for value in numpy.flatnonzero(row):
+                totals[value] += int(row[value])
+        indices = numpy.frombuffer(indices, numpy.uint8).astype(numpy.int64)
+        self.sum += int(indices.sum())
+        self.squares += int(numpy.dot(indices, indices))
+        self.products += int(numpy.dot(indices[:-1], indices[1:]))
+
+# functions -------------------------------------------------------------------
+def Audit(count=10**6, length=16, patterns=range(1, 16), workers=None,
+          backend='system', packed=False):
+    '''Audits 'count' passwords of 'length' characters of each pattern.
+
+'backend' is the name of a 'pwgen' backend; with 'packed', its
+characters are extracted by '_DrawPacked'.  The passwords of each
+pattern are split into tasks of 'TASK_SIZE', run by 'workers' processes
+(by default, one per CPU; 1 runs them in this process).
+
+Return:
+report (dict) - parameters, environment, and the statistics of each
+                pattern (see '_Statistics'), with 'passed' true if all
+                scores are within 'SCORE_LIMIT'.
+'''
+    pwgen.CheckParameters(count, length)
+    if count < 1:
+        raise ValueError('A quantidade deve ser maior ou igual a 1.')
+    elif backend not in pwgen.BACKENDS:
+        raise ValueError(f'Fonte de números aleatórios desconhecida: '
+                         f'{backend!r}.'
+                        )
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError('O número de processos deve ser maior ou igual a 1.')
+    tasks = [(pattern, length, min(TASK_SIZE, count - start), backend,
+              packed, index
+             )
+             for pattern in patterns
+             for index, start in enumerate(range(0, count, TASK_SIZE))
+            ]
+    tallies = {pattern: Tally(pattern, length) for pattern in patterns}
+    start = time.perf_counter()
+    if workers == 1:
+        results = (_AuditTask(*task) for task in tasks)
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+        results = executor.map(_AuditTask, *zip(*tasks))
+    try:
+        for tally in results:
+            tallies[tally.pattern].merge(tally)
+    finally:
+        if workers != 1:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    statistics = {str(pattern): _Statistics(tally)
+                  for pattern, tally in tallies.items()
+                 }
+    return {'parameters': {'count': count, 'length': length,
+                           'patterns': list(patterns), 'backend': backend,
+                           'packed': packed, 'workers': workers
+                          },
+            'environment': {'pwgen': pwgen.__version__,
+                            'python': platform.python_version(),
+                            'platform': platform.platform(),
+                            'cpus': os.cpu_count(),
+                            'numpy': numpy is not None,
+                            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                           },
+            'seconds': elapsed,
+            'characters_per_second': count * length * len(tallies) / elapsed,
+            'passed': all(result['passed']
+                          for result in statistics.values()
+                         ),
+            'patterns': statistics,
+           }
+
+def _AuditTask(pattern, length, count, backend, packed, index):
+    '''Returns the 'Tally' of 'count' passwords (pool task).'''
+
+    if backend == 'seeded':
+        # Each task needs its own stream.
+        source = pwgen.SeededBackend((pattern << 32) + index)
+    else:
+        source = pwgen.BACKENDS[backend]()
+    source.packed = packed
+    tally = Tally(pattern, length)
+    buffer = bytearray(min(count, CHUNK_SIZE) * length)
+    while count > 0:
+        size = min(count, CHUNK_SIZE)
+        pwgen.GenerateInto(buffer, size, length, pattern, backend=source)
+        tally.add(bytes(buffer[:size * length]))
+        count -= size
+    tally.close()
+    return tally
+
+def _Statistics(tally):
+    '''Returns the test statistics of a 'Tally' (dict).
+
+positions  - chi-square of the characters at each position.
+classes    - chi-square of the counts of each class (lowercase letters,
+             uppercase letters, digits, symbols), if there are several.
+serial     - correlation of consecutive character indices.
+collisions - repeated prefixes against the expected number.
+invalid    - characters outside the alphabet (must be 0).
+
+Each test has a 'score', a standard normal deviate.
+'''
+    alphabet = pwgen.GetAlphabet(tally.pattern)
+    nchars = len(alphabet)
+    values = alphabet.lookup
+    total = tally.passwords * tally.length
+    positions = [_ChiSquare([counts[value] for value in values],
+                            [tally.passwords / nchars] * nchars
+                           )
+                 for counts in tally.positions
+                ]
+    valid = sum(counts[value] for counts in tally.positions
+                for value in values
+               )
+    result = {'alphabet': nchars,
+              'characters': total,
+              'invalid': total - valid,
+              'positions': positions,
+              'classes': None,
+             }
+    if len(alphabet.classes) > 1:
+        observed = [sum(counts[ord(char)] for counts in tally.positions
+                        for char in chars
+                       )
+                    for chars in alphabet.classes
+                   ]
+        result['classes'] = _ChiSquare(observed,
+                                       [total * len(chars) / nchars
+                                        for chars in alphabet.classes
+                                       ]
+                                      )
+
+    # Serial correlation coefficient (Knuth, TAOCP 3.3.2).
+    n = tally.pairs
+    mean = tally.sum / total
+    variance = tally.squares / total - mean * mean
+    if n and variance > 0:
+        correlation = (tally.products / n - mean * mean) / variance
+    else:
+        correlation = 0.0
+    result['serial'] = {'correlation': correlation,
+                        'pairs': n,
+                        'score': correlation * math.sqrt(n),
+                       }
+
+    expected = tally.expected
+    result['collisions'] = {'prefix': tally.prefix,
+                            'samples': tally.samples,
+                            'observed': tally.collisions,
+                            'expected': expected,
+                            'score': (tally.collisions - expected) /
+                                     math.sqrt(expected) if expected else 0.0,
+                           }
+    scores = [test['score'] for test in positions]
+    scores += [result['serial']['score'], result['collisions']['score']]
+    if result['classes'] is not None:
+        scores.append(result['classes']['score'])
+    result['max_score'] = max(scores, key=abs)
+    result['passed'] = not result['invalid'] and \
+                       abs(result['max_score']) <= SCORE_LIMIT
+    return result
+
+def _ChiSquare(observed, expected):
+    '''Returns the chi-square test of 'observed' counts (dict).
+
+The score is the statistic converted to a standard normal deviate by
+the Wilson-Hilferty approximation.
+'''
+    statistic = sum((o - e) ** 2 / e for o, e in zip(observed, expected)
+                    if e
+                   )
+    freedom = len(observed) - 1
+    if freedom < 1:
+        return {'chi2': statistic, 'df': freedom, 'score': 0.0}
+    score = ((statistic / freedom) ** (1 / 3) - (1 - 2 / (9 * freedom))) / \
+            math.sqrt(2 / (9 * freedom))
+    return {'chi2': statistic, 'df': freedom, 'score': score}
+
+def Main(arguments=None):
+    '''Command line interface.'''
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=__title__,
+                                     description=__description__
+                                    )
+    parser.add_argument('-c', '--count', type=int, default=10**6,
+                        help='senhas por padrão (padrão: 1000000)'
+                       )
+    parser.add_argument('-l', '--length', type=int, default=16,
+                        help='comprimento das senhas, de 4 a 64 (padrão: 16)'
+                       )
+    parser.add_argument('-p', '--patterns', type=int, nargs='+',
+                        default=list(range(1, 16)),
+                        help='padrões auditados (padrão: 1 a 15)'
+                       )
+    parser.add_argument('-b', '--backend', choices=sorted(pwgen.BACKENDS),
+                        default='system',
+                        help='fonte de números aleatórios (padrão: system)'
+                       )
+    parser.add_argument('--packed', action='store_true',
+                        help='usa a extração compacta da fonte'
+                       )
+    parser.add_argument('-w', '--workers', type=int,
+                        help='processos (padrão: um por CPU)'
+                       )
+    parser.add_argument('-o', '--output', default='-',
+                        help='arquivo do relatório JSON (padrão: saída '
+                             'padrão)'
+                       )
+    options = parser.parse_args(arguments)
+    try:
+        for pattern in options.patterns:
+            pwgen.GetAlphabet(pattern)
+        report = Audit(options.count, options.length, options.patterns,
+                       options.workers, options.backend, options.packed
+                      )
+    except (TypeError, ValueError) as error:
+        parser.error(str(error))
+
+    text = json.dumps(report, indent=1)
+    if options.output == '-':
+        print (text)
+    else:
+        with open(options.output, 'w', encoding='UTF-8') as f:
+            f.write(text + '\n')
+    for pattern, result in report['patterns'].items():
+        print (f'padrão {pattern:>2}  pior desvio '
+               f'{result["max_score"]:>7.2f}  '
+               f'colisões {result["collisions"]["observed"]:>6}/'
+               f'{result["collisions"]["expected"]:<8.1f} '
+               f'{"ok" if result["passed"] else "FALHOU"}',
+               file=sys.stderr
+              )
+    print (f'{report["characters_per_second"]:,.0f} caracteres/s',
+           file=sys.stderr
+          )
+    return 0 if report['passed'] else 1
+
+# main ------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(Main())
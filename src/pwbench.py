@@ -0,0 +1,741 @@
+#!/usr/bin/python3
+
+'''
+pwbench.py
+
+Benchmarks for the 'pwgen' module.
+
+Usage:
+python3 pwbench.py [--quick] [--output results.json]
+python3 pwbench.py --compare old.json new.json [--threshold 0.1]
+python3 pwbench.py --self-test
+'''
+
+__title__     = 'pwbench'
+__author__    = 'Odmar Miranda'
+__version__   = '00.02.00'
+__date__      = '2026-10-17'
+__description__ = 'Medição de desempenho do módulo pwgen.'
+
+__license__   = 'GNU GPLv3 http://www.gnu.org/licenses'
+__copyright__ = '© 2014, 2026 Odmar Miranda'
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Revisions
+# Version-  ---Date---  --------------------Comments--------------------
+# 0.1.0     2026-10-17  - First version.
+#                       - Throughput and system calls per password of
+#                         each 'pwgen' backend.
+#                       - Scaling of 'pwgen.GenerateParallel' with the
+#                         number of processes.
+#                       - 'pwgen.GenerateArray' throughput.
+#                       - 'require_all' generation against the naive
+#                         generate-and-reject approach.
+#                       - 'pwgen.PasswordPool' hand-out rate.
+# 0.2.0     2026-10-17  - Benchmarks organized in a suite whose results
+#                         are saved as JSON.
+#                       - 'Generate' measured for every length and
+#                         pattern, 'GetEntropy' at large lengths, the
+#                         command line streaming path and the GUI
+#                         update path.
+#                       - Comparison of two result files, flagging
+#                         regressions.
+#                       - Cost of the 'pwgen' instrumentation.
+#                       - Throughput and memory of unique generation.
+#                       - Throughput of template generation.
+#                       - Random bytes per password and uniformity of
+#                         the byte and packed extraction.
+#                       - Blocklist lookups and generation with a
+#                         blocklist.
+#                       - 'pwstrength' batch estimation throughput.
+#                       - Throughput of pronounceable generation.
+#                       - 'pwgen.GenerateInto' throughput, packed and
+#                         strided.
+#                       - Cold and warm cost of site password
+#                         derivation.
+#                       - Self-test of the uniformity of the byte and
+#                         packed extraction.
+
+# imports ---------------------------------------------------------------------
+import argparse
+import io
+import collections
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import pwgen
+import pwstrength
+
+# constants -------------------------------------------------------------------
+COUNT = 100000
+LENGTH = 16
+PATTERN = 15
+# Each measure is repeated and the median is kept.
+REPEAT = 3
+# Relative change above which a result is flagged by 'Compare'.
+THRESHOLD = 0.10
+# 'CheckUniformity' score above which 'SelfTest' fails.
+UNIFORMITY_LIMIT = 4.0
+
+# functions -------------------------------------------------------------------
+def Measure(function, count, repeat=REPEAT):
+    '''Returns operations per second obtained by calling 'function()'.
+
+'function' must perform 'count' operations.  The median of 'repeat'
+runs is returned.
+'''
+    rates = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        rates.append(count / elapsed)
+    return statistics.median(rates)
+
+def BenchGenerate(count=COUNT, length=LENGTH, pattern=PATTERN,
+                  backend=None):
+    '''Passwords per second calling 'pwgen.Generate' in a loop.'''
+
+    def run():
+        for i in range(count):
+            pwgen.Generate(length, pattern, backend)
+    return Measure(run, count)
+
+def BenchGenerateBatch(count=COUNT, length=LENGTH, pattern=PATTERN,
+                       backend=None):
+    '''Passwords per second using 'pwgen.GenerateBatch'.'''
+
+    return Measure(lambda: pwgen.GenerateBatch(count, length, pattern,
+                                               backend
+                                              ),
+                   count
+                  )
+
+def BenchIterGenerate(count=COUNT, length=LENGTH, pattern=PATTERN,
+                      backend=None):
+    '''Passwords per second consuming 'pwgen.IterGenerate'.'''
+
+    def run():
+        for password in pwgen.IterGenerate(count, length, pattern, backend):
+            pass
+    return Measure(run, count)
+
+def BenchGenerateArray(count=COUNT, length=LENGTH, pattern=PATTERN,
+                       backend=None):
+    '''Passwords per second using 'pwgen.GenerateArray' (byte matrix).'''
+
+    return Measure(lambda: pwgen.GenerateArray(count, length, pattern,
+                                               backend=backend
+                                              ),
+                   count
+                  )
+
+def BenchGenerateInto(count=COUNT, length=LENGTH, pattern=PATTERN):
+    '''Passwords per second using 'pwgen.GenerateInto'.
+
+Returns (packed, strided): the rates writing the passwords one after
+the other and in records of length + 1 bytes.
+'''
+    buffer = bytearray(count * (length + 1))
+    packed = Measure(lambda: pwgen.GenerateInto(buffer, count, length,
+                                                pattern
+                                               ),
+                     count
+                    )
+    strided = Measure(lambda: pwgen.GenerateInto(buffer, count, length,
+                                                 pattern, stride=length + 1
+                                                ),
+                      count
+                     )
+    return (packed, strided)
+
+def BenchDerive(count=COUNT // 10, length=16, pattern=PATTERN):
+    '''Cost of 'pwgen.DeriveBatch' without and with the stretched key.
+
+Returns (cold, warm): the seconds to derive one password after
+'pwgen.ClearDerivedKeys' (the master secret is stretched) and the
+passwords per second of a batch of 'count' sites with the key cached.
+'''
+    sites = [(f'servico{i}.example', 'conta', 1) for i in range(count)]
+
+    def cold():
+        pwgen.ClearDerivedKeys()
+        pwgen.Derive('segredo mestre', 'example.com', length=length,
+                     pattern=pattern
+                    )
+
+    seconds = 1 / Measure(cold, 1)
+    warm = Measure(lambda: pwgen.DeriveBatch('segredo mestre', sites, length,
+                                             pattern
+                                            ),
+                   count
+                  )
+    pwgen.ClearDerivedKeys()
+    return (seconds, warm)
+
+def BenchTemplate(count=COUNT, templates=('Aaaa-9999-!!', 'A{4}9{4}-a{6}')):
+    '''Passwords per second using 'pwgen.GenerateTemplateBatch'.
+
+Returns a dictionary {template: passwords per second}.
+'''
+    return {template: Measure(lambda: pwgen.GenerateTemplateBatch(count,
+                                                                  template
+                                                                 ),
+                              count
+                             )
+            for template in templates
+           }
+
+def BenchPronounceable(count=COUNT, length=LENGTH, patterns=(1, 15)):
+    '''Passwords per second using 'pwgen.GeneratePronounceableBatch'.
+
+Returns a dictionary {pattern: passwords per second}.  The model is
+loaded before the measure.
+'''
+    pwgen.GetMarkov().entropy(length)
+    return {pattern: Measure(lambda: pwgen.GeneratePronounceableBatch(
+                                 count, length, pattern
+                             ),
+                             count
+                            )
+            for pattern in patterns
+           }
+
+def BenchRequireAll(count=COUNT // 10, lengths=(4, 8, 16), pattern=PATTERN):
+    '''Compares 'require_all' generation with naive rejection.
+
+Naive rejection draws passwords with 'pwgen.IterGenerate' and discards
+those that lack some class.  Returns a list of tuples (length,
+constructive passwords per second, naive passwords per second).
+'''
+    classes = pwgen.GetAlphabet(pattern).classes
+
+    def valid(password):
+        return all(any(char in chars for char in password)
+                   for chars in classes
+                  )
+
+    def naive(length):
+        accepted = 0
+        while accepted < count:
+            for password in pwgen.IterGenerate(count, length, pattern):
+                if valid(password):
+                    accepted += 1
+                    if accepted == count:
+                        break
+
+    results = []
+    for length in lengths:
+        constructive = Measure(lambda: pwgen.GenerateBatch(count, length,
+                                                           pattern,
+                                                           require_all=True
+                                                          ),
+                               count
+                              )
+        results.append((length, constructive,
+                        Measure(lambda: naive(length), count)
+                       ))
+    return results
+
+def BenchPool(count=COUNT, length=LENGTH, pattern=PATTERN):
+    '''Passwords per second taken one by one from a 'pwgen.PasswordPool'.
+
+Returns a tuple (passwords per second, pool statistics).
+'''
+    pool = pwgen.PasswordPool(capacity=4 * pwgen.BATCH_SIZE,
+                              low_water=pwgen.BATCH_SIZE
+                             )
+    pool.take(length, pattern)
+
+    def run():
+        for i in range(count):
+            pool.take(length, pattern)
+    rate = Measure(run, count)
+    pool.close()
+    return (rate, pool.stats())
+
+def BenchBackends(count=COUNT, length=LENGTH, pattern=PATTERN):
+    '''Measures each backend of 'pwgen.BACKENDS'.
+
+Returns a list of tuples (backend name, function name, passwords per
+second, reads of the random source per password).
+'''
+    results = []
+    for name, factory in pwgen.BACKENDS.items():
+        for function, bench in (('Generate', BenchGenerate),
+                                ('GenerateBatch', BenchGenerateBatch),
+                               ):
+            backend = factory()
+            rate = bench(count, length, pattern, backend)
+            reads = backend.reads / (count * REPEAT)
+            results.append((name, function, rate, reads))
+    return results
+
+def BenchExtraction(count=COUNT, length=LENGTH, patterns=(4, 1, 15)):
+    '''Compares the byte and packed extraction of 'pwgen'.
+
+Returns a list of tuples (pattern, extraction, passwords per second,
+random bytes per password, uniformity), where extraction is 'bytes' or
+'packed' (see 'pwgen.Backend') and uniformity is the 'CheckUniformity'
+score.  The ideal number of bytes is also reported, as extraction
+'ideal'.
+'''
+    results = []
+    for pattern in patterns:
+        nchars = len(pwgen.GetAlphabet(pattern))
+        results.append((pattern, 'ideal', None,
+                        length * math.log2(nchars) / 8, None
+                       ))
+        for packed in (False, True):
+            backend = pwgen.SystemBackend()
+            backend.packed = packed
+            rate = BenchGenerateBatch(count, length, pattern, backend)
+            drawn = backend.drawn / (count * REPEAT)
+            seeded = pwgen.SeededBackend(pattern)
+            seeded.packed = packed
+            score = CheckUniformity(count, length, pattern, seeded)
+            results.append((pattern, 'packed' if packed else 'bytes', rate,
+                            drawn, score
+                           ))
+    return results
+
+def CheckUniformity(count=COUNT, length=LENGTH, pattern=PATTERN,
+                    backend=None):
+    '''Chi-square test of the characters at each password position.
+
+Returns the largest score of the positions: the chi-square statistic
+converted to a standard normal deviate (Wilson-Hilferty).  Values above
+about 4 indicate a biased generator.
+'''
+    passwords, entropy = pwgen.GenerateBatch(count, length, pattern, backend)
+    nchars = len(pwgen.GetAlphabet(pattern))
+    freedom = nchars - 1
+    expected = count / nchars
+    scores = []
+    for position in range(length):
+        counts = collections.Counter(password[position]
+                                     for password in passwords
+                                    )
+        statistic = sum((observed - expected) ** 2 / expected
+                        for observed in counts.values()
+                       ) + (nchars - len(counts)) * expected
+        scores.append(((statistic / freedom) ** (1 / 3)
+                       - (1 - 2 / (9 * freedom))
+                      ) / math.sqrt(2 / (9 * freedom))
+                     )
+    return max(scores)
+
+def SelfTest(count=COUNT, length=LENGTH, patterns=(4, 1, 15),
+             limit=UNIFORMITY_LIMIT):
+    '''Checks the uniformity of both extractions of 'pwgen'.
+
+Runs 'CheckUniformity' on 'pwgen.SeededBackend' with byte and packed
+extraction, so the result is reproducible.
+
+Return:
+failures (list) - tuples (pattern, extraction, score) of the scores
+                  above 'limit'; empty if the test passed.
+'''
+    failures = []
+    for pattern in patterns:
+        for packed in (False, True):
+            backend = pwgen.SeededBackend(pattern)
+            backend.packed = packed
+            score = CheckUniformity(count, length, pattern, backend)
+            if score > limit:
+                failures.append((pattern, 'packed' if packed else 'bytes',
+                                 score
+                                ))
+    return failures
+
+def BenchBlocklist(count=COUNT, entries=10**7, length=LENGTH,
+                   pattern=PATTERN):
+    '''Measures 'pwgen.Blocklist' lookups on a file of random hashes.
+
+Returns a dictionary with the lookups per second one at a time and in
+batches of 'pwgen.BATCH_SIZE', and the passwords per second of
+'pwgen.GenerateBatch' with the blocklist set.
+'''
+    size = pwgen.BLOCKLIST_HASH_SIZE
+    passwords = [os.urandom(8).hex() for i in range(count)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'blocklist.pwbl')
+        with open(path, 'wb') as f:
+            f.write(pwgen.BLOCKLIST_HEADER.pack(pwgen.BLOCKLIST_MAGIC,
+                                                pwgen.BLOCKLIST_VERSION,
+                                                size, entries
+                                               ))
+            # Sorted uniform hashes: the gaps between them are
+            # exponentially distributed (with a margin against overflow).
+            generator = random.Random(0)
+            step = (1 << (8 * size)) // (entries + 10 * math.isqrt(entries)
+                                         + 1
+                                        )
+            value = 0
+            for start in range(0, entries, 65536):
+                hashes = []
+                for i in range(start, min(start + 65536, entries)):
+                    value += int(generator.expovariate(1) * step) + 1
+                    hashes.append(value.to_bytes(size, 'big'))
+                f.write(b''.join(hashes))
+        blocklist = pwgen.Blocklist(path)
+
+        def single():
+            for password in passwords:
+                password in blocklist
+
+        def batch():
+            for i in range(0, count, pwgen.BATCH_SIZE):
+                blocklist.contains(passwords[i:i + pwgen.BATCH_SIZE])
+
+        results = {'lookup': Measure(single, count),
+                   'contains': Measure(batch, count),
+                  }
+        previous = pwgen.SetBlocklist(blocklist)
+        try:
+            results['GenerateBatch'] = BenchGenerateBatch(count, length,
+                                                          pattern
+                                                         )
+        finally:
+            pwgen.SetBlocklist(previous)
+            blocklist.close()
+    return results
+
+def BenchStrength(count=COUNT // 10, length=LENGTH, pattern=PATTERN):
+    '''Passwords per second estimated by 'pwstrength.EstimateBatch'.
+
+Returns a tuple (random passwords per second, common passwords per
+second); the common ones are variations of dictionary words, which
+produce more matches.
+'''
+    pwstrength.Estimate('')
+    random_passwords = pwgen.GenerateBatch(count, length, pattern)[0]
+    words = ('senha', 'password', 'flamengo', 'qwerty', 'brasil', 'amor')
+    common = [f'{words[i % len(words)].capitalize()}{1950 + i % 70}!'
+              for i in range(count)
+             ]
+    return (Measure(lambda: pwstrength.EstimateBatch(random_passwords),
+                    count
+                   ),
+            Measure(lambda: pwstrength.EstimateBatch(common), count)
+           )
+
+def BenchParallel(count=10 * COUNT, length=LENGTH, pattern=PATTERN):
+    '''Measures 'pwgen.GenerateParallel' from 1 process to the CPU count.
+
+Returns a list of tuples (workers, passwords per second, speed-up
+relative to one worker).
+'''
+    results = []
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        rate = Measure(lambda: pwgen.GenerateParallel(count, length, pattern,
+                                                      workers
+                                                     ),
+                       count, 1
+                      )
+        baseline = results[0][1] if results else rate
+        results.append((workers, rate, rate / baseline))
+    return results
+
+def BenchMetrics(count=COUNT, length=LENGTH, pattern=PATTERN):
+    '''Passwords per second of 'pwgen.Generate' with instrumentation.'''
+
+    pwgen.EnableMetrics()
+    try:
+        return BenchGenerate(count, length, pattern)
+    finally:
+        pwgen.DisableMetrics()
+
+def BenchUnique(count=10 * COUNT, lengths=(8, 16), pattern=PATTERN):
+    '''Measures 'pwgen.IterGenerateUnique'.
+
+Returns a list of tuples (length, passwords per second, bytes of the
+'pwgen.FingerprintSet' per million passwords).
+'''
+    results = []
+    for length in lengths:
+        issued = []
+
+        def run():
+            issued.append(pwgen.FingerprintSet())
+            for password in pwgen.IterGenerateUnique(count, length, pattern,
+                                                     issued=issued[-1]
+                                                    ):
+                pass
+        rate = Measure(run, count, 1)
+        results.append((length, rate, issued[-1].nbytes * 10**6 / count))
+    return results
+
+def BenchGenerateGrid(count=200, lengths=range(4, 65), patterns=range(1, 16)):
+    '''Passwords per second of 'pwgen.Generate' for each length and pattern.
+
+Returns a dictionary {(length, pattern): passwords per second}.
+'''
+    results = {}
+    for length in lengths:
+        for pattern in patterns:
+            def run():
+                for i in range(count):
+                    pwgen.Generate(length, pattern)
+            results[(length, pattern)] = Measure(run, count)
+    return results
+
+def BenchGetEntropy(count=COUNT, sizes=(64, 1000, 10**6, 10**9)):
+    '''Calls per second of 'pwgen.GetEntropy' for each password size.
+
+Returns a dictionary {size: calls per second}.
+'''
+    results = {}
+    for size in sizes:
+        def run():
+            for i in range(count):
+                pwgen.GetEntropy(71, size)
+        results[size] = Measure(run, count)
+    return results
+
+def BenchStreaming(count=10 * COUNT, length=LENGTH, pattern=PATTERN):
+    '''Passwords per second written by the 'pwgen' command line.
+
+The output goes to the null device.
+'''
+    arguments = ['--count', str(count), '--length', str(length),
+                 '--pattern', str(pattern)
+                ]
+    stdout = sys.stdout
+
+    def run():
+        with open(os.devnull, 'wb') as devnull:
+            sys.stdout = io.TextIOWrapper(devnull)
+            try:
+                pwgen.Main(arguments)
+            finally:
+                sys.stdout.detach()
+                sys.stdout = stdout
+    return Measure(run, count)
+
+def BenchGui(count=1000):
+    '''Measures the GUI update path, if a display is available.
+
+Returns a dictionary with the updates per second of
+'Application.generate_pw' and 'Application.ShowEntropy', or None when
+the GUI can not be started (e.g. no display).
+'''
+    try:
+        import tkinter
+        import gerasenha
+        application = gerasenha.Application()
+    except (ImportError, tkinter.TclError):
+        return None
+    application.root.withdraw()
+
+    def generate():
+        for i in range(count):
+            application.generate_pw()
+            application.root.update_idletasks()
+
+    def entropy():
+        # Alternate bands, so every call reconfigures the bar.
+        for i in range(count):
+            application.ShowEntropy(30 if i & 1 else 90)
+            application.root.update_idletasks()
+
+    results = {'generate_pw': Measure(generate, count),
+               'ShowEntropy': Measure(entropy, count),
+              }
+    application.exit()
+    return results
+
+def RunSuite(quick=False, report=print):
+    '''Runs all benchmarks.
+
+With 'quick', the counts are reduced and the 'Generate' grid is
+sampled.  Each result is passed to 'report' as it is obtained.
+
+Return:
+results (dict) - {'environment': {...}, 'results': {name: {'value',
+                 'unit', 'better'}}}; 'better' tells whether a
+                 'higher' or 'lower' value is an improvement.
+'''
+    count = COUNT // 10 if quick else COUNT
+    results = {}
+
+    def add(name, value, unit='senhas/s', better='higher'):
+        results[name] = {'value': value, 'unit': unit, 'better': better}
+        report(f'{name:<40}{value:>16,.2f} {unit}')
+
+    add('Generate', BenchGenerate(count))
+    add('Generate (métricas)', BenchMetrics(count))
+    add('GenerateBatch', BenchGenerateBatch(count))
+    add('IterGenerate', BenchIterGenerate(count))
+    add('GenerateArray', BenchGenerateArray(count))
+    packed, strided = BenchGenerateInto(count)
+    add('GenerateInto', packed)
+    add('GenerateInto (registros)', strided)
+    for template, rate in BenchTemplate(count).items():
+        add(f'GenerateTemplateBatch/{template}', rate)
+    for pattern, rate in BenchPronounceable(count).items():
+        add(f'GeneratePronounceableBatch/P{pattern}', rate)
+    cold, warm = BenchDerive(count // 10)
+    add('Derive (frio)', cold * 1000, 'ms', 'lower')
+    add('DeriveBatch (quente)', warm)
+    rate, stats = BenchPool(count)
+    add('PasswordPool.take', rate)
+    add('Streaming (linha de comando)', BenchStreaming(count * 10))
+    for length, constructive, naive in BenchRequireAll(count // 10):
+        add(f'require_all/L{length}', constructive)
+        add(f'rejeição/L{length}', naive)
+    for name, function, rate, reads in BenchBackends(count):
+        add(f'{function}/{name}', rate)
+        add(f'{function}/{name}/leituras', reads, 'leituras/senha', 'lower')
+    for length, rate, memory in BenchUnique(count * 10):
+        add(f'GenerateUnique/L{length}', rate)
+        add(f'GenerateUnique/L{length}/memória', memory / 2**20,
+            'MiB/milhão', 'lower'
+           )
+    for pattern, extraction, rate, drawn, score in BenchExtraction(count):
+        if rate is not None:
+            add(f'Extração/P{pattern}/{extraction}', rate)
+            add(f'Extração/P{pattern}/{extraction}/uniformidade', score,
+                'desvios', 'lower'
+               )
+        add(f'Extração/P{pattern}/{extraction}/bytes', drawn,
+            'bytes/senha', 'lower'
+           )
+    random_rate, common_rate = BenchStrength(count // 10)
+    add('EstimateBatch/aleatórias', random_rate)
+    add('EstimateBatch/comuns', common_rate)
+    blocklist = BenchBlocklist(count, 10**6 if quick else 10**7)
+    add('Blocklist/consulta', blocklist['lookup'], 'consultas/s')
+    add('Blocklist/lote', blocklist['contains'], 'consultas/s')
+    add('GenerateBatch (lista de bloqueio)', blocklist['GenerateBatch'])
+    for workers, rate, speedup in BenchParallel(count * 10):
+        add(f'GenerateParallel/{workers}', rate)
+    if quick:
+        grid = BenchGenerateGrid(100, (4, 8, 16, 32, 64), (1, 4, 7, 15))
+    else:
+        grid = BenchGenerateGrid()
+    for (length, pattern), rate in grid.items():
+        add(f'Generate/L{length}/P{pattern}', rate)
+    for size, rate in BenchGetEntropy(count).items():
+        add(f'GetEntropy/{size}', rate, 'chamadas/s')
+    gui = BenchGui(100 if quick else 1000)
+    if gui is None:
+        report('Interface gráfica indisponível: medida omitida.')
+    else:
+        for name, rate in gui.items():
+            add(f'Application.{name}', rate, 'atualizações/s')
+
+    environment = {'pwgen': pwgen.__version__,
+                   'python': platform.python_version(),
+                   'platform': platform.platform(),
+                   'cpus': os.cpu_count(),
+                   'numpy': importlib.util.find_spec('numpy') is not None,
+                   'quick': quick,
+                   'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                  }
+    return {'environment': environment, 'results': results}
+
+def Compare(old, new, threshold=THRESHOLD):
+    '''Compares two results of 'RunSuite'.
+
+Returns a list of tuples (name, old value, new value, relative change,
+regression), for the results present in both.  A change is a
+regression when the value got worse by more than 'threshold'.
+'''
+    comparison = []
+    for name, result in new['results'].items():
+        if name not in old['results']:
+            continue
+        before = old['results'][name]['value']
+        after = result['value']
+        change = (after - before) / before if before else 0.0
+        if result['better'] == 'higher':
+            regression = change < -threshold
+        else:
+            regression = change > threshold
+        comparison.append((name, before, after, change, regression))
+    return comparison
+
+def Main(arguments=None):
+    '''Command line interface.
+
+Return:
+status (int) - 1 if 'Compare' found regressions or 'SelfTest' failed,
+               0 otherwise.
+'''
+    parser = argparse.ArgumentParser(prog=__title__,
+                                     description=__description__
+                                    )
+    parser.add_argument('-q', '--quick', action='store_true',
+                        help='execução reduzida'
+                       )
+    parser.add_argument('-o', '--output',
+                        help='grava os resultados neste arquivo JSON'
+                       )
+    parser.add_argument('-c', '--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='compara dois arquivos de resultados'
+                       )
+    parser.add_argument('-t', '--threshold', type=float, default=THRESHOLD,
+                        help='variação relativa considerada regressão'
+                       )
+    parser.add_argument('-s', '--self-test', action='store_true',
+                        help='verifica a uniformidade das extrações'
+                       )
+    options = parser.parse_args(arguments)
+
+    if options.self_test:
+        failures = SelfTest()
+        for pattern, extraction, score in failures:
+            print (f'P{pattern}/{extraction}: uniformidade {score:.2f} '
+                   f'desvios, acima de {UNIFORMITY_LIMIT}'
+                  )
+        print (f'{len(failures)} falhas.')
+        return 1 if failures else 0
+
+    if options.compare:
+        results = []
+        for path in options.compare:
+            with open(path, encoding='UTF-8') as f:
+                results.append(json.load(f))
+        regressions = 0
+        for name, before, after, change, regression in Compare(
+                *results, options.threshold):
+            flag = 'REGRESSÃO' if regression else ''
+            regressions += regression
+            print (f'{name:<40}{before:>16,.2f}{after:>16,.2f}'
+                   f'{change:>+9.1%}  {flag}'
+                  )
+        print (f'\n{regressions} regressões.')
+        return 1 if regressions else 0
+
+    print (f'{__title__} - {__description__}\n')
+    results = RunSuite(options.quick)
+    if options.output:
+        with open(options.output, 'w', encoding='UTF-8') as f:
+            json.dump(results, f, indent=1)
+    return 0
+
+# main ------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(Main())
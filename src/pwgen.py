@@ -8,8 +8,8 @@ Pseudo-random password generator.
 
 __title__     = 'pwgen'
 __author__    = 'Odmar Miranda'
-__version__   = '00.05.00'
-__date__      = '2020-09-07'
+__version__   = '00.06.00'
+__date__      = '2026-10-17'
 __description__ = 'Módulo para geração de senhas pseudo-aleatórias.'
 __long_description__ = '''\n
 Este módulo gera senhas pseudo-aleatórias de comprimento variável de
@@ -76,12 +76,1120 @@ __copyright__ = '\u00A9 2014, 2020 Odmar Miranda'
 #                       - 'Generate' function now returns entropy.
 # 0.5.0     2020-09-07  - Updated to Python 3 and above.
 #                       - New version numbering scheme adopted.
+# 0.6.0     2026-10-17  - 'GenerateBatch' and 'IterGenerate' functions
+#                         included for bulk generation.  Parameters are
+#                         validated once and the passwords are filled
+#                         from large chunks of random bytes.
+#                       - Random bytes are drawn from pluggable backends
+#                         ('SystemBackend', 'PoolBackend' and
+#                         'SeededBackend') instead of the global
+#                         'random' module.  The backend may be chosen
+#                         per call or per process ('SetBackend').
+#                       - Command line interface for headless use.  The
+#                         passwords are streamed to the standard output
+#                         in large buffered writes.  Without arguments,
+#                         the self-test is still displayed.
+#                       - 'GenerateParallel' and 'IterGenerateParallel'
+#                         functions split bulk generation across a
+#                         process pool.  Each task has its own random
+#                         stream.
+#                       - 'GenerateArray' function returns the passwords
+#                         as a fixed-width byte matrix, using NumPy when
+#                         it is available.
+#                       - 'Alphabet' class holds the character set of a
+#                         pattern or custom charset, compiled once and
+#                         memoized by 'GetAlphabet', together with the
+#                         tables used to map random bytes and the
+#                         entropy of every supported length.
+#                       - 'GetEntropy' no longer builds the power
+#                         nchars**psize.
+#                       - 'require_all' parameter of the generation
+#                         functions guarantees that every character
+#                         class of the pattern appears in the password.
+#                         The passwords are built without rejection
+#                         loops and are uniform over the constrained
+#                         space, whose entropy is reported.
+#                       - 'PasswordPool' class keeps reservoirs of ready
+#                         passwords, refilled in bulk by a background
+#                         thread.
+#                       - Opt-in instrumentation ('EnableMetrics'):
+#                         passwords per length and pattern, latency
+#                         histograms, random bytes drawn and rejected.
+#                         Exported in Prometheus text format or through
+#                         callback hooks.
+#                       - 'GeneratePassphrase' function generates
+#                         passphrases from large wordlists, compiled by
+#                         'CompileWordlist' into an indexed binary file
+#                         that 'Wordlist' reads through a memory map.
+#                       - 'GenerateUnique' and 'IterGenerateUnique'
+#                         functions never repeat a password, using the
+#                         compact 'FingerprintSet' to remember them.
+#                       - 'GenerateToken' and 'WriteToken' functions
+#                         generate secrets of any length; 'WriteToken'
+#                         streams them in chunks with constant memory.
+#                       - 'Template' class and 'GenerateTemplate' and
+#                         'GenerateTemplateBatch' functions generate
+#                         passwords of fixed formats (e.g. 'Aaaa-9999'),
+#                         compiled once into a plan of per-position
+#                         alphabets.  'GetEntropy' accepts the size of
+#                         the alphabet of each position.
+#                       - Backends marked as 'packed' have the
+#                         characters extracted from wide random
+#                         integers, spending close to log2(nchars)
+#                         random bits per character.
+#                       - 'Blocklist' class checks passwords against a
+#                         local sorted file of SHA-1 hashes (e.g. of
+#                         breached passwords), read through a memory
+#                         map.  With 'SetBlocklist', the generation
+#                         functions replace blocked passwords.
+#                       - NumPy and 'concurrent.futures' are imported on
+#                         first use, so importing 'pwgen' (e.g. at the
+#                         start of the GUI) is faster.
+#                       - 'GeneratePronounceable' and
+#                         'GeneratePronounceableBatch' functions
+#                         generate pronounceable passwords from the
+#                         character n-gram model of 'Markov', compiled
+#                         from a corpus by 'CompileMarkov'.  Digits and
+#                         symbols of the pattern are inserted at random
+#                         positions and the exact entropy is reported.
+#                       - 'GenerateInto' function writes passwords
+#                         directly into a writable buffer (e.g.
+#                         'bytearray', 'mmap' or shared memory), at a
+#                         given offset and stride.
+#                       - 'Derive' and 'DeriveBatch' functions derive
+#                         site passwords from a master secret, without
+#                         storing them: the secret is stretched once by
+#                         'DeriveKey' (cached with expiration) and each
+#                         site key is expanded with HMAC by
+#                         'DerivedBackend'.
+#                       - 'CompileCached' function compiles wordlists and
+#                         dictionaries into a private per-user cache.
+#                       - 'CheckParameters' function validates the
+#                         parameters of the bulk functions up front.
 
 # imports ---------------------------------------------------------------------
+import array
+import bisect
+import collections
+import functools
+import hashlib
+import hmac
+import io
+import itertools
+import json
 import math
+import mmap
+import os
 import random
+import re
+import secrets
+import struct
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+import warnings
 
 # classes ---------------------------------------------------------------------
+class Backend():
+    '''Base class of the sources of random bytes.
+
+Subclasses implement 'read'.  The 'reads' attribute counts the requests
+made to the underlying source (system calls, for the OS sources) and
+'drawn' counts the bytes handed out.  Backends that read from another
+backend set 'source'.
+
+When 'packed' is true, the characters of the passwords are extracted
+from wide random integers (see '_DrawPacked'), which consumes close to
+log2(nchars) random bits per character instead of 8 or more, at a
+higher CPU cost.  Set it on backends whose bytes are expensive.
+'''
+
+    name = None
+    source = None
+    packed = False
+
+    def __init__(self):
+        '''Initialize counters.'''
+
+        self.reads = 0
+        self.drawn = 0
+
+    def randbytes(self, n):
+        '''Returns 'n' random bytes.'''
+
+        self.drawn += n
+        if _metrics is not None and self.source is None:
+            _metrics.count_bytes(n)
+        return self.read(n)
+
+    def randbelow(self, n):
+        '''Returns a random integer in the range [0, n).'''
+
+        if n < 1:
+            raise ValueError('O limite do número aleatório deve ser '
+                             'positivo.'
+                            )
+        bits = n.bit_length()
+        size = (bits + 7) // 8
+        shift = size * 8 - bits
+        while True:
+            value = int.from_bytes(self.randbytes(size), 'big') >> shift
+            if value < n:
+                return value
+            if _metrics is not None:
+                _metrics.count_bytes(0, size)
+
+    def read(self, n):
+        '''Reads 'n' bytes from the underlying source.'''
+
+        raise NotImplementedError
+
+class SystemBackend(Backend):
+    '''Operating system CSPRNG, one system call per request.'''
+
+    name = 'system'
+
+    def read(self, n):
+        self.reads += 1
+        return secrets.token_bytes(n)
+
+class PoolBackend(Backend):
+    '''Operating system CSPRNG read through a buffer.
+
+The buffer is refilled with reads of 'size' bytes, so many small
+requests cost a single system call.  The buffer is discarded after a
+fork, so parent and child never share random bytes.  If 'source' is
+given, the buffer is refilled from that backend instead.
+'''
+
+    name = 'pool'
+
+    def __init__(self, size=65536, source=None):
+        '''Initialize an empty buffer of 'size' bytes.'''
+
+        super().__init__()
+        self.size = size
+        self.source = source
+        self.packed = source is not None and source.packed
+        self._buffer = b''
+        self._position = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def read(self, n):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._buffer = b''
+                self._position = 0
+                self._pid = os.getpid()
+            if self._position + n > len(self._buffer):
+                # Keep the unused bytes and read a new block.
+                self.reads += 1
+                if self.source is None:
+                    block = os.urandom(max(self.size, n))
+                else:
+                    block = self.source.randbytes(max(self.size, n))
+                self._buffer = self._buffer[self._position:] + block
+                self._position = 0
+            start = self._position
+            self._position += n
+            return self._buffer[start:self._position]
+
+class SeededBackend(Backend):
+    '''Deterministic PRNG, for reproducible tests only.
+
+Not suitable for real passwords: the output is fully determined by
+'seed'.
+'''
+
+    name = 'seeded'
+
+    def __init__(self, seed=0):
+        '''Initialize the generator with 'seed'.'''
+
+        super().__init__()
+        self._random = random.Random(seed)
+
+    def read(self, n):
+        self.reads += 1
+        return self._random.randbytes(n)
+
+class DerivedBackend(Backend):
+    '''Deterministic stream of bytes expanded from a key with HMAC.
+
+Block i of the stream (from 0) is HMAC-SHA256(key, i), with i as 8
+bytes, big endian.  The stream is fully determined by 'key', which must
+be secret: see 'Derive'.
+'''
+
+    name = 'derived'
+
+    def __init__(self, key):
+        '''Start the stream of 'key' (bytes).'''
+
+        super().__init__()
+        self._hmac = hmac.new(key, digestmod=hashlib.sha256)
+        self._block = 0
+        self._buffer = b''
+
+    def read(self, n):
+        while len(self._buffer) < n:
+            self.reads += 1
+            block = self._hmac.copy()
+            block.update(self._block.to_bytes(8, 'big'))
+            self._buffer += block.digest()
+            self._block += 1
+        data = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return data
+
+class Alphabet():
+    '''Character set compiled for password generation.
+
+Instances are immutable and shared: use 'GetAlphabet' to obtain them.
+
+Attributes:
+chars     (tuple) - valid characters.
+string    (str)   - valid characters, concatenated.
+table     (bytes) - 'bytes.translate' table that maps a random byte
+                    into chars[byte % len(chars)].
+rejected  (bytes) - byte values at or above 'threshold', discarded
+                    because they would bias the result.
+threshold (int)   - largest multiple of len(chars) not above 256.
+lookup    (bytes) - ASCII codes of the characters, by index.
+entropy   (tuple) - entropy in bits of a password of each length, from
+                    0 to MAX_LENGTH.
+classes   (tuple) - character classes (strings) that make up the set:
+                    those enabled by the pattern, or the whole custom
+                    set.
+pattern   (int)   - pattern number of the set, or None if it is a
+                    custom set.
+'''
+
+    __slots__ = ('chars', 'string', 'table', 'rejected', 'threshold',
+                 'lookup', 'entropy', 'classes', 'pattern'
+                )
+
+    def __init__(self, string, classes=None):
+        '''Compile the character set 'string', made of 'classes'.'''
+
+        nchars = len(string)
+        self.chars = tuple(string)
+        self.string = string
+        self.lookup = string.encode('ascii')
+        self.threshold = 256 - 256 % nchars
+        self.table = bytes(self.lookup[b % nchars] if b < self.threshold
+                           else 0
+                           for b in range(256)
+                          )
+        self.rejected = bytes(range(self.threshold, 256))
+        self.entropy = tuple(GetEntropy(nchars, length)
+                             for length in range(MAX_LENGTH + 1)
+                            )
+        self.classes = classes or (string,)
+        bits = {LOWER_LETTERS: 1, UPPER_LETTERS: 2, DIGITS: 4, SYMBOLS: 8}
+        if all(chars in bits for chars in self.classes):
+            self.pattern = sum(bits[chars] for chars in self.classes)
+        else:
+            self.pattern = None
+
+    def __len__(self):
+        return len(self.chars)
+
+    def __repr__(self):
+        return f'Alphabet({self.string!r})'
+
+    def __reduce__(self):
+        # Unpickled instances are also taken from the cache.
+        return (_CompileAlphabet, (self.string, self.classes))
+
+    def bits(self, length):
+        '''Returns the entropy, in bits, of a password of 'length'.'''
+
+        if length <= MAX_LENGTH:
+            return self.entropy[length]
+        return GetEntropy(len(self.chars), length)
+
+class PasswordPool():
+    '''Reservoirs of ready passwords, refilled in the background.
+
+A reservoir of up to 'capacity' passwords is kept for each (length,
+pattern) requested.  When a reservoir falls below 'low_water', a
+background thread (or the caller, if 'background' is false) refills it
+in bulk with 'GenerateBatch'.  Taking a password is a single pop from a
+deque, and each password is handed out only once.
+
+Attributes:
+hits    (int) - passwords taken from a reservoir.
+misses  (int) - takes that found the reservoir empty and had to wait
+                for a refill.
+refills (int) - bulk refills performed.
+'''
+
+    def __init__(self, capacity=1024, low_water=256, backend=None,
+                 background=True):
+        '''Initialize an empty pool.'''
+
+        if low_water >= capacity:
+            raise ValueError('O nível mínimo deve ser menor que a '
+                             'capacidade.'
+                            )
+        self.capacity = capacity
+        self.low_water = low_water
+        self.backend = backend
+        self.background = background
+        # Hits are counted by each thread in its own cell, without the
+        # lock, and added up when read.
+        self._hits = []
+        self._local = threading.local()
+        self.misses = 0
+        self.refills = 0
+        self._reservoirs = {}
+        self._entropy = {}
+        self._lock = threading.Lock()
+        self._refill_lock = threading.Lock()
+        self._pending = collections.deque()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def take(self, length=8, pattern=15, block=True):
+        '''Returns a password and its entropy, as 'Generate' does.
+
+If 'block' is false and the reservoir is empty, the refill is left to
+the background thread and None is returned instead of waiting for it.
+'''
+        key = (length, pattern)
+        reservoir = self._reservoirs.get(key)
+        if reservoir is None:
+            reservoir = self._register(key, block)
+        while True:
+            try:
+                password = reservoir.popleft()
+                break
+            except IndexError:
+                with self._lock:
+                    self.misses += 1
+                if not block:
+                    self._request(key)
+                    return None
+                self._refill(key)
+        try:
+            self._local.hits[0] += 1
+        except AttributeError:
+            self._local.hits = [1]
+            with self._lock:
+                self._hits.append(self._local.hits)
+        if len(reservoir) < self.low_water:
+            self._request(key)
+        return (password, self._entropy[key])
+
+    @property
+    def hits(self):
+        '''Passwords taken from a reservoir, by all the threads.'''
+
+        with self._lock:
+            return sum(cell[0] for cell in self._hits)
+
+    def stats(self):
+        '''Returns a dictionary with the pool statistics.'''
+
+        with self._lock:
+            return {'hits': sum(cell[0] for cell in self._hits),
+                    'misses': self.misses,
+                    'refills': self.refills,
+                    'ready': {key: len(reservoir)
+                              for key, reservoir in self._reservoirs.items()
+                             },
+                   }
+
+    def close(self):
+        '''Stops the background thread.'''
+
+        self._closed = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _register(self, key, fill=True):
+        '''Creates the reservoir of 'key' and, if 'fill', fills it.'''
+
+        length, pattern = key
+        with self._lock:
+            if key not in self._reservoirs:
+                # Validates the parameters before the reservoir exists.
+                alphabet = _GetAlphabet(length, pattern)
+                self._entropy[key] = alphabet.entropy[length]
+                self._reservoirs[key] = collections.deque()
+        if fill:
+            self._refill(key)
+        return self._reservoirs[key]
+
+    def _refill(self, key):
+        '''Fills the reservoir of 'key' up to its capacity.'''
+
+        reservoir = self._reservoirs[key]
+        with self._refill_lock:
+            missing = self.capacity - len(reservoir)
+            if missing > 0:
+                passwords, entropy = GenerateBatch(missing, key[0], key[1],
+                                                   self.backend
+                                                  )
+                reservoir.extend(passwords)
+                with self._lock:
+                    self.refills += 1
+
+    def _request(self, key):
+        '''Asks for the reservoir of 'key' to be refilled.'''
+
+        if not self.background:
+            self._refill(key)
+            return
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.append(key)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run,
+                                                name='PasswordPool',
+                                                daemon=True
+                                               )
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self):
+        '''Background thread: refills the requested reservoirs.'''
+
+        while not self._closed:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending and not self._closed:
+                key = self._pending[0]
+                self._refill(key)
+                with self._lock:
+                    self._pending.popleft()
+
+class Metrics():
+    '''Instrumentation data of the generation functions.
+
+Enabled by 'EnableMetrics'.  Each operation (a 'Generate' call, or a
+block of up to 'BATCH_SIZE' passwords of the bulk functions) is counted
+by function, length and pattern, and its duration is added to the
+latency histogram of the function.  Random bytes drawn from the
+sources and the bytes rejected to avoid bias are also counted.
+
+Callables added with 'add_hook' are called after each operation with
+the arguments (function, length, pattern, count, seconds).
+'''
+
+    # Upper bounds, in seconds, of the latency histogram buckets.
+    BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, math.inf)
+
+    def __init__(self):
+        '''Initialize empty counters.'''
+
+        self.passwords = collections.Counter()
+        self.latency = {}
+        self.random_bytes = 0
+        self.rejected_bytes = 0
+        self.hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        '''Adds a callable to be called after each operation.'''
+
+        self.hooks.append(hook)
+
+    def record(self, function, length, alphabet, count, seconds):
+        '''Records an operation that produced 'count' passwords.'''
+
+        pattern = 'custom' if alphabet.pattern is None else alphabet.pattern
+        with self._lock:
+            self.passwords[(function, length, pattern)] += count
+            if function not in self.latency:
+                self.latency[function] = [[0] * len(self.BUCKETS), 0.0]
+            buckets, total = self.latency[function]
+            buckets[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+            self.latency[function][1] = total + seconds
+        for hook in self.hooks:
+            hook(function, length, pattern, count, seconds)
+
+    def count_bytes(self, drawn, rejected=0):
+        '''Counts random bytes drawn from a source and rejected.'''
+
+        with self._lock:
+            self.random_bytes += drawn
+            self.rejected_bytes += rejected
+
+    def prometheus(self):
+        '''Returns the metrics in Prometheus text exposition format.'''
+
+        lines = ['# HELP pwgen_passwords_total Passwords generated.',
+                 '# TYPE pwgen_passwords_total counter',
+                ]
+        with self._lock:
+            for (function, length, pattern), count in sorted(
+                    self.passwords.items(), key=str):
+                lines.append(f'pwgen_passwords_total{{function="{function}",'
+                             f'length="{length}",pattern="{pattern}"}} {count}'
+                            )
+            lines += ['# HELP pwgen_operation_seconds Duration of the '
+                      'generation operations.',
+                      '# TYPE pwgen_operation_seconds histogram',
+                     ]
+            for function, (buckets, total) in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.BUCKETS, buckets):
+                    cumulative += count
+                    bound = '+Inf' if bound == math.inf else repr(bound)
+                    lines.append(f'pwgen_operation_seconds_bucket{{function='
+                                 f'"{function}",le="{bound}"}} {cumulative}'
+                                )
+                lines.append(f'pwgen_operation_seconds_sum{{function='
+                             f'"{function}"}} {total!r}'
+                            )
+                lines.append(f'pwgen_operation_seconds_count{{function='
+                             f'"{function}"}} {cumulative}'
+                            )
+            lines += ['# HELP pwgen_random_bytes_total Random bytes drawn '
+                      'from the sources.',
+                      '# TYPE pwgen_random_bytes_total counter',
+                      f'pwgen_random_bytes_total {self.random_bytes}',
+                      '# HELP pwgen_rejected_bytes_total Random bytes '
+                      'discarded by rejection sampling.',
+                      '# TYPE pwgen_rejected_bytes_total counter',
+                      f'pwgen_rejected_bytes_total {self.rejected_bytes}',
+                     ]
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        '''Writes 'prometheus()' to 'path' (e.g. for a textfile collector).
+
+The file is replaced atomically.
+'''
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='UTF-8') as f:
+            f.write(self.prometheus())
+        os.replace(temporary, path)
+
+class FingerprintSet():
+    '''Compact set of 64-bit fingerprints.
+
+Open addressing table with linear probing over an 'array' of unsigned
+64-bit integers; zero marks an empty slot.  The table doubles when it
+is half full, so it takes 16 to 32 bytes per element, i.e. 16 to 32 MB
+per million passwords, with no Python object per element.
+'''
+
+    def __init__(self, capacity=1024):
+        '''Initialize a table for about 'capacity' elements.'''
+
+        size = 1024
+        while size < 2 * capacity:
+            size *= 2
+        self._table = array.array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        '''Memory used by the table, in bytes.'''
+
+        return len(self._table) * self._table.itemsize
+
+    def add(self, key):
+        '''Adds 'key' (1 to 2**64 - 1); returns False if already present.'''
+
+        table = self._table
+        mask = self._mask
+        slot = ((key * 0x9E3779B97F4A7C15) >> 20) & mask
+        while True:
+            current = table[slot]
+            if current == 0:
+                break
+            if current == key:
+                return False
+            slot = (slot + 1) & mask
+        table[slot] = key
+        self._count += 1
+        if 2 * self._count > mask:
+            self._grow()
+        return True
+
+    def _grow(self):
+        '''Doubles the table.'''
+
+        keys = [key for key in self._table if key]
+        self._table = array.array('Q', bytes(16 * len(self._table)))
+        self._mask = len(self._table) - 1
+        self._count = 0
+        for key in keys:
+            self.add(key)
+
+class Wordlist():
+    '''Compiled wordlist, read through a memory map.
+
+The file, written by 'CompileWordlist', holds a header, an array of
+offsets and the words (UTF-8), sorted and without repetitions:
+
+    magic (4 bytes) | version (uint32) | count (uint32)
+    offsets (count + 1 uint32, little endian)
+    words
+
+A word is read in constant time from its offsets, and the words are
+never loaded as a Python list.  Since they are sorted, 'in' uses a
+binary search.
+'''
+
+    def __init__(self, path):
+        '''Open the compiled wordlist 'path'.'''
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.count = WORDLIST_HEADER.unpack_from(
+                self._map
+            )
+        except struct.error:
+            magic = None
+        if magic != WORDLIST_MAGIC or version != WORDLIST_VERSION:
+            self._map.close()
+            raise ValueError(f'Lista de palavras inválida: {path}.')
+        if not self.count:
+            self._map.close()
+            raise ValueError(f'A lista de palavras está vazia: {path}.')
+        self._offsets = WORDLIST_HEADER.size
+        self._words = self._offsets + 4 * (self.count + 1)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        '''Returns the word at 'index'.'''
+
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('Índice fora da lista de palavras.')
+        start, end = struct.unpack_from('<II', self._map,
+                                        self._offsets + 4 * index
+                                       )
+        return self._map[self._words + start:self._words + end].decode()
+
+    def __contains__(self, word):
+        index = self.bisect(word)
+        return index < self.count and self[index] == word
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def bisect(self, word):
+        '''Returns the index where 'word' is, or would be inserted.'''
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self[middle] < word:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entropy(self, words):
+        '''Returns the entropy, in bits, of 'words' words of the list.'''
+
+        return words * math.log2(self.count)
+
+    def close(self):
+        '''Closes the memory map.'''
+
+        self._map.close()
+
+class Blocklist():
+    '''Sorted file of password hashes, read through a memory map.
+
+The file, written by 'CompileBlocklist', holds a header and the SHA-1
+hashes of the blocked passwords, truncated to 'size' bytes, sorted and
+without repetitions:
+
+    magic (4 bytes) | version (uint32) | size (uint32) | count (uint64)
+    hashes
+
+A file without header, made only of sorted full SHA-1 hashes (20 bytes
+each, as in the binary HIBP downloads), is also accepted.  Since the
+hashes are uniformly distributed, lookups use an interpolation search:
+a few probes find a hash among hundreds of millions.
+'''
+
+    def __init__(self, path):
+        '''Open the blocklist 'path'.'''
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.size, self.count = \
+                BLOCKLIST_HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = None
+        if magic == BLOCKLIST_MAGIC and version == BLOCKLIST_VERSION:
+            self._records = BLOCKLIST_HEADER.size
+        elif len(self._map) % 20 == 0:
+            self.size = 20
+            self.count = len(self._map) // 20
+            self._records = 0
+        else:
+            self._map.close()
+            raise ValueError(f'Lista de bloqueio inválida: {path}.')
+        if not 1 <= self.size <= 20 or \
+           len(self._map) < self._records + self.size * self.count:
+            self._map.close()
+            raise ValueError(f'Lista de bloqueio inválida: {path}.')
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, password):
+        key = self.key(password)
+        index = self._search(key)
+        return index < self.count and self._key(index) == key
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def key(self, password):
+        '''Returns the truncated hash of 'password' (str or bytes), as int.'''
+
+        if isinstance(password, str):
+            password = password.encode()
+        return int.from_bytes(hashlib.sha1(password).digest()[:self.size],
+                              'big'
+                             )
+
+    def contains(self, passwords):
+        '''Returns a list of bools: whether each password is blocked.
+
+The hashes are looked up in sorted order, each search starting where
+the previous one ended, so the pages of the file are visited once.
+'''
+        keys = sorted((self.key(password), i)
+                      for i, password in enumerate(passwords)
+                     )
+        found = [False] * len(keys)
+        index = 0
+        floor = -1
+        for key, i in keys:
+            index = self._search(key, index, floor)
+            found[i] = index < self.count and self._key(index) == key
+            floor = key - 1
+        return found
+
+    def close(self):
+        '''Closes the memory map.'''
+
+        self._map.close()
+
+    def _key(self, index):
+        '''Returns the hash at 'index', as int.'''
+
+        start = self._records + index * self.size
+        return int.from_bytes(self._map[start:start + self.size], 'big')
+
+    def _search(self, key, low=0, floor=-1):
+        '''Returns the index of the first hash not below 'key'.
+
+Searches from 'low' on, where all hashes are above 'floor', by
+interpolation, falling back to bisection if the estimates stop
+converging.
+'''
+        data = self._map
+        size = self.size
+        start = self._records
+        high = self.count
+        ceiling = 1 << (8 * size)
+        for probe in range(BLOCKLIST_PROBES):
+            if high - low <= 4:
+                break
+            index = low + (key - floor) * (high - low) // (ceiling - floor)
+            if index >= high:
+                index = high - 1
+            offset = start + index * size
+            value = int.from_bytes(data[offset:offset + size], 'big')
+            if value < key:
+                low = index + 1
+                floor = value
+            elif value > key:
+                high = index
+                ceiling = value
+            else:
+                return index
+        while low < high:
+            middle = (low + high) // 2
+            offset = start + middle * size
+            if int.from_bytes(data[offset:offset + size], 'big') < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+class Template():
+    '''Password format compiled into a generation plan.
+
+Instances are immutable and shared: use 'GetTemplate' to obtain them.
+In the template, each character stands for a position of the password:
+
+    a      lowercase letter          A      uppercase letter
+    9      digit                     !      symbol
+    *      any of the above          [..]   one of the listed characters
+    {n}    repeats the previous position n times
+    \\c     the character c itself
+
+Any other character is copied to the password.  For example, the
+templates 'Aaaa-9999-!!' and 'A{4}9{4}-a{6}'.
+
+Attributes:
+template (str)   - template source.
+plan     (tuple) - steps (position, size, alphabet, literal): 'size'
+                   consecutive positions drawn from 'alphabet', or
+                   copied from 'literal' (bytes) when it is None.
+length   (int)   - password length.
+sizes    (tuple) - number of valid characters at each position.
+entropy  (int)   - password strength, measured in bits.
+pattern  (None)  - templates have no pattern number (see 'Alphabet').
+'''
+
+    __slots__ = ('template', 'plan', 'length', 'sizes', 'entropy')
+
+    pattern = None
+
+    def __init__(self, template):
+        '''Compile 'template'.'''
+
+        if not isinstance(template, str):
+            raise TypeError('O modelo deve ser um texto.')
+        elif not template.isascii():
+            raise ValueError('O modelo deve ser ASCII.')
+
+        # Positions: Alphabet instances or literal characters.
+        positions = []
+        i = 0
+        while i < len(template):
+            char = template[i]
+            if char in TEMPLATE_CLASSES:
+                positions.append(GetAlphabet(TEMPLATE_CLASSES[char]))
+            elif char == '[':
+                end = template.find(']', i + 2)
+                if end < 0:
+                    raise ValueError(f'Conjunto sem "]" no modelo: '
+                                     f'{template!r}.'
+                                    )
+                positions.append(GetAlphabet(template[i + 1:end]))
+                i = end
+            elif char == '{':
+                end = template.find('}', i)
+                try:
+                    repeat = int(template[i + 1:end])
+                except ValueError:
+                    repeat = 0
+                if end < 0 or repeat < 1:
+                    raise ValueError(f'Repetição inválida no modelo: '
+                                     f'{template!r}.'
+                                    )
+                elif not positions:
+                    raise ValueError(f'Repetição sem posição no modelo: '
+                                     f'{template!r}.'
+                                    )
+                positions += (repeat - 1) * positions[-1:]
+                i = end
+            elif char == '\\':
+                i += 1
+                if i == len(template):
+                    raise ValueError(f'Modelo terminado em "\\": '
+                                     f'{template!r}.'
+                                    )
+                positions.append(template[i])
+            else:
+                positions.append(char)
+            i += 1
+        if not positions:
+            raise ValueError('O modelo não pode ser vazio.')
+
+        # Consecutive positions of the same alphabet, or literals, are
+        # filled by a single step.
+        plan = []
+        position = 0
+        for item, group in itertools.groupby(
+                positions, lambda item: item if isinstance(item, Alphabet)
+                                        else None):
+            group = list(group)
+            literal = (None if item is not None
+                       else ''.join(group).encode('ascii')
+                      )
+            plan.append((position, len(group), item, literal))
+            position += len(group)
+
+        self.template = template
+        self.plan = tuple(plan)
+        self.length = len(positions)
+        self.sizes = tuple(len(item) if isinstance(item, Alphabet) else 1
+                           for item in positions
+                          )
+        self.entropy = GetEntropy(self.sizes)
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f'Template({self.template!r})'
+
+    def __reduce__(self):
+        return (GetTemplate, (self.template,))
+
+    def fill(self, count, backend):
+        '''Returns the characters of 'count' passwords as ASCII bytes.
+
+Each step fills its positions of all passwords at once, with strided
+slice assignments, from a single draw of random characters.
+'''
+        length = self.length
+        chars = bytearray(count * length)
+        for position, size, alphabet, literal in self.plan:
+            if literal is None:
+                drawn = _Draw(alphabet, count * size, backend)
+                for k in range(size):
+                    chars[position + k::length] = \
+                        drawn[k * count:(k + 1) * count]
+            else:
+                for k in range(size):
+                    chars[position + k::length] = literal[k:k + 1] * count
+        return bytes(chars)
+
+class Markov():
+    '''Character n-gram model of pronounceable words.
+
+The model gives the weights of the next letter after each context, that
+is, after the 'order' previous letters (at the start of a password,
+the missing letters are replaced by a start marker).  The file, written
+by 'CompileMarkov', holds a header, the letters of the model and, for
+each context, the cumulative weights of the letters, scaled so that
+they end at 'MARKOV_SCALE':
+
+    magic (4 bytes) | version (uint32) | order (uint32) | size (uint32)
+    letters (size ASCII bytes)
+    weights ((size + 1)**order * size uint32, little endian)
+
+A context is numbered by its letters in base size + 1, the start marker
+being 0.  Each letter is drawn from 16 random bits by a binary search
+of the weights of its context, so no random bits are rejected.
+'''
+
+    def __init__(self, source):
+        '''Load the model from the file 'source' or from its bytes.'''
+
+        if isinstance(source, (bytes, bytearray)):
+            self.path = None
+            data = bytes(source)
+        else:
+            self.path = source
+            with open(source, 'rb') as f:
+                data = f.read()
+        try:
+            magic, version, self.order, size = MARKOV_HEADER.unpack_from(
+                data
+            )
+        except struct.error:
+            magic = None
+        start = MARKOV_HEADER.size + size if magic else 0
+        self._contexts = (size + 1) ** self.order if magic else 0
+        if magic != MARKOV_MAGIC or version != MARKOV_VERSION or \
+           len(data) != start + 4 * self._contexts * size:
+            raise ValueError('Modelo de pronúncia inválido' +
+                             (f': {self.path}.' if self.path else '.')
+                            )
+        self.letters = data[MARKOV_HEADER.size:start]
+        self._ends = array.array('I')
+        self._ends.frombytes(data[start:])
+        if sys.byteorder == 'big':
+            self._ends.byteswap()
+        # Entropy of 0, 1, 2... letters and the distribution of the
+        # contexts after the last one, extended on demand.
+        self._chain = [0.0]
+        self._distribution = {0: 1.0}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.letters)
+
+    def fill(self, count, length, backend):
+        '''Returns 'count' sequences of 'length' letters, concatenated.'''
+
+        size = len(self.letters)
+        base = size + 1
+        contexts = self._contexts
+        ends = self._ends
+        letters = self.letters
+        bisect_right = bisect.bisect_right
+        draws = array.array('H', backend.randbytes(2 * count * length))
+        chars = bytearray(count * length)
+        context = 0
+        for position, value in enumerate(draws):
+            if not position % length:
+                context = 0
+            low = context * size
+            index = bisect_right(ends, value, low, low + size) - low
+            chars[position] = letters[index]
+            context = (context * base + index + 1) % contexts
+        return bytes(chars)
+
+    def entropy(self, length):
+        '''Returns the entropy, in bits, of 'length' letters (float).
+
+The entropy is exact for the model: at each position, the entropy of
+the next letter of every context is weighted by the probability of the
+context, which is carried from one position to the next.
+'''
+        with self._lock:
+            if len(self._chain) <= length:
+                self._extend(length)
+            return self._chain[length]
+
+    def _extend(self, length):
+        '''Computes the entropy of up to 'length' letters.'''
+
+        size = len(self.letters)
+        base = size + 1
+        ends = self._ends
+        distribution = self._distribution
+        while len(self._chain) <= length:
+            entropy = 0.0
+            following = collections.defaultdict(float)
+            for context, probability in distribution.items():
+                low = context * size
+                previous = 0
+                for index in range(size):
+                    weight = ends[low + index] - previous
+                    previous = ends[low + index]
+                    if weight:
+                        share = weight / MARKOV_SCALE
+                        entropy -= probability * share * math.log2(share)
+                        following[(context * base + index + 1) %
+                                  self._contexts] += probability * share
+            self._chain.append(self._chain[-1] + entropy)
+            distribution = following
+        self._distribution = distribution
 
 # contansts -------------------------------------------------------------------
 SYMBOLS = '!#$%&*+?@'
@@ -89,8 +1197,114 @@ DIGITS = '0123456789'
 UPPER_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 LOWER_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
 
+# Characters of the template language that stand for a pattern.
+TEMPLATE_CLASSES = {'a': 1, 'A': 2, '9': 4, '!': 8, '*': 15}
+
+# Packed extraction (see '_DrawPacked'): largest digit, in bits, bits of
+# the random integers and extra bits that keep rejections rare.
+PACKED_DIGIT_BITS = 16
+PACKED_BLOCK_BITS = 1024
+PACKED_MARGIN_BITS = 8
+
+# Password length limits.
+MIN_LENGTH = 4
+MAX_LENGTH = 64
+
+# Number of passwords produced at a time by the bulk generation functions.
+BATCH_SIZE = 4096
+
+# Number of characters written at a time by 'WriteToken'.
+TOKEN_CHUNK_SIZE = 65536
+
+# Number of passwords produced by each task of the parallel functions.
+PARALLEL_BATCH_SIZE = 65536
+
+# Compiled wordlist format (see 'Wordlist').
+WORDLIST_MAGIC = b'PWWL'
+WORDLIST_VERSION = 1
+WORDLIST_HEADER = struct.Struct('<4sII')
+# Wordlist used by 'GeneratePassphrase' when none is given.  It is not
+# distributed: compile one with 'CompileWordlist'.
+WORDLIST = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'assets', 'wordlist.pwl'
+                       )
+
+# Compiled n-gram model format (see 'Markov').
+MARKOV_MAGIC = b'PWMK'
+MARKOV_VERSION = 1
+MARKOV_HEADER = struct.Struct('<4sIII')
+# Previous letters that form the context of 'CompileMarkov' models.
+MARKOV_ORDER = 2
+# Sum of the weights of each context: each letter takes 16 random bits.
+MARKOV_SCALE = 1 << 16
+# Model used by the pronounceable functions when none is given.  If the
+# file does not exist, a model of Portuguese syllables (onset, vowel and
+# coda) is built in memory.
+MARKOV = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      'assets', 'markov.pwm'
+                     )
+MARKOV_ONSETS = ('b', 'c', 'd', 'f', 'g', 'j', 'l', 'm', 'n', 'p', 'r', 's',
+                 't', 'v', 'x', 'z', 'br', 'cr', 'dr', 'fr', 'gr', 'pr', 'tr',
+                 'ch', 'lh', 'nh'
+                )
+MARKOV_VOWELS = ('a', 'e', 'i', 'o', 'u')
+MARKOV_CODAS = ('', 'r', 's', 'n')
+# Letters for each digit or symbol inserted by default in pronounceable
+# passwords.
+MARKOV_EXTRA_EVERY = 8
+
+# Stretching of the master secret of 'Derive' (see 'DeriveKey').  The
+# salt is fixed, so that passwords can be derived on any machine
+# without stored data; a personal salt (e.g. an e-mail address) may be
+# given instead.
+DERIVE_SALT = b'pwgen-derive-v1'
+DERIVE_KDFS = ('scrypt', 'pbkdf2')
+DERIVE_SCRYPT_N = 2 ** 15
+DERIVE_SCRYPT_R = 8
+DERIVE_SCRYPT_P = 1
+DERIVE_PBKDF2_ITERATIONS = 600000
+DERIVE_KEY_SIZE = 32
+# Stretched keys kept in memory: at most 'DERIVE_CACHE_SIZE' (the least
+# recently used are dropped first), each for 'DERIVE_CACHE_TTL' seconds.
+DERIVE_CACHE_SIZE = 8
+DERIVE_CACHE_TTL = 300
+
+# Compiled blocklist format (see 'Blocklist').
+BLOCKLIST_MAGIC = b'PWBL'
+BLOCKLIST_VERSION = 1
+BLOCKLIST_HEADER = struct.Struct('<4sIIQ')
+# Bytes of the SHA-1 hash kept by 'CompileBlocklist'.
+BLOCKLIST_HASH_SIZE = 8
+# Interpolation steps of a lookup before falling back to bisection.
+BLOCKLIST_PROBES = 8
+
+# Per-user directory of the files compiled by 'CompileCached'.
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or
+                         os.path.join(os.path.expanduser('~'), '.cache'),
+                         'gera-senha'
+                        )
+
+# Available backends, by name.
+BACKENDS = {backend.name: backend
+            for backend in (SystemBackend, PoolBackend, SeededBackend)
+           }
+
+# globals ---------------------------------------------------------------------
+# Backend used when none is given to the generation functions.
+_backend = SystemBackend()
+# Backends selected by name, created on first use and then shared.
+_named_backends = {}
+# Instrumentation data, when enabled.
+_metrics = None
+# Passwords never handed out by the generation functions, when set.
+_blocklist = None
+# Stretched master keys of 'DeriveKey', least recently used first:
+# {(digest of the secret, salt, kdf): (key, expiration time)}.
+_derived_keys = collections.OrderedDict()
+_derived_lock = threading.Lock()
+
 # functions -------------------------------------------------------------------
-def Generate(length=8, pattern=15):
+def Generate(length=8, pattern=15, backend=None, require_all=False):
     '''Returns a pseudo-random password of the defined length.
 
 Returned password will consist of the characters defined by the
@@ -104,7 +1318,9 @@ length  (int) - Password length to be generated.  By default, 8
                 than or equal to 64.
 pattern (int) - Value whose binary representation indicates which
                 characters will be used in forming the password.  By
-                default, all characters will be used.
+                default, all characters will be used.  An 'Alphabet'
+                (see 'GetAlphabet') may be given instead, to use a
+                custom character set.
                 The 'pattern' value must be less than or equal to 15,
                 which is equivalent to a 4-bit binary number.
                 The parameter value is interpreted as follows:
@@ -120,18 +1336,709 @@ pattern (int) - Value whose binary representation indicates which
                 7        0111    digits, upper and lower case
                 6        0110    digits and capital letters
                 3        0011    upper and lowercase
+backend       - 'Backend' instance or name (see 'BACKENDS') used as
+                source of random bytes.  By default, the one defined
+                by 'SetBackend'.
+require_all   - If true, at least one character of each class enabled
+        (bool)  by 'pattern' will be present.  All such passwords are
+                equally likely and the entropy returned is that of
+                this smaller set.
 Return:
 password (string) - pseudo-random password.
 entropy  (int)    - password strength, measured in bits.
 '''
-    # Length parameter validation
+    if _metrics is not None:
+        start = time.perf_counter()
+    alphabet = _GetAlphabet(length, pattern)
+    backend = _GetBackend(backend)
+    
+    # Password generation
+    if require_all:
+        draw = lambda: _DrawRequired(alphabet, 1, length, backend)
+        entropy = _RequiredEntropy(alphabet, length)
+    else:
+        draw = lambda: _Draw(alphabet, length, backend)
+        entropy = alphabet.entropy[length]
+    password = draw()
+    if _blocklist is not None:
+        password = _Screen(password, length, draw)
+    password = password.decode('ascii')
+    if _metrics is not None:
+        _metrics.record('Generate', length, alphabet, 1,
+                        time.perf_counter() - start
+                       )
+    return (password, entropy)
+
+def GenerateBatch(count, length=8, pattern=15, backend=None,
+                  require_all=False):
+    '''Returns a list of pseudo-random passwords of the defined length.
+
+Parameters are the same as those of 'Generate', plus:
+count   (int) - Number of passwords to be generated.
+
+The parameters are validated and the character set is built only once.
+The passwords are then filled from large chunks of random bytes, so the
+per-password cost is much lower than calling 'Generate' in a loop.
+
+Return:
+passwords (list) - pseudo-random passwords.
+entropy   (int)  - strength of each password, measured in bits.
+'''
+    _CheckCount(count)
+    alphabet = _GetAlphabet(length, pattern)
+    backend = _GetBackend(backend)
+    if require_all:
+        passwords = list(_IterRequired(alphabet, count, length, backend,
+                                       'GenerateBatch'
+                                      ))
+        return (passwords, _RequiredEntropy(alphabet, length))
+    passwords = list(_Iterate(alphabet, count, length, backend,
+                              function='GenerateBatch'
+                             ))
+    return (passwords, alphabet.entropy[length])
+
+def IterGenerate(count, length=8, pattern=15, backend=None,
+                 require_all=False):
+    '''Iterates over 'count' pseudo-random passwords.
+
+Same as 'GenerateBatch', but the passwords are yielded as they are
+produced, 'BATCH_SIZE' at a time, so memory use does not grow with
+'count'.
+'''
+    _CheckCount(count)
+    alphabet = _GetAlphabet(length, pattern)
+    backend = _GetBackend(backend)
+    if require_all:
+        return _IterRequired(alphabet, count, length, backend)
+    return _Iterate(alphabet, count, length, backend)
+
+def GenerateParallel(count, length=8, pattern=15, workers=None, seed=None,
+                     backend=None):
+    '''Returns a list of passwords generated by a pool of processes.
+
+Same as 'GenerateBatch', but 'count' is split in tasks of
+'PARALLEL_BATCH_SIZE' passwords run by 'workers' processes (by default,
+one per CPU).  Each task draws from its own random stream: the backend
+named 'backend' in its worker process ('pool' by default) or, when
+'seed' is given, a 'SeededBackend' seeded from 'seed' and the task
+number, so the result is reproducible regardless of the number of
+workers.  Passwords redrawn because of the blocklist come from the same
+kind of stream.
+
+Return:
+passwords (list) - pseudo-random passwords, in task order.
+entropy   (int)  - strength of each password, measured in bits.
+'''
+    passwords = list(IterGenerateParallel(count, length, pattern, workers,
+                                          seed, backend=backend
+                                         ))
+    return (passwords, _GetAlphabet(length, pattern).entropy[length])
+
+def IterGenerateParallel(count, length=8, pattern=15, workers=None,
+                         seed=None, ordered=True, backend=None):
+    '''Iterates over passwords generated by a pool of processes.
+
+Parameters are those of 'GenerateParallel'.  When 'ordered' is false
+the results of each task are yielded as soon as they are ready, which
+keeps all workers busy when the consumer is slow.
+'''
+    return _Iterate(None, count, length, None,
+                    _IterParallelChunks(count, length, pattern, workers,
+                                        seed, ordered, backend
+                                       ))
+
+def GenerateArray(count, length=8, pattern=15, decode=False, backend=None):
+    '''Returns 'count' passwords as a (count, length) matrix of bytes.
+
+Parameters are the same as those of 'GenerateBatch', plus:
+decode (bool) - Return a list of strings instead of the matrix.
+
+With NumPy, the whole index matrix is drawn at once from the random
+bytes, the biased values are rejected in a vectorized way and the
+indices are mapped through a lookup array of the valid characters; the
+matrix is a 'numpy.ndarray' of 'uint8'.  Without NumPy, the pure Python
+path is used and the matrix is a two-dimensional 'memoryview'.  Each
+row holds the ASCII codes of one password, ready to be written to a
+file or hashed in bulk.
+
+Return:
+passwords        - byte matrix or list of strings.
+entropy   (int)  - strength of each password, measured in bits.
+'''
+    _CheckCount(count)
+    if _metrics is not None:
+        start = time.perf_counter()
+    alphabet = _GetAlphabet(length, pattern)
+    backend = _GetBackend(backend)
+    size = count * length
+    numpy = _NumPy()
+    if numpy is not None:
+        chars = _DrawArray(alphabet, size, backend)
+        if _blocklist is not None:
+            chars = numpy.frombuffer(
+                _Screen(chars.tobytes(), length,
+                        lambda: _Draw(alphabet, length, backend)
+                       ),
+                numpy.uint8
+            )
+        chars = chars.reshape(count, length)
+        if decode:
+            text = chars.tobytes().decode('ascii')
+    else:
+        text = _Draw(alphabet, size, backend)
+        if _blocklist is not None:
+            text = _Screen(text, length,
+                           lambda: _Draw(alphabet, length, backend)
+                          )
+        chars = memoryview(text).cast('B', (count, length)) if size else \
+                memoryview(text)
+        if decode:
+            text = text.decode('ascii')
+    if decode:
+        chars = [text[i:i + length] for i in range(0, size, length)]
+    if _metrics is not None:
+        _metrics.record('GenerateArray', length, alphabet, count,
+                        time.perf_counter() - start
+                       )
+    return (chars, alphabet.entropy[length])
+
+def GenerateInto(buffer, count=1, length=8, pattern=15, offset=0, stride=None,
+                 backend=None, require_all=False):
+    '''Writes 'count' passwords, as ASCII bytes, into 'buffer'.
+
+Parameters are the same as those of 'GenerateBatch', plus:
+buffer        - Writable object supporting the buffer protocol, such as
+                'bytearray', 'memoryview', 'mmap.mmap' or the 'buf' of
+                'multiprocessing.shared_memory.SharedMemory'.
+offset  (int) - Position, in bytes, of the first password.
+stride  (int) - Distance, in bytes, between the starts of consecutive
+                passwords.  By default, 'length' (passwords written one
+                after the other).  The bytes between passwords are not
+                changed.
+
+The passwords are drawn 'BATCH_SIZE' at a time and each batch is copied
+into the buffer with slice assignments (one per character position
+when 'stride' is not 'length'), so no object is created per password
+or character.
+
+Return:
+entropy (int) - strength of each password, measured in bits.
+'''
+    _CheckCount(count)
+    alphabet = _GetAlphabet(length, pattern)
+    backend = _GetBackend(backend)
+    if stride is None:
+        stride = length
+    if not isinstance(offset, int) or not isinstance(stride, int):
+        raise TypeError('A posição e o passo devem ser números inteiros.')
+    elif offset < 0:
+        raise ValueError('A posição deve ser maior ou igual a 0.')
+    elif stride < length:
+        raise ValueError('O passo deve ser maior ou igual ao comprimento.')
+    view = memoryview(buffer)
+    if view.readonly:
+        raise TypeError('O buffer deve permitir gravação.')
+    elif not view.c_contiguous:
+        raise ValueError('O buffer deve ser contíguo.')
+    view = view.cast('B')
+    if count and offset + (count - 1) * stride + length > len(view):
+        raise ValueError('O buffer é pequeno demais para as senhas.')
+
+    if require_all:
+        chunks = _IterRequiredChunks(alphabet, count, length, backend,
+                                     'GenerateInto'
+                                    )
+    else:
+        chunks = _IterChunks(alphabet, count, length, backend, 'GenerateInto')
+    position = offset
+    for chunk in chunks:
+        size = len(chunk) // length
+        if stride == length:
+            view[position:position + len(chunk)] = chunk
+        else:
+            end = position + (size - 1) * stride + 1
+            for i in range(length):
+                view[position + i:end + i:stride] = chunk[i::length]
+        position += size * stride
+    if require_all:
+        return _RequiredEntropy(alphabet, length)
+    return alphabet.entropy[length]
+
+def GenerateUnique(count, length=8, pattern=15, backend=None):
+    '''Returns a list of 'count' different passwords.
+
+Same as 'GenerateBatch', but a password already issued is skipped.
+The issued passwords are remembered in a 'FingerprintSet': passwords of
+up to 8 characters are stored exactly (their ASCII codes); longer ones
+by a 64-bit BLAKE2b fingerprint, whose false matches (about one in
+2**64 per pair) can only cause a valid password to be skipped.
+
+A 'RuntimeWarning' is issued when 'count' exceeds half of the number
+of possible passwords (about 2**entropy), since generation slows down
+as it approaches that limit; asking for more than all of them raises
+'ValueError'.
+'''
+    alphabet, issued = _PrepareUnique(count, length, pattern, None, 3)
+    passwords = list(_IterUnique(alphabet, count, length,
+                                 _GetBackend(backend), issued
+                                ))
+    return (passwords, alphabet.entropy[length])
+
+def IterGenerateUnique(count, length=8, pattern=15, backend=None,
+                       issued=None):
+    '''Iterates over 'count' different passwords.
+
+Parameters are those of 'GenerateUnique'.  'issued' is an optional
+'FingerprintSet' of passwords to avoid, shared between calls; it is
+updated with the passwords generated.
+'''
+    alphabet, issued = _PrepareUnique(count, length, pattern, issued, 3)
+    return _IterUnique(alphabet, count, length, _GetBackend(backend), issued)
+
+def GenerateToken(length, pattern=15, backend=None):
+    '''Returns a secret of any length, with the characters of 'pattern'.
+
+Unlike 'Generate', 'length' is only required to be positive, for API
+keys and other long secrets.  See 'WriteToken' for secrets that should
+not be held in memory.
+
+Return:
+token   (string) - pseudo-random secret.
+entropy (int)    - secret strength, measured in bits.
+'''
+    output = io.BytesIO()
+    entropy = WriteToken(output, length, pattern, backend)
+    return (output.getvalue().decode('ascii'), entropy)
+
+def WriteToken(output, length, pattern=15, backend=None,
+               chunk_size=TOKEN_CHUNK_SIZE):
+    '''Writes a secret of 'length' characters to 'output'.
+
+'output' is a path or a binary or text file-like object.  The secret
+is generated and written 'chunk_size' characters at a time, so memory
+use does not depend on 'length'.  Each character is mapped from the
+random bytes without bias, as in 'Generate'.  'pattern' may be a
+pattern number or an 'Alphabet'.
+
+Return:
+entropy (int) - secret strength, measured in bits.
+'''
     if not isinstance(length, int):
         raise TypeError('O comprimento deve ser um número inteiro.')
-    elif length < 4:
-        raise ValueError('O comprimento deve ser maior ou igual a 4.')
-    elif length > 64:
-        raise ValueError('O comprimento deve ser menor ou igual a 64.')
-    
+    elif length < 1:
+        raise ValueError('O comprimento deve ser maior ou igual a 1.')
+    if _metrics is not None:
+        start = time.perf_counter()
+    alphabet = pattern if isinstance(pattern, Alphabet) else \
+               GetAlphabet(pattern)
+    backend = _GetBackend(backend)
+
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            return WriteToken(f, length, alphabet, backend, chunk_size)
+    text = isinstance(output, io.TextIOBase)
+    remaining = length
+    while remaining > 0:
+        size = min(remaining, chunk_size)
+        chunk = _Draw(alphabet, size, backend)
+        output.write(chunk.decode('ascii') if text else chunk)
+        remaining -= size
+    if _metrics is not None:
+        _metrics.record('WriteToken', length, alphabet, 1,
+                        time.perf_counter() - start
+                       )
+    return alphabet.bits(length)
+
+def GenerateTemplate(template, backend=None):
+    '''Returns a password in the format of 'template'.
+
+'template' is a template string (see 'Template') or a compiled
+'Template'.
+
+Return:
+password (string) - pseudo-random password.
+entropy  (int)    - password strength, measured in bits.
+'''
+    passwords, entropy = GenerateTemplateBatch(1, template, backend)
+    return (passwords[0], entropy)
+
+def GenerateTemplateBatch(count, template, backend=None):
+    '''Returns a list of passwords in the format of 'template'.
+
+The template is compiled once (see 'GetTemplate') and each position is
+filled for all passwords of a batch at once.
+
+Return:
+passwords (list) - pseudo-random passwords.
+entropy   (int)  - strength of each password, measured in bits.
+'''
+    _CheckCount(count)
+    template = GetTemplate(template)
+    backend = _GetBackend(backend)
+    chunks = _IterTemplateChunks(template, count, backend,
+                                 'GenerateTemplateBatch'
+                                )
+    passwords = list(_Iterate(None, count, template.length, backend, chunks))
+    return (passwords, template.entropy)
+
+def GeneratePronounceable(length=8, pattern=15, extra=None, model=None,
+                          backend=None):
+    '''Returns a pronounceable pseudo-random password.
+
+Parameters:
+length  (int) - Password length, as in 'Generate'.
+pattern (int) - Character classes, as in 'Generate'.  At least one kind
+                of letters is required: with both, the first letter is
+                capitalized.  Digits and symbols are inserted between
+                the letters.
+extra   (int) - Number of digits or symbols inserted.  By default, one
+                for every 'MARKOV_EXTRA_EVERY' characters, if the
+                pattern has digits or symbols.
+model         - 'Markov' model or path of a compiled model.  By
+                default, 'MARKOV' (see 'GetMarkov').
+backend       - Source of random bytes, as in 'Generate'.
+
+The letters follow the n-gram model, so the password can be read
+aloud.  The entropy is that of the model for length - extra letters,
+plus the choice of the positions and of the inserted characters.
+
+Return:
+password (string) - pseudo-random password.
+entropy  (int)    - password strength, measured in bits.
+'''
+    passwords, entropy = GeneratePronounceableBatch(1, length, pattern, extra,
+                                                    model, backend
+                                                   )
+    return (passwords[0], entropy)
+
+def GeneratePronounceableBatch(count, length=8, pattern=15, extra=None,
+                               model=None, backend=None):
+    '''Returns a list of pronounceable pseudo-random passwords.
+
+Parameters are the same as those of 'GeneratePronounceable', plus:
+count   (int) - Number of passwords to be generated.
+
+The letters of all passwords of a batch are drawn from a single block
+of random bytes.
+
+Return:
+passwords (list) - pseudo-random passwords.
+entropy   (int)  - strength of each password, measured in bits.
+'''
+    _CheckCount(count)
+    model, extra, entropy = _PreparePronounceable(length, pattern, extra,
+                                                  model
+                                                 )
+    backend = _GetBackend(backend)
+    chunks = _IterPronounceableChunks(model, count, length, pattern, extra,
+                                      backend, 'GeneratePronounceableBatch'
+                                     )
+    passwords = list(_Iterate(None, count, length, backend, chunks))
+    return (passwords, int(entropy))
+
+def Derive(master, service, account='', counter=1, length=16, pattern=15,
+           require_all=False, salt=DERIVE_SALT, kdf='scrypt'):
+    '''Returns the password of a site, derived from a master secret.
+
+Parameters:
+master      (str)  - Master secret (text or bytes).
+service     (str)  - Name of the site or service; case and surrounding
+                     spaces are ignored.
+account     (str)  - User name in the service.
+counter     (int)  - Version of the password: increment it to change
+                     the password of a site.
+length, pattern, require_all - As in 'Generate'.
+salt, kdf          - Stretching of the master secret (see 'DeriveKey').
+
+The same parameters always give the same password, on any machine.
+The master secret is stretched by 'DeriveKey' (slow, but cached) and
+the site key is HMAC-SHA256(stretched key, site), where the site is
+made of all the parameters above.  The characters are drawn from the
+'DerivedBackend' of the site key by rejection of the biased bytes; with
+'require_all', passwords without every class are rejected as a whole,
+so the result is uniform.  The blocklist is not applied, since it would
+make the result depend on the machine.
+
+Return:
+password (string) - derived password.
+entropy  (int)    - password strength, measured in bits (of the
+                    password itself, assuming a strong master secret).
+'''
+    passwords, entropy = DeriveBatch(master, [(service, account, counter)],
+                                     length, pattern, require_all, salt, kdf
+                                    )
+    return (passwords[0], entropy)
+
+def DeriveBatch(master, sites, length=16, pattern=15, require_all=False,
+                salt=DERIVE_SALT, kdf='scrypt'):
+    '''Returns the passwords of many sites, derived from a master secret.
+
+Same as 'Derive', for an iterable of (service, account, counter)
+tuples.  The master secret is stretched only once.
+
+Return:
+passwords (list) - derived passwords, in the order of 'sites'.
+entropy   (int)  - strength of each password, measured in bits.
+'''
+    alphabet = _GetAlphabet(length, pattern)
+    if isinstance(pattern, Alphabet):
+        pattern = alphabet.string
+    if _metrics is not None:
+        start = time.perf_counter()
+    key = DeriveKey(master, salt, kdf)
+    classes = [set(chars.encode('ascii')) for chars in alphabet.classes]
+    passwords = []
+    for service, account, counter in sites:
+        if not isinstance(counter, int):
+            raise TypeError('O contador deve ser um número inteiro.')
+        site = json.dumps([service.strip().lower(), account, counter, length,
+                           pattern, bool(require_all)
+                          ]).encode()
+        backend = DerivedBackend(hmac.digest(key, site, 'sha256'))
+        while True:
+            chars = bytearray()
+            while len(chars) < length:
+                # Exactly the missing bytes are read, so the password
+                # depends only on the stream.
+                chars += backend.randbytes(length - len(chars)).translate(
+                    alphabet.table, alphabet.rejected
+                )
+            if not require_all or all(not subset.isdisjoint(chars)
+                                      for subset in classes
+                                     ):
+                break
+        passwords.append(chars.decode('ascii'))
+    if _metrics is not None:
+        # Includes the stretching of the master secret, when not cached.
+        _metrics.record('DeriveBatch', length, alphabet, len(passwords),
+                        time.perf_counter() - start
+                       )
+    if require_all:
+        return (passwords, _RequiredEntropy(alphabet, length))
+    return (passwords, alphabet.entropy[length])
+
+def GeneratePassphrase(words=6, wordlist=None, separator=' ',
+                       capitalize=False, digits=0, backend=None):
+    '''Returns a passphrase of words drawn from a wordlist.
+
+Parameters:
+words      (int)  - Number of words, at least 1.
+wordlist          - 'Wordlist' or path of a compiled wordlist.  By
+                    default, 'WORDLIST', which must have been compiled
+                    with 'CompileWordlist'.
+separator  (str)  - Placed between the words.
+capitalize (bool) - Capitalize the first letter of each word.
+digits     (int)  - Number of random digits, placed together as an
+                    extra word at a random position.
+backend           - Source of random bytes, as in 'Generate'.
+
+Each word is drawn independently and uniformly from the list.  The
+entropy is computed from the size of the list, assuming that its
+words have no digits.
+
+Return:
+passphrase (string) - pseudo-random passphrase.
+entropy    (int)    - passphrase strength, measured in bits.
+'''
+    if not isinstance(words, int) or not isinstance(digits, int):
+        raise TypeError('O número de palavras e de dígitos deve ser inteiro.')
+    elif words < 1:
+        raise ValueError('O número de palavras deve ser maior ou igual a 1.')
+    elif digits < 0:
+        raise ValueError('O número de dígitos deve ser maior ou igual a 0.')
+    if wordlist is None:
+        if not os.path.exists(WORDLIST):
+            raise ValueError(f'Lista de palavras padrão não encontrada: '
+                             f'{WORDLIST}.  Compile uma com '
+                             f"'CompileWordlist' ou informe 'wordlist'."
+                            )
+        wordlist = WORDLIST
+    if not isinstance(wordlist, Wordlist):
+        wordlist = _OpenWordlist(wordlist)
+    backend = _GetBackend(backend)
+
+    chosen = [wordlist[backend.randbelow(len(wordlist))]
+              for i in range(words)
+             ]
+    if capitalize:
+        chosen = [word[:1].upper() + word[1:] for word in chosen]
+    entropy = wordlist.entropy(words)
+    if digits:
+        number = _Draw(GetAlphabet(4), digits, backend).decode('ascii')
+        chosen.insert(backend.randbelow(words + 1), number)
+        entropy += digits * math.log2(10) + math.log2(words + 1)
+    return (separator.join(chosen), int(entropy))
+
+def CompileWordlist(source, target):
+    '''Compiles a text wordlist into the binary format of 'Wordlist'.
+
+'source' has one word per line; in lines with several fields (e.g.
+diceware lists, "11111 word") the last field is the word.  Empty lines
+and repeated words are discarded and the words are sorted.
+
+Return:
+count (int) - number of words in the compiled list.
+'''
+    with open(source, encoding='UTF-8') as f:
+        words = sorted({line.split()[-1] for line in f if line.strip()})
+    if not words:
+        raise ValueError(f'A lista não tem palavras: {source}.')
+    offsets = [0]
+    with open(target, 'wb') as f:
+        f.write(WORDLIST_HEADER.pack(WORDLIST_MAGIC, WORDLIST_VERSION,
+                                     len(words)
+                                    ))
+        encoded = [word.encode() for word in words]
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for word in encoded:
+            f.write(word)
+    _OpenWordlist.cache_clear()
+    return len(words)
+
+def CompileMarkov(source, target, order=MARKOV_ORDER):
+    '''Trains the n-gram model of 'Markov' on a corpus and saves it.
+
+'source' is a UTF-8 text file; its words are folded to the lowercase
+ASCII letters (accents are removed) and every other character separates
+words.  'order' is the number of previous letters of each context, from
+1 to 4.  Contexts not seen in the corpus use the weights of their
+longest seen suffix.
+
+Return:
+count (int) - number of words in the corpus.
+'''
+    if not isinstance(order, int):
+        raise TypeError('A ordem do modelo deve ser um número inteiro.')
+    elif not 1 <= order <= 4:
+        raise ValueError('A ordem do modelo deve estar entre 1 e 4.')
+    with open(source, encoding='UTF-8') as f:
+        text = unicodedata.normalize('NFKD', f.read().lower())
+    words = re.findall('[a-z]+', text.encode('ascii', 'ignore').decode())
+    if not words:
+        raise ValueError(f'O corpus não tem palavras: {source}.')
+    data = _TrainMarkov((('\0' * order + word, 1) for word in words), order)
+    with open(target, 'wb') as f:
+        f.write(data)
+    _OpenMarkov.cache_clear()
+    return len(words)
+
+def CompileBlocklist(source, target, size=BLOCKLIST_HASH_SIZE):
+    '''Compiles a text list into the binary format of 'Blocklist'.
+
+Each line of 'source' is a SHA-1 hash in hexadecimal, optionally
+followed by ':' and a count (the HIBP text format), or else a password,
+which is hashed.  The hashes are truncated to 'size' bytes.  Sorted
+input, such as the HIBP files, is compiled with constant memory;
+otherwise the hashes are sorted in memory.
+
+Return:
+count (int) - number of hashes in the compiled list.
+'''
+    if not 1 <= size <= 20:
+        raise ValueError('O tamanho do hash deve estar entre 1 e 20 bytes.')
+    count = 0
+    ordered = True
+    previous = b''
+    with open(source, encoding='UTF-8', errors='surrogateescape') as f, \
+         open(target, 'wb') as output:
+        output.write(BLOCKLIST_HEADER.pack(BLOCKLIST_MAGIC,
+                                           BLOCKLIST_VERSION, size, 0
+                                          ))
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            field = line.split(':', 1)[0]
+            try:
+                if len(field) != 40:
+                    raise ValueError
+                digest = bytes.fromhex(field)
+            except ValueError:
+                digest = hashlib.sha1(line.encode('UTF-8',
+                                                  'surrogateescape'
+                                                 )).digest()
+            digest = digest[:size]
+            if digest == previous:
+                continue
+            ordered = ordered and digest > previous
+            previous = digest
+            output.write(digest)
+            count += 1
+    if not ordered:
+        with open(target, 'rb') as f:
+            f.seek(BLOCKLIST_HEADER.size)
+            data = f.read()
+        hashes = sorted({data[i:i + size] for i in range(0, len(data), size)})
+        count = len(hashes)
+        with open(target, 'wb') as output:
+            output.write(BLOCKLIST_HEADER.pack(BLOCKLIST_MAGIC,
+                                               BLOCKLIST_VERSION, size, 0
+                                              ))
+            output.writelines(hashes)
+    with open(target, 'r+b') as output:
+        output.write(BLOCKLIST_HEADER.pack(BLOCKLIST_MAGIC, BLOCKLIST_VERSION,
+                                           size, count
+                                          ))
+    return count
+
+def CompileCached(source, compiler, extension):
+    '''Returns the path of 'source' compiled into the per-user cache.
+
+'compiler' is one of the 'Compile...' functions (called as
+compiler(source, target)) and 'extension' that of the compiled file.
+The name of the compiled file is derived from the absolute path, size
+and modification time of 'source', so an edited list is compiled again
+and the file of another list is never reused.  'CACHE_DIR' must belong
+to the user and is created private; the file is compiled under a
+temporary name and then renamed, so it is never seen half written.
+'''
+    status = os.stat(source)
+    key = hashlib.sha256(f'{os.path.realpath(source)}\0{status.st_size}\0'
+                         f'{status.st_mtime_ns}'.encode('UTF-8',
+                                                        'surrogateescape'
+                                                       )).hexdigest()[:32]
+    name = os.path.splitext(os.path.basename(source))[0]
+    target = os.path.join(CACHE_DIR, f'{name}-{key}{extension}')
+    os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+    directory = os.lstat(CACHE_DIR)
+    if hasattr(os, 'getuid') and (directory.st_uid != os.getuid() or
+                                  directory.st_mode & 0o022):
+        raise PermissionError(f'Diretório de cache inseguro: {CACHE_DIR}.')
+    if not os.path.exists(target):
+        descriptor, temporary = tempfile.mkstemp(extension, f'.{name}-',
+                                                 CACHE_DIR
+                                                )
+        os.close(descriptor)
+        try:
+            compiler(source, temporary)
+            os.replace(temporary, target)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+    return target
+
+def GetAlphabet(pattern=15):
+    '''Returns the compiled 'Alphabet' of a character set.
+
+'pattern' is either a pattern number, as in 'Generate', or a string
+with a custom character set (ASCII, no repeated characters, at most 256
+characters).  Alphabets are compiled once and then reused.
+'''
+    if isinstance(pattern, str):
+        if not pattern:
+            raise ValueError('O conjunto de caracteres não pode ser vazio.')
+        elif not pattern.isascii():
+            raise ValueError('O conjunto de caracteres deve ser ASCII.')
+        elif len(set(pattern)) != len(pattern):
+            raise ValueError('O conjunto de caracteres tem repetições.')
+        elif len(pattern) > 256:
+            raise ValueError('O conjunto de caracteres deve ter no máximo '
+                             '256 caracteres.'
+                            )
+        return _CompileAlphabet(pattern, (pattern,))
+
     # Pattern parameter validation
     if not isinstance(pattern, int):
         raise TypeError('O padrão deve ser um número inteiro.')
@@ -142,34 +2049,921 @@ entropy  (int)    - password strength, measured in bits.
     
     # Character set definition
     # Use binary math
-    valid_chars = ''
+    classes = ()
     if pattern & 1:
-        valid_chars += LOWER_LETTERS
+        classes += (LOWER_LETTERS,)
     pattern >>= 1
     if pattern & 1:
-        valid_chars += UPPER_LETTERS
+        classes += (UPPER_LETTERS,)
     pattern >>= 1
     if pattern & 1:
-        valid_chars += DIGITS
+        classes += (DIGITS,)
     pattern >>= 1
     if pattern & 1:
-        valid_chars += SYMBOLS
+        classes += (SYMBOLS,)
+
+    return _CompileAlphabet(''.join(classes), classes)
+
+def CheckParameters(count=1, length=8, pattern=15):
+    '''Validates the parameters of the bulk generation functions.
+
+Raises the TypeError or ValueError that 'GenerateBatch' would, without
+generating anything, so that callers can check their input up front.
+
+Return:
+alphabet (Alphabet) - character set of 'pattern'.
+'''
+    _CheckCount(count)
+    return _GetAlphabet(length, pattern)
+
+def GetEntropy(nchars, psize=None):
+    '''Assess password strength.
+
+Returns floor(log2(nchars**psize)), computed in constant time, so it
+can be used for secrets of any size.
+
+'nchars' may also be a sequence with the number of valid characters of
+each position, when they differ (see 'Template').  The entropy is then
+floor(log2) of their product, and 'psize' is not used.
+'''
+    if not isinstance(nchars, int):
+        product = 1
+        for size, repeat in collections.Counter(nchars).items():
+            product *= size ** repeat
+        return product.bit_length() - 1
     
-    # Password generation
-    characters = []
-    for i in range(length):
-        characters.append(random.choice(valid_chars))
-    password = ''.join(characters)
-    entropy = GetEntropy(len(valid_chars), length)
-    return (password, entropy)
+    return int(psize * math.log2(nchars))
+
+@functools.lru_cache(maxsize=256)
+def GetTemplate(template):
+    '''Returns the compiled 'Template' of a template string.
+
+Templates are compiled once and then reused.
+'''
+    if isinstance(template, Template):
+        return template
+    return Template(template)
+
+def DeriveKey(master, salt=DERIVE_SALT, kdf='scrypt'):
+    '''Returns the stretched master key of 'Derive' (bytes).
+
+'kdf' is 'scrypt' (N = DERIVE_SCRYPT_N, r = DERIVE_SCRYPT_R, p =
+DERIVE_SCRYPT_P) or 'pbkdf2' (HMAC-SHA256, DERIVE_PBKDF2_ITERATIONS).
+Stretching is deliberately slow, so the key is kept in memory for
+'DERIVE_CACHE_TTL' seconds, with at most 'DERIVE_CACHE_SIZE' keys; the
+cache is indexed by a hash of the secret, never by the secret itself.
+Use 'ClearDerivedKeys' to forget the keys.
+'''
+    if isinstance(master, str):
+        master = unicodedata.normalize('NFC', master).encode()
+    if isinstance(salt, str):
+        salt = salt.encode()
+    if not isinstance(master, bytes) or not isinstance(salt, bytes):
+        raise TypeError('O segredo e o sal devem ser texto ou bytes.')
+    elif not master:
+        raise ValueError('O segredo não pode ser vazio.')
+    elif kdf not in DERIVE_KDFS:
+        raise ValueError(f'Função de derivação desconhecida: {kdf!r}.')
+    index = (hashlib.sha256(master).digest(), salt, kdf)
+    now = time.monotonic()
+    with _derived_lock:
+        key, expiration = _derived_keys.get(index, (None, 0))
+        if expiration > now:
+            _derived_keys.move_to_end(index)
+            return key
+
+    if kdf == 'scrypt':
+        key = hashlib.scrypt(master, salt=salt, n=DERIVE_SCRYPT_N,
+                             r=DERIVE_SCRYPT_R, p=DERIVE_SCRYPT_P,
+                             maxmem=256 * DERIVE_SCRYPT_N * DERIVE_SCRYPT_R,
+                             dklen=DERIVE_KEY_SIZE
+                            )
+    else:
+        key = hashlib.pbkdf2_hmac('sha256', master, salt,
+                                  DERIVE_PBKDF2_ITERATIONS, DERIVE_KEY_SIZE
+                                 )
+    with _derived_lock:
+        _derived_keys[index] = (key, now + DERIVE_CACHE_TTL)
+        _derived_keys.move_to_end(index)
+        expired = [index for index, (cached, expiration)
+                   in _derived_keys.items() if expiration <= now
+                  ]
+        for index in expired:
+            del _derived_keys[index]
+        while len(_derived_keys) > DERIVE_CACHE_SIZE:
+            _derived_keys.popitem(last=False)
+    return key
+
+def ClearDerivedKeys():
+    '''Forgets the stretched keys kept by 'DeriveKey'.'''
+
+    with _derived_lock:
+        _derived_keys.clear()
+
+def GetMarkov(model=None):
+    '''Returns the 'Markov' model of the pronounceable functions.
+
+'model' is a 'Markov' or the path of a compiled model.  By default,
+'MARKOV' is used if it exists, otherwise the built-in model of
+Portuguese syllables.  Models are loaded once and then reused.
+'''
+    if isinstance(model, Markov):
+        return model
+    elif model is not None:
+        return _OpenMarkov(model)
+    elif os.path.exists(MARKOV):
+        return _OpenMarkov(MARKOV)
+    return _DefaultMarkov()
+
+def SetBackend(backend):
+    '''Defines the default source of random bytes of the process.
+
+'backend' is a 'Backend' instance or one of the names in 'BACKENDS'.
+Returns the backend previously in use.
+'''
+    global _backend
+
+    previous = _backend
+    _backend = _GetBackend(backend)
+    return previous
+
+def GetBackend():
+    '''Returns the default source of random bytes of the process.'''
+
+    return _backend
+
+def EnableMetrics(metrics=None):
+    '''Enables the instrumentation of the generation functions.
+
+Returns the 'Metrics' instance that receives the data: 'metrics', if
+given, or a new one.  While disabled, the only cost is a test of a
+global variable in each operation.
+'''
+    global _metrics
+
+    _metrics = metrics or Metrics()
+    return _metrics
+
+def DisableMetrics():
+    '''Disables the instrumentation and returns the data collected.'''
+
+    global _metrics
+
+    metrics = _metrics
+    _metrics = None
+    return metrics
+
+def GetMetrics():
+    '''Returns the 'Metrics' in use, or None if disabled.'''
+
+    return _metrics
+
+def SetBlocklist(blocklist):
+    '''Defines the passwords that the generation functions never return.
+
+'blocklist' is a 'Blocklist', the path of one, or None to disable the
+check.  While set, each password generated by 'Generate', the bulk and
+parallel functions, templates, the pool and the command line is looked
+up, and blocked ones are replaced by new draws.  Returns the blocklist
+previously in use.
+'''
+    global _blocklist
+
+    previous = _blocklist
+    if blocklist is not None and not isinstance(blocklist, Blocklist):
+        blocklist = Blocklist(blocklist)
+    _blocklist = blocklist
+    return previous
+
+def GetBlocklist():
+    '''Returns the 'Blocklist' in use, or None.'''
+
+    return _blocklist
+
+def IsBlocked(password, blocklist=None):
+    '''Tells whether 'password' is in 'blocklist' (by default, the one in
+use; False if there is none).
+'''
+    if blocklist is None:
+        blocklist = _blocklist
+    return blocklist is not None and password in blocklist
 
-def GetEntropy(nchars, psize):
-    '''Assess password strength.'''
+def _CheckCount(count):
+    '''Validates the number of passwords of bulk functions.'''
     
-    return int(math.log(nchars**psize, 2))
+    if not isinstance(count, int):
+        raise TypeError('A quantidade deve ser um número inteiro.')
+    elif count < 0:
+        raise ValueError('A quantidade deve ser maior ou igual a 0.')
+
+def _GetBackend(backend):
+    '''Returns the backend to use for 'backend' argument.'''
+
+    if backend is None:
+        return _backend
+    elif isinstance(backend, Backend):
+        return backend
+    elif backend in BACKENDS:
+        if backend not in _named_backends:
+            _named_backends[backend] = BACKENDS[backend]()
+        return _named_backends[backend]
+    raise ValueError(f'Fonte de números aleatórios desconhecida: {backend!r}.')
+
+@functools.lru_cache(maxsize=8)
+def _OpenWordlist(path):
+    '''Returns the 'Wordlist' of 'path', kept open for reuse.'''
+
+    return Wordlist(path)
+
+@functools.lru_cache(maxsize=8)
+def _OpenMarkov(path):
+    '''Returns the 'Markov' model of 'path', loaded once.'''
+
+    return Markov(path)
+
+@functools.lru_cache(maxsize=None)
+def _DefaultMarkov():
+    '''Returns the built-in 'Markov' model of Portuguese syllables.
+
+The model is that of a corpus of every pair of syllables with no coda
+in the second one.  Since a context spans only the two previous
+letters, the same counts come from each syllable (weighted by the
+number of second syllables) and from each distinct ending of a
+syllable followed by each second syllable.
+'''
+    syllables = [onset + vowel + coda
+                 for onset in MARKOV_ONSETS
+                 for vowel in MARKOV_VOWELS
+                 for coda in MARKOV_CODAS
+                ]
+    followers = [onset + vowel
+                 for onset in MARKOV_ONSETS
+                 for vowel in MARKOV_VOWELS
+                ]
+    endings = collections.Counter(syllable[-MARKOV_ORDER:]
+                                  for syllable in syllables
+                                 )
+    samples = itertools.chain(
+        (('\0' * MARKOV_ORDER + syllable, len(followers))
+         for syllable in syllables
+        ),
+        ((ending + follower, weight)
+         for ending, weight in endings.items()
+         for follower in followers
+        )
+    )
+    return Markov(_TrainMarkov(samples, MARKOV_ORDER))
+
+def _TrainMarkov(samples, order):
+    '''Returns the compiled 'Markov' model (bytes) of a corpus.
+
+'samples' yields (text, weight) pairs; the letters of 'text' after the
+first 'order' ones are counted, 'weight' times each, in the context of
+the 'order' characters before them ('\\0' is the start marker).
+'''
+    counts = collections.Counter()
+    for text, weight in samples:
+        for end in range(order, len(text)):
+            counts[text[end - order:end + 1]] += weight
+    letters = ''.join(sorted({gram[-1] for gram in counts}))
+    size = len(letters)
+    symbols = '\0' + letters
+    # Counts of the suffixes of the contexts, for the unseen contexts.
+    suffixes = collections.Counter()
+    for gram, count in counts.items():
+        for cut in range(order + 1):
+            suffixes[gram[cut:]] += count
+
+    ends = array.array('I')
+    for number in range((size + 1) ** order):
+        context = ''
+        for i in range(order):
+            number, digit = divmod(number, size + 1)
+            context = symbols[digit] + context
+        for cut in range(order + 1):
+            weights = [suffixes[context[cut:] + letter] for letter in letters]
+            if any(weights):
+                break
+        total = sum(weights)
+        scaled = [max(1, weight * MARKOV_SCALE // total) if weight else 0
+                  for weight in weights
+                 ]
+        scaled[scaled.index(max(scaled))] += MARKOV_SCALE - sum(scaled)
+        ends.extend(itertools.accumulate(scaled))
+    if sys.byteorder == 'big':
+        ends.byteswap()
+    return MARKOV_HEADER.pack(MARKOV_MAGIC, MARKOV_VERSION, order, size) + \
+           letters.encode('ascii') + ends.tobytes()
+
+def _PreparePronounceable(length, pattern, extra, model):
+    '''Validates the parameters of the pronounceable functions.
+
+Return:
+model   (Markov) - model of the letters.
+extra   (int)    - number of digits or symbols inserted.
+entropy (float)  - entropy of each password, in bits.
+'''
+    if not isinstance(pattern, int):
+        raise TypeError('O padrão deve ser um número inteiro.')
+    _GetAlphabet(length, pattern)
+    if not pattern & 3:
+        raise ValueError('O padrão deve incluir letras.')
+    if extra is None:
+        extra = -(-length // MARKOV_EXTRA_EVERY) if pattern & 12 else 0
+    elif not isinstance(extra, int):
+        raise TypeError('O número de caracteres extras deve ser inteiro.')
+    elif extra and not pattern & 12:
+        raise ValueError('Caracteres extras exigem dígitos ou símbolos '
+                         'no padrão.'
+                        )
+    elif not 0 <= extra < length:
+        raise ValueError('O número de caracteres extras deve estar entre 0 '
+                         'e o comprimento menos 1.'
+                        )
+    model = GetMarkov(model)
+    if not set(model.letters.decode('ascii')) <= set(LOWER_LETTERS):
+        raise ValueError('O modelo deve ter apenas letras minúsculas.')
+    entropy = model.entropy(length - extra)
+    if extra:
+        entropy += math.log2(math.comb(length, extra)) + \
+                   extra * math.log2(len(GetAlphabet(pattern & 12)))
+    return (model, extra, entropy)
+
+def _GetAlphabet(length, pattern):
+    '''Validates parameters and returns the password 'Alphabet'.'''
+    
+    # Length parameter validation
+    if not isinstance(length, int):
+        raise TypeError('O comprimento deve ser um número inteiro.')
+    elif length < MIN_LENGTH:
+        raise ValueError('O comprimento deve ser maior ou igual a 4.')
+    elif length > MAX_LENGTH:
+        raise ValueError('O comprimento deve ser menor ou igual a 64.')
+    
+    if isinstance(pattern, Alphabet):
+        return pattern
+    return GetAlphabet(pattern)
+
+@functools.lru_cache(maxsize=None)
+def _CompileAlphabet(string, classes):
+    '''Returns the memoized 'Alphabet' of 'string'.'''
+
+    return Alphabet(string, classes)
+
+@functools.lru_cache(maxsize=None)
+def _RequiredTable(alphabet, length):
+    '''Returns the tables used to generate passwords with every class.
+
+The compositions of a password (how many characters of each class it
+has, at least one) are listed with the cumulative number of passwords
+of 'length' that have each of them: 'cumulative[-1]' is the number of
+passwords with every class.  'labels' holds, for each composition, the
+class index of each character, in class order, and 'classes' the
+'Alphabet' of each class.
+'''
+    sizes = [len(chars) for chars in alphabet.classes]
+    cumulative = []
+    labels = []
+    total = 0
+    # Each composition splits 'length' at the 'cuts'.
+    for cuts in itertools.combinations(range(1, length), len(sizes) - 1):
+        parts = [end - start for start, end in zip((0,) + cuts,
+                                                   cuts + (length,)
+                                                  )]
+        count = 1
+        remaining = length
+        for size, part in zip(sizes, parts):
+            count *= math.comb(remaining, part) * size**part
+            remaining -= part
+        total += count
+        cumulative.append(total)
+        labels.append(b''.join(bytes([j]) * part
+                               for j, part in enumerate(parts)
+                              ))
+    classes = tuple(_CompileAlphabet(string, (string,))
+                    for string in alphabet.classes
+                   )
+    return (cumulative, labels, classes)
+
+@functools.lru_cache(maxsize=None)
+def _RequiredEntropy(alphabet, length):
+    '''Entropy of a password in which every class appears.
+
+The number of such passwords is counted by inclusion-exclusion over the
+sets of classes left out.
+'''
+    sizes = [len(chars) for chars in alphabet.classes]
+    count = 0
+    for missing in range(len(sizes) + 1):
+        for left_out in itertools.combinations(sizes, missing):
+            count += (-1)**missing * (len(alphabet) - sum(left_out))**length
+    return count.bit_length() - 1
+
+@functools.lru_cache(maxsize=None)
+def _PackingTable(alphabet):
+    '''Returns the tables used by '_DrawPacked' for 'alphabet'.
+
+Each digit below radix = nchars**width stands for 'width' characters,
+listed in 'digits' (radix is at most 2**PACKED_DIGIT_BITS).  Up to
+'block' digits are taken from each random integer.
+'''
+    nchars = len(alphabet)
+    width = 1
+    while nchars ** (width + 1) <= 2 ** PACKED_DIGIT_BITS:
+        width += 1
+    radix = nchars ** width
+    block = max(1, int(PACKED_BLOCK_BITS / math.log2(radix)))
+    digits = [bytes(chars) for chars in itertools.product(alphabet.lookup,
+                                                          repeat=width
+                                                         )]
+    return (radix, width, block, digits)
+
+@functools.lru_cache(maxsize=1024)
+def _PackingBlock(radix, block):
+    '''Returns (modulus, nbytes, limit) for 'block' digits of 'radix'.
+
+A block is taken from an integer of 'nbytes' random bytes that is below
+'limit', the largest multiple of modulus = radix**block that fits.
+'''
+    modulus = radix ** block
+    nbytes = (modulus.bit_length() + PACKED_MARGIN_BITS + 7) // 8
+    return (modulus, nbytes, 256 ** nbytes // modulus * modulus)
+
+def _DrawPacked(alphabet, size, backend):
+    '''Returns 'size' characters extracted from wide random integers.
+
+Each integer of 'nbytes' random bytes is accepted if it is below
+'limit' (see '_PackingBlock'), so that its value modulo radix**block is
+uniform, and is then written in base radix.  Each base radix digit is
+a uniform choice of 'width' characters (see '_PackingTable').  The
+random bits spent per character approach log2(nchars), against 8 or
+more for one byte per character.  Short requests use shorter blocks.
+'''
+    if len(alphabet) == 1:
+        return alphabet.lookup * size
+    radix, width, block, digits = _PackingTable(alphabet)
+    parts = []
+    missing = size
+    while missing > 0:
+        block = min(block, -(-missing // width))
+        modulus, nbytes, limit = _PackingBlock(radix, block)
+        blocks = -(-missing // (block * width))
+        data = backend.randbytes(blocks * nbytes)
+        for start in range(0, len(data), nbytes):
+            value = int.from_bytes(data[start:start + nbytes], 'little')
+            if value >= limit:
+                if _metrics is not None:
+                    _metrics.count_bytes(0, nbytes)
+                continue
+            value %= modulus
+            for i in range(block):
+                value, digit = divmod(value, radix)
+                parts.append(digits[digit])
+            missing -= block * width
+    return b''.join(parts)[:size]
+
+def _DrawIntegers(total, count, backend):
+    '''Returns 'count' uniform integers below 'total'.
+
+Each one is read from the top bits of just enough random bytes and
+drawn again when it is not below 'total'.
+'''
+    bits = total.bit_length()
+    size = (bits + 7) // 8
+    shift = size * 8 - bits
+    accepted = total / (1 << bits)
+    values = []
+    while len(values) < count:
+        missing = count - len(values)
+        chunk = backend.randbytes(size * (int(missing / accepted) + 1))
+        for i in range(0, len(chunk), size):
+            value = int.from_bytes(chunk[i:i + size], 'big') >> shift
+            if value < total:
+                values.append(value)
+            elif _metrics is not None:
+                _metrics.count_bytes(0, size)
+    del values[count:]
+    return values
+
+def _DrawRequired(alphabet, count, length, backend):
+    '''Returns 'count' passwords with at least one character of each class.
+
+The passwords are concatenated and built without discarding any: the
+composition of each one is drawn with the probability of the passwords
+that have it, its class labels are shuffled and each label is replaced
+by a character of its class, so every valid password is equally
+likely.  The characters of a class are drawn for all the passwords at
+once.
+'''
+    cumulative, labels, classes = _RequiredTable(alphabet, length)
+    marks = bytearray(b''.join(
+        labels[bisect.bisect_right(cumulative, value)]
+        for value in _DrawIntegers(cumulative[-1], count, backend)
+    ))
+    # Fisher-Yates shuffle of each password, driven by one integer below
+    # length!: its digits in the bases length, ..., 2 are the positions
+    # j <= i swapped with each position i.
+    steps = range(length - 1, 0, -1)
+    permutations = _DrawIntegers(math.factorial(length), count, backend)
+    for start, value in zip(range(0, count * length, length), permutations):
+        for i in steps:
+            value, j = divmod(value, i + 1)
+            j += start
+            i += start
+            marks[i], marks[j] = marks[j], marks[i]
+    # Characters of each class, taken in order for its labels.
+    chars = [iter(_Draw(subset, marks.count(j), backend))
+             for j, subset in enumerate(classes)
+            ]
+    return bytes(map(next, map(chars.__getitem__, marks)))
+
+def _Iterate(alphabet, count, length, backend, chunks=None,
+             function='IterGenerate'):
+    '''Yields 'count' passwords, 'BATCH_SIZE' at a time.
+
+The characters are taken from 'chunks', by default '_IterChunks'.
+'''
+    if chunks is None:
+        chunks = _IterChunks(alphabet, count, length, backend, function)
+    for chunk in chunks:
+        chars = chunk.decode('ascii')
+        for i in range(0, len(chars), length):
+            yield chars[i:i + length]
+
+def _IterChunks(alphabet, count, length, backend, function='IterGenerate'):
+    '''Yields the characters of 'count' passwords as ASCII bytes.
+
+Each chunk holds up to 'BATCH_SIZE' passwords, concatenated.  With
+instrumentation enabled, each chunk is recorded as an operation of
+'function'.
+'''
+    redraw = lambda: _Draw(alphabet, length, backend)
+    while count > 0:
+        size = min(count, BATCH_SIZE)
+        if _metrics is None:
+            chunk = _Draw(alphabet, size * length, backend)
+            if _blocklist is not None:
+                chunk = _Screen(chunk, length, redraw)
+            yield chunk
+        else:
+            start = time.perf_counter()
+            chunk = _Draw(alphabet, size * length, backend)
+            if _blocklist is not None:
+                chunk = _Screen(chunk, length, redraw)
+            _metrics.record(function, length, alphabet, size,
+                            time.perf_counter() - start
+                           )
+            yield chunk
+        count -= size
+
+def _IterTemplateChunks(template, count, backend, function='IterGenerate'):
+    '''Yields the characters of 'count' passwords of 'template'.
+
+Same as '_IterChunks', for templates.
+'''
+    length = template.length
+    redraw = lambda: template.fill(1, backend)
+    while count > 0:
+        size = min(count, BATCH_SIZE)
+        if _metrics is None:
+            chunk = template.fill(size, backend)
+            if _blocklist is not None:
+                chunk = _Screen(chunk, length, redraw)
+            yield chunk
+        else:
+            start = time.perf_counter()
+            chunk = template.fill(size, backend)
+            if _blocklist is not None:
+                chunk = _Screen(chunk, length, redraw)
+            _metrics.record(function, template.length, template, size,
+                            time.perf_counter() - start
+                           )
+            yield chunk
+        count -= size
+
+def _FillPronounceable(model, count, length, pattern, extra, backend):
+    '''Returns the characters of 'count' pronounceable passwords.'''
+
+    letters = length - extra
+    chunk = model.fill(count, letters, backend)
+    if pattern & 3 == 2:
+        chunk = chunk.upper()
+    capitalize = pattern & 3 == 3
+    if not extra and not capitalize:
+        return chunk
+    if extra:
+        symbols = _Draw(GetAlphabet(pattern & 12), count * extra, backend)
+        # Random values in [0, top] for Floyd's algorithm, which makes a
+        # uniform choice of the 'extra' positions.
+        tops = range(letters, length)
+        draws = [_RandomBelow(top + 1, backend, count) for top in tops]
+    chars = bytearray()
+    for n in range(count):
+        password = bytearray(chunk[n * letters:(n + 1) * letters])
+        if capitalize:
+            password[:1] = password[:1].upper()
+        if extra:
+            positions = set()
+            for top, values in zip(tops, draws):
+                position = values[n]
+                positions.add(top if position in positions else position)
+            for position, symbol in zip(sorted(positions),
+                                        symbols[n * extra:(n + 1) * extra]
+                                       ):
+                password.insert(position, symbol)
+        chars += password
+    return bytes(chars)
+
+def _IterPronounceableChunks(model, count, length, pattern, extra, backend,
+                             function='IterGenerate'):
+    '''Yields the characters of 'count' pronounceable passwords.
+
+Same as '_IterChunks', for 'GeneratePronounceable'.
+'''
+    fill = lambda size: _FillPronounceable(model, size, length, pattern, extra,
+                                           backend
+                                          )
+    redraw = lambda: fill(1)
+    while count > 0:
+        size = min(count, BATCH_SIZE)
+        if _metrics is not None:
+            start = time.perf_counter()
+        chunk = fill(size)
+        if _blocklist is not None:
+            chunk = _Screen(chunk, length, redraw)
+        if _metrics is not None:
+            _metrics.record(function, length, GetAlphabet(pattern), size,
+                            time.perf_counter() - start
+                           )
+        yield chunk
+        count -= size
+
+def _IterParallelChunks(count, length, pattern, workers, seed, ordered,
+                        backend=None):
+    '''Returns an iterator over the chunks generated by a process pool.'''
+
+    _CheckCount(count)
+    alphabet = _GetAlphabet(length, pattern)
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise ValueError('O número de processos deve ser maior ou igual a 1.')
+    # Backends cannot be shared between processes: each worker creates
+    # its own from the name.
+    if seed is not None:
+        if backend not in (None, SeededBackend.name):
+            raise ValueError('A semente só pode ser usada com a fonte '
+                             'seeded.'
+                            )
+        backend = None
+    elif backend is None:
+        backend = PoolBackend.name
+    elif backend == SeededBackend.name:
+        raise ValueError('A fonte seeded exige uma semente.')
+    elif backend not in BACKENDS:
+        raise ValueError('Fonte de números aleatórios desconhecida: '
+                         f'{backend!r}.'
+                        )
+    sizes = [min(PARALLEL_BATCH_SIZE, count - start)
+             for start in range(0, count, PARALLEL_BATCH_SIZE)
+            ]
+    return _ParallelChunks(sizes, length, alphabet, workers, seed, ordered,
+                           backend
+                          )
+
+def _ParallelChunks(sizes, length, alphabet, workers, seed, ordered,
+                    backend):
+    '''Yields the chunks of passwords as the pool tasks complete.'''
+
+    if not sizes:
+        return
+    import concurrent.futures
+
+    # Blocked passwords are redrawn here, from a stream of the same kind
+    # as those of the tasks.
+    redraw = _ParallelBackend(seed, len(sizes), backend)
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        tasks = [executor.submit(_ParallelTask, size, length, alphabet, seed,
+                                 index, backend
+                                )
+                 for index, size in enumerate(sizes)
+                ]
+        if not ordered:
+            tasks = concurrent.futures.as_completed(tasks)
+        start = time.perf_counter()
+        for task, size in zip(tasks, sizes):
+            chunk = task.result()
+            if _blocklist is not None:
+                chunk = _Screen(chunk, length,
+                                lambda: _Draw(alphabet, length, redraw)
+                               )
+            if _metrics is not None:
+                # Time waited for the chunk; the random bytes are drawn in
+                # the workers and are not counted.
+                now = time.perf_counter()
+                _metrics.record('GenerateParallel', length, alphabet,
+                                len(chunk) // length, now - start
+                               )
+                start = now
+            yield chunk
+
+def _ParallelTask(size, length, alphabet, seed, index, backend):
+    '''Generates the characters of 'size' passwords in a worker process.'''
+
+    return _Draw(alphabet, size * length,
+                 _ParallelBackend(seed, index, backend)
+                )
+
+def _ParallelBackend(seed, index, backend):
+    '''Returns the backend of task 'index' of a process pool.
+
+Without 'seed', the backend named 'backend', shared by the tasks of the
+process (e.g. one buffered OS stream per worker).  With it, a
+'SeededBackend' seeded from 'seed' and 'index'.
+'''
+    if seed is None:
+        return _GetBackend(backend)
+    key = hashlib.sha256(f'{seed}:{index}'.encode()).digest()
+    return SeededBackend(int.from_bytes(key, 'big'))
+
+def _DrawArray(alphabet, size, backend):
+    '''Returns a NumPy array of 'size' characters mapped from random bytes.'''
+
+    numpy = _NumPy()
+    if backend.packed:
+        return numpy.frombuffer(_DrawPacked(alphabet, size, backend),
+                                numpy.uint8
+                               )
+    nchars = len(alphabet)
+    limit = alphabet.threshold
+    lookup = numpy.frombuffer(alphabet.lookup, numpy.uint8)
+    indices = numpy.empty(size, numpy.uint8)
+    filled = 0
+    while filled < size:
+        missing = size - filled
+        chunk = numpy.frombuffer(
+            backend.randbytes(int(missing * 256 / limit) + 16), numpy.uint8
+        )
+        accepted = chunk[chunk < limit]
+        if _metrics is not None:
+            _metrics.count_bytes(0, len(chunk) - len(accepted))
+        accepted = accepted[:missing]
+        indices[filled:filled + len(accepted)] = accepted
+        filled += len(accepted)
+    return lookup[indices % nchars]
+
+@functools.lru_cache(maxsize=None)
+def _NumPy():
+    '''Returns the 'numpy' module, imported on first use, or None.'''
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _PrepareUnique(count, length, pattern, issued, stacklevel):
+    '''Validates a request of unique passwords against the keyspace.
+
+Returns the 'Alphabet' and the 'FingerprintSet' of issued passwords.
+'''
+    _CheckCount(count)
+    alphabet = _GetAlphabet(length, pattern)
+    keyspace = len(alphabet)**length
+    if issued is not None:
+        keyspace -= len(issued)
+    if count > keyspace:
+        raise ValueError(f'Só existem {keyspace} senhas diferentes com esse '
+                         'comprimento e padrão.'
+                        )
+    elif 2 * count > keyspace:
+        warnings.warn(f'{count} senhas se aproximam do total de {keyspace} '
+                      'senhas possíveis.', RuntimeWarning, stacklevel
+                     )
+    if issued is None:
+        issued = FingerprintSet(count)
+    return (alphabet, issued)
+
+def _IterUnique(alphabet, count, length, backend, issued):
+    '''Yields 'count' passwords not yet in 'issued'.'''
+
+    if length <= 8:
+        def fingerprint(password):
+            return int.from_bytes(password, 'big')
+    else:
+        def fingerprint(password):
+            key = hashlib.blake2b(password, digest_size=8).digest()
+            return int.from_bytes(key, 'big') or 1
+    add = issued.add
+    while count > 0:
+        # Duplicates are replaced in the next round.
+        for chunk in _IterChunks(alphabet, count, length, backend,
+                                 'GenerateUnique'
+                                ):
+            for i in range(0, len(chunk), length):
+                password = chunk[i:i + length]
+                if add(fingerprint(password)):
+                    count -= 1
+                    yield password.decode('ascii')
+
+def _IterRequired(alphabet, count, length, backend, function='IterGenerate'):
+    '''Yields 'count' passwords with every class of 'alphabet'.'''
+
+    return _Iterate(alphabet, count, length, backend,
+                    _IterRequiredChunks(alphabet, count, length, backend,
+                                        function
+                                       ))
+
+def _IterRequiredChunks(alphabet, count, length, backend,
+                        function='IterGenerate'):
+    '''Yields the characters of 'count' passwords with every class.
+
+Same as '_IterChunks', with the passwords of '_DrawRequired'.
+'''
+    redraw = lambda: _DrawRequired(alphabet, 1, length, backend)
+    while count > 0:
+        size = min(count, BATCH_SIZE)
+        if _metrics is not None:
+            start = time.perf_counter()
+        chunk = _DrawRequired(alphabet, size, length, backend)
+        if _blocklist is not None:
+            chunk = _Screen(chunk, length, redraw)
+        if _metrics is not None:
+            _metrics.record(function, length, alphabet, size,
+                            time.perf_counter() - start
+                           )
+        yield chunk
+        count -= size
+
+def _Screen(chunk, length, draw):
+    '''Replaces the passwords of 'chunk' that are in the blocklist.
+
+'chunk' holds passwords of 'length' characters, concatenated.  Each
+blocked password is replaced by new ones from 'draw()' until one is
+not blocked.
+'''
+    passwords = [chunk[i:i + length] for i in range(0, len(chunk), length)]
+    blocked = _blocklist.contains(passwords)
+    if not any(blocked):
+        return chunk
+    chunk = bytearray(chunk)
+    for i, found in enumerate(blocked):
+        if found:
+            password = draw()
+            while password in _blocklist:
+                password = draw()
+            chunk[i * length:(i + 1) * length] = password
+    return bytes(chunk)
+
+def _Draw(alphabet, size, backend):
+    '''Returns 'size' characters mapped from random bytes.'''
+    
+    if backend.packed:
+        return _DrawPacked(alphabet, size, backend)
+    table = alphabet.table
+    rejected = alphabet.rejected
+    # Expected fraction of accepted bytes, used to size each read.
+    accepted = alphabet.threshold / 256
+    chars = bytearray()
+    while len(chars) < size:
+        missing = size - len(chars)
+        chunk = backend.randbytes(int(missing / accepted) + 16)
+        mapped = chunk.translate(table, rejected)
+        chars += mapped
+        if _metrics is not None:
+            _metrics.count_bytes(0, len(chunk) - len(mapped))
+    del chars[size:]
+    return bytes(chars)
+
+def _RandomBelow(n, backend, count=1):
+    '''Returns 'count' random integers in [0, n), as bytes (n <= 256).
+
+Random bytes are reduced modulo 'n'; those above the largest multiple
+of 'n' would bias the result and are discarded.
+'''
+    table, rejected = _BelowTable(n)
+    # Expected fraction of accepted bytes, used to size each read.
+    accepted = (256 - len(rejected)) / 256
+    values = bytearray()
+    while len(values) < count:
+        chunk = backend.randbytes(int((count - len(values)) / accepted) + 16)
+        reduced = chunk.translate(table, rejected)
+        values += reduced
+        if _metrics is not None:
+            _metrics.count_bytes(0, len(chunk) - len(reduced))
+    del values[count:]
+    return bytes(values)
+
+@functools.lru_cache(maxsize=None)
+def _BelowTable(n):
+    '''Returns the translate table and rejected bytes of '_RandomBelow'.'''
+
+    if not 1 <= n <= 256:
+        raise ValueError('O limite deve estar entre 1 e 256.')
+    threshold = 256 - 256 % n
+    return (bytes(b % n for b in range(256)), bytes(range(threshold, 256)))
+
+def SelfTest():
+    '''Displays module usage and generates some passwords.'''
 
-# main ------------------------------------------------------------------------
-if __name__ == '__main__':
     print (80*'-')
     print (f'''
 {__title__} - {__description__}
@@ -200,3 +2994,240 @@ Obs.: spam é o tamanho da senha e eggs é o padrão de caracteres.
     for j in range(10):
         print (j+1,'\t- ', Generate()[0])
     print ('\nFim do auto-teste.\n')
+
+def Main(arguments=None):
+    '''Command line interface.
+
+Writes the generated passwords to the standard output, one per line (or
+NUL terminated), optionally followed by a tab and the entropy.  Output
+is written in large blocks and memory use does not depend on '--count'.
+Without arguments, runs 'SelfTest'.
+
+Return:
+status (int) - exit status.
+'''
+    if arguments is None:
+        arguments = sys.argv[1:]
+    if not arguments:
+        SelfTest()
+        return 0
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=__title__,
+                                     description=__description__
+                                    )
+    parser.add_argument('-c', '--count', type=int, default=1,
+                        help='quantidade de senhas (padrão: 1)'
+                       )
+    parser.add_argument('-l', '--length', type=int, default=8,
+                        help='comprimento das senhas, de 4 a 64 (padrão: 8)'
+                       )
+    parser.add_argument('-p', '--pattern', type=int, default=15,
+                        help='padrão de caracteres, de 1 a 15 (padrão: 15)'
+                       )
+    parser.add_argument('-0', '--null', action='store_true',
+                        help='termina cada senha com NUL em vez de nova linha'
+                       )
+    parser.add_argument('-e', '--entropy', action='store_true',
+                        help='acrescenta uma coluna com a entropia em bits'
+                       )
+    parser.add_argument('-b', '--backend', choices=sorted(BACKENDS),
+                        help='fonte de números aleatórios (seeded exige '
+                             '--seed e não é segura)'
+                       )
+    parser.add_argument('--seed', type=int,
+                        help='semente da fonte seeded, para testes '
+                             'reproduzíveis'
+                       )
+    parser.add_argument('-r', '--require-all', action='store_true',
+                        help='exige ao menos um caractere de cada tipo'
+                       )
+    parser.add_argument('-w', '--workers', type=int,
+                        help='gera as senhas em paralelo com WORKERS processos'
+                       )
+    parser.add_argument('-t', '--token', action='store_true',
+                        help='gera um único segredo de comprimento '
+                             'arbitrário (sem o limite de --length)'
+                       )
+    parser.add_argument('-T', '--template',
+                        help='formato das senhas, por exemplo Aaaa-9999-!! '
+                             '(substitui --length e --pattern)'
+                       )
+    parser.add_argument('-P', '--pronounceable', action='store_true',
+                        help='gera senhas pronunciáveis (modelo de n-gramas)'
+                       )
+    parser.add_argument('--extra', type=int,
+                        help='dígitos ou símbolos inseridos nas senhas '
+                             'pronunciáveis'
+                       )
+    parser.add_argument('--markov', metavar='FILE',
+                        help='modelo compilado das senhas pronunciáveis'
+                       )
+    parser.add_argument('-D', '--derive', metavar='SERVICE',
+                        help='deriva a senha do serviço SERVICE de um segredo '
+                             'mestre, lido do terminal ou da entrada padrão'
+                       )
+    parser.add_argument('--account', default='',
+                        help='conta no serviço (com --derive)'
+                       )
+    parser.add_argument('--counter', type=int, default=1,
+                        help='versão da senha derivada (padrão: 1)'
+                       )
+    parser.add_argument('--kdf', choices=DERIVE_KDFS, default='scrypt',
+                        help='função de derivação do segredo mestre'
+                       )
+    parser.add_argument('-B', '--blocklist', metavar='FILE',
+                        help='nunca gera senhas da lista de bloqueio FILE'
+                       )
+    parser.add_argument('-m', '--metrics', metavar='FILE',
+                        help='grava métricas no formato Prometheus em FILE'
+                       )
+    options = parser.parse_args(arguments)
+    backend = options.backend
+    if backend == 'seeded':
+        if options.seed is None:
+            parser.error('--backend seeded exige --seed.')
+        print (f'{__title__}: aviso: a fonte seeded é determinística; as '
+               f'senhas geradas não são seguras.', file=sys.stderr
+              )
+        backend = SeededBackend(options.seed)
+    elif options.seed is not None:
+        parser.error('--seed só pode ser usado com --backend seeded.')
+    if options.metrics:
+        EnableMetrics()
+    if options.blocklist:
+        try:
+            SetBlocklist(options.blocklist)
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+
+    if options.derive is not None:
+        import getpass
+
+        if options.count != 1:
+            parser.error('--derive gera uma única senha; use --counter para '
+                         'obter outra.'
+                        )
+
+        if sys.stdin.isatty():
+            master = getpass.getpass('Segredo mestre: ')
+        else:
+            master = sys.stdin.readline().rstrip('\n')
+        try:
+            password, entropy = Derive(master, options.derive,
+                                       options.account, options.counter,
+                                       options.length, options.pattern,
+                                       options.require_all, kdf=options.kdf
+                                      )
+        except (TypeError, ValueError) as error:
+            parser.error(str(error))
+        end = '\0' if options.null else '\n'
+        if options.entropy:
+            end = f'\t{entropy}{end}'
+        sys.stdout.write(password + end)
+        if options.metrics:
+            DisableMetrics().write_prometheus(options.metrics)
+        return 0
+
+    if options.token:
+        if options.require_all:
+            parser.error('--token não pode ser usado com --require-all.')
+        try:
+            entropy = WriteToken(sys.stdout.buffer, options.length,
+                                 options.pattern, backend
+                                )
+        except (TypeError, ValueError) as error:
+            parser.error(str(error))
+        end = b'\0' if options.null else b'\n'
+        if options.entropy:
+            end = b'\t%d%s' % (entropy, end)
+        sys.stdout.buffer.write(end)
+        if options.metrics:
+            DisableMetrics().write_prometheus(options.metrics)
+        return 0
+
+    try:
+        _CheckCount(options.count)
+        if options.template is not None:
+            template = GetTemplate(options.template)
+        elif options.pronounceable:
+            model, extra, entropy = _PreparePronounceable(
+                options.length, options.pattern, options.extra,
+                options.markov
+            )
+        else:
+            alphabet = _GetAlphabet(options.length, options.pattern)
+    except (OSError, TypeError, ValueError) as error:
+        parser.error(str(error))
+    backend = _GetBackend(backend)
+    if options.template is not None:
+        length = template.length
+    else:
+        length = options.length
+
+    end = b'\0' if options.null else b'\n'
+    if options.entropy:
+        if options.template is not None:
+            entropy = template.entropy
+        elif options.pronounceable:
+            entropy = int(entropy)
+        elif options.require_all:
+            entropy = _RequiredEntropy(alphabet, length)
+        else:
+            entropy = alphabet.entropy[length]
+        end = b'\t%d%s' % (entropy, end)
+
+    if options.template is not None:
+        if options.require_all or options.workers is not None:
+            parser.error('--template não pode ser usado com --require-all '
+                         'ou --workers.'
+                        )
+        chunks = _IterTemplateChunks(template, options.count, backend, 'Main')
+    elif options.pronounceable:
+        if options.require_all or options.workers is not None:
+            parser.error('--pronounceable não pode ser usado com '
+                         '--require-all ou --workers.'
+                        )
+        chunks = _IterPronounceableChunks(model, options.count, length,
+                                          options.pattern, extra, backend,
+                                          'Main'
+                                         )
+    elif options.require_all:
+        if options.workers is not None:
+            parser.error('--require-all não pode ser usado com --workers.')
+        chunks = _IterRequiredChunks(alphabet, options.count, length,
+                                     backend, 'Main'
+                                    )
+    elif options.workers is not None:
+        try:
+            chunks = _IterParallelChunks(options.count, length,
+                                         options.pattern, options.workers,
+                                         options.seed, options.seed is not None,
+                                         options.backend
+                                        )
+        except ValueError as error:
+            parser.error(str(error))
+    else:
+        chunks = _IterChunks(alphabet, options.count, length, backend, 'Main')
+
+    output = sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(end.join(chunk[i:i + length]
+                                  for i in range(0, len(chunk), length)
+                                 ))
+            output.write(end)
+        output.flush()
+    except BrokenPipeError:
+        # The reader has gone away (e.g. 'pwgen ... | head').  Avoid a
+        # second error when the interpreter flushes stdout at exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    if options.metrics:
+        DisableMetrics().write_prometheus(options.metrics)
+    return 0
+
+# main ------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(Main())
@@ -0,0 +1,444 @@
+#!/usr/bin/python3
+
+'''
+pwprovision.py
+
+Bulk credential provisioning.
+
+Generates passwords with 'pwgen', hashes them with PBKDF2 or scrypt in
+a pool of processes and writes passwords and hashes as CSV, JSON Lines
+or a compact binary file.  The stages run concurrently, connected by
+bounded queues, so memory use does not depend on the number of
+passwords.
+
+Usage:
+python3 pwprovision.py --count 10000 --output senhas.csv
+python3 pwprovision.py --count 10000 --kdf scrypt --format jsonl -o -
+'''
+
+__title__     = 'pwprovision'
+__author__    = 'Odmar Miranda'
+__version__   = '00.01.00'
+__date__      = '2026-10-17'
+__description__ = 'Geração de senhas e hashes em lote.'
+
+__license__   = 'GNU GPLv3 http://www.gnu.org/licenses'
+__copyright__ = '© 2014, 2026 Odmar Miranda'
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Revisions
+# Version-  ---Date---  --------------------Comments--------------------
+# 0.1.0     2026-10-17  - First version.
+
+# imports ---------------------------------------------------------------------
+import base64
+import concurrent.futures
+import csv
+import hashlib
+import itertools
+import json
+import os
+import queue
+import secrets
+import struct
+import sys
+import threading
+import time
+
+import pwgen
+
+# constants -------------------------------------------------------------------
+# Default KDF parameters.
+PBKDF2_ITERATIONS = 600000
+SCRYPT_N = 2**15
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_SIZE = 16
+KEY_SIZE = 32
+KDFS = ('pbkdf2', 'scrypt')
+
+FORMATS = ('csv', 'jsonl', 'binary')
+# Binary output format (see 'Writer').
+PROVISION_MAGIC = b'PWPV'
+PROVISION_VERSION = 1
+PROVISION_HEADER = struct.Struct('<4sII')
+
+# Passwords hashed by each task of the process pool.
+HASH_BATCH = 64
+# Hashing tasks queued for the writer, per worker process.
+QUEUE_DEPTH = 2
+
+# classes ---------------------------------------------------------------------
+class Kdf():
+    '''Password hashing function and its parameters.
+
+'name' is 'pbkdf2' (PBKDF2-HMAC with 'hash_name' and 'iterations') or
+'scrypt' (with cost 'n', block size 'r' and parallelism 'p').  Each
+password gets a random salt of 'salt_size' bytes and a key of 'dklen'
+bytes.
+'''
+
+    def __init__(self, name='pbkdf2', iterations=PBKDF2_ITERATIONS,
+                 hash_name='sha256', n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                 salt_size=SALT_SIZE, dklen=KEY_SIZE):
+        '''Validate and keep the parameters.'''
+
+        if name not in KDFS:
+            raise ValueError(f'Função de hash desconhecida: {name!r}.')
+        elif name == 'pbkdf2' and iterations < 1:
+            raise ValueError('O número de iterações deve ser maior ou '
+                             'igual a 1.'
+                            )
+        elif name == 'scrypt' and (n < 2 or n & (n - 1)):
+            raise ValueError('O custo do scrypt deve ser uma potência de 2.')
+        elif name == 'scrypt' and r < 1:
+            raise ValueError('O tamanho de bloco do scrypt deve ser maior '
+                             'ou igual a 1.'
+                            )
+        elif name == 'scrypt' and p < 1:
+            raise ValueError('O paralelismo do scrypt deve ser maior ou '
+                             'igual a 1.'
+                            )
+        self.name = name
+        self.iterations = iterations
+        self.hash_name = hash_name
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.dklen = dklen
+        # Raises ValueError for unknown hash names.
+        hashlib.new(hash_name)
+
+    def __repr__(self):
+        return f'Kdf({self.parameters()!r})'
+
+    def parameters(self):
+        '''Returns the parameters as a dictionary.'''
+
+        parameters = {'name': self.name, 'salt_size': self.salt_size,
+                      'dklen': self.dklen
+                     }
+        if self.name == 'pbkdf2':
+            parameters.update(hash_name=self.hash_name,
+                              iterations=self.iterations
+                             )
+        else:
+            parameters.update(n=self.n, r=self.r, p=self.p)
+        return parameters
+
+    def hash(self, password, salt):
+        '''Returns the key derived from 'password' (bytes) and 'salt'.'''
+
+        if self.name == 'pbkdf2':
+            return hashlib.pbkdf2_hmac(self.hash_name, password, salt,
+                                       self.iterations, self.dklen
+                                      )
+        return hashlib.scrypt(password, salt=salt, n=self.n, r=self.r,
+                              p=self.p, maxmem=256 * self.n * self.r * self.p
+                                               + 2**20,
+                              dklen=self.dklen
+                             )
+
+    def encode(self, salt, key):
+        '''Returns salt and key in the PHC string format.'''
+
+        if self.name == 'pbkdf2':
+            prefix = f'$pbkdf2-{self.hash_name}$i={self.iterations}'
+        else:
+            prefix = (f'$scrypt$ln={self.n.bit_length() - 1},'
+                      f'r={self.r},p={self.p}'
+                     )
+        return f'{prefix}${_Base64(salt)}${_Base64(key)}'
+
+class Writer():
+    '''Writes provisioned credentials to a file in one of 'FORMATS'.
+
+CSV and JSON Lines records hold the index, the password and the hash in
+PHC string format.  The binary format holds a header with the KDF
+parameters, followed by one record per password:
+
+    magic (4 bytes) | version (uint32) | size (uint32) | parameters
+    records: length (uint8) | password | salt | key
+
+where 'parameters' is the JSON text of 'Kdf.parameters' and 'size' its
+length in bytes.
+'''
+
+    def __init__(self, output, format, kdf):
+        '''Open 'output' (a path, '-' for the standard output or a file
+object) and write the header of 'format'.
+'''
+        if format not in FORMATS:
+            raise ValueError(f'Formato desconhecido: {format!r}.')
+        self.format = format
+        self.kdf = kdf
+        self._close = isinstance(output, (str, os.PathLike)) and \
+                      output != '-'
+        if output == '-':
+            output = sys.stdout.buffer
+        elif self._close:
+            output = open(output, 'wb')
+        self._binary = output
+        self._file = output
+        if format == 'binary':
+            parameters = json.dumps(kdf.parameters()).encode()
+            output.write(PROVISION_HEADER.pack(PROVISION_MAGIC,
+                                               PROVISION_VERSION,
+                                               len(parameters)
+                                              ) + parameters)
+        else:
+            self._file = _TextOutput(output)
+            if format == 'csv':
+                self._csv = csv.writer(self._file, lineterminator='\n')
+                self._csv.writerow(('id', 'password', 'hash'))
+
+    def write(self, start, passwords, hashes):
+        '''Writes the records of 'passwords', numbered from 'start'.'''
+
+        if self.format == 'binary':
+            self._file.write(b''.join(
+                bytes((len(password),)) + password.encode('ascii')
+                + salt + key
+                for password, (salt, key) in zip(passwords, hashes)
+            ))
+            return
+        encode = self.kdf.encode
+        if self.format == 'csv':
+            self._csv.writerows(
+                (start + i, password, encode(salt, key))
+                for i, (password, (salt, key)) in enumerate(zip(passwords,
+                                                                hashes
+                                                               ))
+            )
+        else:
+            self._file.write(''.join(
+                json.dumps({'id': start + i, 'password': password,
+                            'hash': encode(salt, key)
+                           }) + '\n'
+                for i, (password, (salt, key)) in enumerate(zip(passwords,
+                                                                hashes
+                                                               ))
+            ))
+
+    def close(self):
+        '''Flushes the output and closes it if it was opened here.'''
+
+        self._file.flush()
+        if self._file is not self._binary:
+            self._file.detach()
+        if self._close:
+            self._binary.close()
+
+# functions -------------------------------------------------------------------
+def Provision(count, output, length=8, pattern=15, kdf=None, format='csv',
+              workers=None, backend=None, require_all=False):
+    '''Generates 'count' passwords, hashes them and writes both.
+
+'length', 'pattern', 'backend' and 'require_all' are those of
+'pwgen.IterGenerate'; 'kdf' is a 'Kdf' (by default, PBKDF2-SHA256);
+'output' and 'format' are those of 'Writer'.  Three stages run at the
+same time: generation, hashing in 'workers' processes (by default, one
+per CPU) and writing, in a thread.  At most QUEUE_DEPTH * workers
+batches of HASH_BATCH passwords are in flight, so memory use is
+constant.
+
+Return:
+stages (dict) - {stage: {'items', 'seconds', 'rate'}} for the stages
+                'generate', 'hash' and 'write', and 'total' for the
+                whole pipeline.  The seconds of a stage are those spent
+                working; hashing seconds are summed over the workers.
+'''
+    kdf = kdf or Kdf()
+    passwords = pwgen.IterGenerate(count, length, pattern, backend,
+                                   require_all
+                                  )
+    workers = workers or os.cpu_count() or 1
+    writer = Writer(output, format, kdf)
+    seconds = {'generate': 0.0, 'hash': 0.0, 'write': 0.0}
+    batches = queue.Queue(QUEUE_DEPTH * workers)
+    errors = []
+
+    def write():
+        # Writes the batches in order; after an error, keeps draining
+        # the queue so that the producer never blocks.
+        while (item := batches.get()) is not None:
+            if errors:
+                continue
+            start, batch, task = item
+            try:
+                hashes, elapsed = task.result()
+                seconds['hash'] += elapsed
+                begin = time.perf_counter()
+                writer.write(start, batch, hashes)
+                seconds['write'] += time.perf_counter() - begin
+            except Exception as error:
+                errors.append(error)
+                task.cancel()
+
+    started = time.perf_counter()
+    thread = threading.Thread(target=write, name='pwprovision-writer')
+    thread.start()
+    try:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            start = 0
+            while not errors:
+                begin = time.perf_counter()
+                batch = list(itertools.islice(passwords, HASH_BATCH))
+                seconds['generate'] += time.perf_counter() - begin
+                if not batch:
+                    break
+                batches.put((start, batch,
+                             executor.submit(_HashTask, kdf, batch)
+                            ))
+                start += len(batch)
+            batches.put(None)
+            thread.join()
+    finally:
+        if thread.is_alive():
+            batches.put(None)
+            thread.join()
+        writer.close()
+    if errors:
+        raise errors[0]
+
+    seconds['total'] = time.perf_counter() - started
+    return {stage: {'items': count, 'seconds': elapsed,
+                    'rate': count / elapsed if elapsed else 0.0
+                   }
+            for stage, elapsed in seconds.items()
+           }
+
+def _HashTask(kdf, passwords):
+    '''Hashes a batch of passwords in a worker process.
+
+Return:
+hashes  (list)  - (salt, key) of each password.
+seconds (float) - time spent hashing.
+'''
+    start = time.perf_counter()
+    hashes = []
+    for password in passwords:
+        salt = secrets.token_bytes(kdf.salt_size)
+        hashes.append((salt, kdf.hash(password.encode('ascii'), salt)))
+    return (hashes, time.perf_counter() - start)
+
+def _Base64(data):
+    '''Base64 without padding, as used in PHC strings.'''
+
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+def _TextOutput(output):
+    '''Returns a text wrapper of the binary file 'output'.'''
+
+    import io
+
+    return io.TextIOWrapper(output, encoding='ascii', newline='',
+                            write_through=False
+                           )
+
+def Main(arguments=None):
+    '''Command line interface.'''
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=__title__,
+                                     description=__description__
+                                    )
+    parser.add_argument('-c', '--count', type=int, default=1,
+                        help='quantidade de senhas (padrão: 1)'
+                       )
+    parser.add_argument('-l', '--length', type=int, default=8,
+                        help='comprimento das senhas, de 4 a 64 (padrão: 8)'
+                       )
+    parser.add_argument('-p', '--pattern', type=int, default=15,
+                        help='padrão de caracteres, de 1 a 15 (padrão: 15)'
+                       )
+    parser.add_argument('-r', '--require-all', action='store_true',
+                        help='exige ao menos um caractere de cada tipo'
+                       )
+    parser.add_argument('-o', '--output', default='-',
+                        help='arquivo de saída (padrão: saída padrão)'
+                       )
+    parser.add_argument('-f', '--format', choices=FORMATS, default='csv',
+                        help='formato de saída (padrão: csv)'
+                       )
+    parser.add_argument('-k', '--kdf', choices=KDFS, default='pbkdf2',
+                        help='função de hash (padrão: pbkdf2)'
+                       )
+    parser.add_argument('-i', '--iterations', type=int,
+                        default=PBKDF2_ITERATIONS,
+                        help='iterações do PBKDF2 (padrão: '
+                             f'{PBKDF2_ITERATIONS})'
+                       )
+    parser.add_argument('--hash-name', default='sha256',
+                        help='hash do PBKDF2 (padrão: sha256)'
+                       )
+    parser.add_argument('-n', '--scrypt-n', type=int, default=SCRYPT_N,
+                        help=f'custo do scrypt (padrão: {SCRYPT_N})'
+                       )
+    parser.add_argument('--scrypt-r', type=int, default=SCRYPT_R,
+                        help=f'tamanho de bloco do scrypt (padrão: {SCRYPT_R})'
+                       )
+    parser.add_argument('--scrypt-p', type=int, default=SCRYPT_P,
+                        help=f'paralelismo do scrypt (padrão: {SCRYPT_P})'
+                       )
+    parser.add_argument('-w', '--workers', type=int,
+                        help='processos de hash (padrão: um por CPU)'
+                       )
+    options = parser.parse_args(arguments)
+    try:
+        kdf = Kdf(options.kdf, options.iterations, options.hash_name,
+                  options.scrypt_n, options.scrypt_r, options.scrypt_p
+                 )
+        pwgen.CheckParameters(options.count, options.length,
+                              options.pattern
+                             )
+        if options.workers is not None and options.workers < 1:
+            raise ValueError('O número de processos deve ser maior ou '
+                             'igual a 1.'
+                            )
+    except (TypeError, ValueError) as error:
+        parser.error(str(error))
+
+    try:
+        stages = Provision(options.count, options.output, options.length,
+                           options.pattern, kdf, options.format,
+                           options.workers, require_all=options.require_all
+                          )
+    except BrokenPipeError:
+        # The reader has gone away (e.g. 'pwprovision ... | head').
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (MemoryError, OSError, ValueError) as error:
+        # E.g. an output that cannot be opened, or scrypt parameters that
+        # need more memory than the system gives.
+        print (f'{__title__}: erro: {error}', file=sys.stderr)
+        return 1
+    names = {'generate': 'geração', 'hash': 'hash', 'write': 'gravação',
+             'total': 'total'
+            }
+    for stage, result in stages.items():
+        print (f'{names[stage]:<10}{result["seconds"]:>10.3f} s'
+               f'{result["rate"]:>16,.1f} senhas/s',
+               file=sys.stderr
+              )
+    return 0
+
+# main ------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(Main())
@@ -0,0 +1,452 @@
+#!/usr/bin/python3
+
+'''
+pwservice.py
+
+Local password generation service.
+
+Serves 'pwgen' passwords to many concurrent clients over a Unix domain
+socket and over HTTP on the loopback interface.
+
+Usage:
+python3 pwservice.py serve --socket /tmp/pwgen.sock --port 8787
+python3 pwservice.py loadtest --socket /tmp/pwgen.sock
+'''
+
+__title__     = 'pwservice'
+__author__    = 'Odmar Miranda'
+__version__   = '00.01.00'
+__date__      = '2026-10-17'
+__description__ = 'Serviço local de geração de senhas.'
+
+__license__   = 'GNU GPLv3 http://www.gnu.org/licenses'
+__copyright__ = '© 2014, 2026 Odmar Miranda'
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Revisions
+# Version-  ---Date---  --------------------Comments--------------------
+# 0.1.0     2026-10-17  - First version.
+
+# imports ---------------------------------------------------------------------
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import stat
+import sys
+import time
+import urllib.parse
+
+import pwgen
+
+# constants -------------------------------------------------------------------
+# Largest number of passwords of a single request.
+MAX_COUNT = 100000
+# Requests for more passwords than this are generated outside the event
+# loop, so that other clients are not delayed.
+INLINE_COUNT = 256
+# Responses of a connection waiting to be written, in request order.
+PIPELINE_DEPTH = 64
+
+HTTP_HOST = '127.0.0.1'
+HTTP_PORT = 8787
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+                405: 'Method Not Allowed'
+               }
+
+# classes ---------------------------------------------------------------------
+class RequestError(ValueError):
+    '''Invalid request.'''
+
+class Service():
+    '''Generates passwords for the requests of all connections.
+
+Single passwords are taken from a 'pwgen.PasswordPool' without waiting
+for its refills, which run in the pool's background thread.  Large
+batches are generated by a thread pool, so the event loop never waits
+for them.
+'''
+
+    def __init__(self, workers=None):
+        '''Initialize the password pool and the executor.'''
+
+        self.pool = pwgen.PasswordPool()
+        self.executor = concurrent.futures.ThreadPoolExecutor(workers)
+        self.requests = 0
+
+    async def generate(self, request):
+        '''Returns the response (dict) to a request (dict).
+
+The request keys 'length', 'pattern' and 'count' have the same meaning
+and defaults as in 'pwgen.GenerateBatch'; 'require_all' is optional.
+'''
+        self.requests += 1
+        try:
+            length, pattern, count, require_all = _ParseRequest(request)
+            if count == 1 and not require_all:
+                taken = self.pool.take(length, pattern, block=False)
+                if taken is None:
+                    # Reservoir empty: a single password is cheap, the
+                    # refill is left to the pool's thread.
+                    taken = pwgen.Generate(length, pattern)
+                password, entropy = taken
+                passwords = [password]
+            elif count <= INLINE_COUNT:
+                passwords, entropy = pwgen.GenerateBatch(
+                    count, length, pattern, require_all=require_all
+                )
+            else:
+                loop = asyncio.get_running_loop()
+                passwords, entropy = await loop.run_in_executor(
+                    self.executor,
+                    lambda: pwgen.GenerateBatch(count, length, pattern,
+                                                require_all=require_all
+                                               )
+                )
+        except (TypeError, ValueError) as error:
+            return {'error': str(error)}
+        return {'passwords': passwords, 'entropy': entropy}
+
+    async def handle_unix(self, reader, writer):
+        '''Serves a Unix socket connection.
+
+Each request is a JSON object on a line and each response is a JSON
+object on a line.  Requests may be pipelined: responses are written in
+request order.
+'''
+        async def requests():
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line longer than the stream limit: the rest of the
+                    # stream cannot be split into requests.
+                    yield None
+                    return
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                yield request
+
+        def encode(response):
+            return json.dumps(response).encode() + b'\n'
+
+        await self._pipeline(requests(), encode, writer)
+
+    async def handle_http(self, reader, writer):
+        '''Serves an HTTP/1.1 connection.
+
+Only 'GET /generate?length=..&pattern=..&count=..' is answered.  The
+connection is kept alive and pipelined requests are answered in order.
+'''
+        async def requests():
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    return
+                except asyncio.LimitOverrunError:
+                    yield (400, None)
+                    return
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ')
+                except ValueError:
+                    yield (400, None)
+                    return
+                headers = dict(line.split(':', 1) for line in lines[1:]
+                               if ':' in line
+                              )
+                headers = {name.strip().lower(): value.strip()
+                           for name, value in headers.items()
+                          }
+                try:
+                    size = int(headers.get('content-length', 0))
+                    if size < 0:
+                        raise ValueError(size)
+                except ValueError:
+                    yield (400, None)
+                    return
+                if size:
+                    try:
+                        await reader.readexactly(size)
+                    except asyncio.IncompleteReadError:
+                        return
+                url = urllib.parse.urlsplit(target)
+                if method != 'GET':
+                    yield (405, None)
+                elif url.path != '/generate':
+                    yield (404, None)
+                else:
+                    query = dict(urllib.parse.parse_qsl(url.query))
+                    yield (200, query)
+                if headers.get('connection', '').lower() == 'close':
+                    return
+
+        def encode(response):
+            status = 400 if 'error' in response else 200
+            status = response.pop('status', status)
+            body = json.dumps(response).encode()
+            return (f'HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n'
+                    f'Content-Type: application/json\r\n'
+                    f'Content-Length: {len(body)}\r\n'
+                    f'\r\n'
+                   ).encode('ascii') + body
+
+        async def parsed():
+            async for status, query in requests():
+                if status == 200:
+                    yield query
+                else:
+                    yield {'status': status}
+
+        await self._pipeline(parsed(), encode, writer)
+
+    async def _pipeline(self, requests, encode, writer):
+        '''Answers 'requests' concurrently, writing responses in order.'''
+
+        responses = asyncio.Queue(PIPELINE_DEPTH)
+
+        async def write():
+            while (response := await responses.get()) is not None:
+                writer.write(encode(await response))
+                await writer.drain()
+
+        writing = asyncio.create_task(write())
+
+        async def queue(item):
+            # A full queue waits for the writer, unless it stops first.
+            if writing.done():
+                return False
+            queued = asyncio.create_task(responses.put(item))
+            await asyncio.wait((queued, writing),
+                               return_when=asyncio.FIRST_COMPLETED
+                              )
+            if not queued.done():
+                queued.cancel()
+            return not queued.cancelled()
+
+        try:
+            async for request in requests:
+                if isinstance(request, dict) and 'status' in request:
+                    response = asyncio.get_running_loop().create_future()
+                    response.set_result({'status': request['status'],
+                                         'error': HTTP_REASONS[
+                                             request['status']]
+                                        })
+                else:
+                    response = asyncio.create_task(self.generate(request))
+                if not await queue(response):
+                    response.cancel()
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            await queue(None)
+            try:
+                # Errors of the writer other than a lost client propagate.
+                await writing
+            except ConnectionError:
+                pass
+            finally:
+                # Responses left when the writer stopped are dropped.
+                while not responses.empty():
+                    response = responses.get_nowait()
+                    if response is not None:
+                        response.cancel()
+                writer.close()
+
+    def close(self):
+        '''Releases the pool and the executor.'''
+
+        self.pool.close()
+        self.executor.shutdown()
+
+# functions -------------------------------------------------------------------
+async def Serve(socket_path=None, port=None, host=HTTP_HOST):
+    '''Runs the service until cancelled.
+
+Listens on the Unix socket 'socket_path' and/or on HTTP at 'host':'port'.
+'''
+    service = Service()
+    servers = []
+    try:
+        if socket_path:
+            try:
+                mode = os.lstat(socket_path).st_mode
+            except FileNotFoundError:
+                pass
+            else:
+                # Only a stale socket is removed, never another file.
+                if not stat.S_ISSOCK(mode):
+                    raise ValueError(f'{socket_path} existe e não é um '
+                                     f'soquete.'
+                                    )
+                os.unlink(socket_path)
+            servers.append(await asyncio.start_unix_server(
+                service.handle_unix, socket_path
+            ))
+        if port:
+            servers.append(await asyncio.start_server(service.handle_http,
+                                                      host, port
+                                                     ))
+        if not servers:
+            raise ValueError('Informe o soquete ou a porta do serviço.')
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+    finally:
+        for server in servers:
+            server.close()
+        service.close()
+
+async def LoadTest(socket_path=None, port=None, host=HTTP_HOST,
+                   requests=10000, connections=16, pipeline=8, length=8,
+                   pattern=15, count=1):
+    '''Measures the service from 'connections' concurrent clients.
+
+Each client keeps up to 'pipeline' requests in flight.  Returns a
+dictionary with requests per second and p50/p99 latency (seconds).
+'''
+    latencies = []
+    query = {'length': length, 'pattern': pattern, 'count': count}
+    if socket_path:
+        message = json.dumps(query).encode() + b'\n'
+    else:
+        message = (f'GET /generate?{urllib.parse.urlencode(query)} '
+                   f'HTTP/1.1\r\nHost: {host}\r\n\r\n'
+                  ).encode('ascii')
+
+    async def read_response(reader):
+        if socket_path:
+            response = await reader.readline()
+        else:
+            head = await reader.readuntil(b'\r\n\r\n')
+            size = int(head.lower().split(b'content-length:')[1]
+                       .split(b'\r\n')[0]
+                      )
+            response = await reader.readexactly(size)
+        if b'error' in response:
+            raise RequestError(response.decode())
+
+    async def client(share):
+        if socket_path:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        sent = []
+        window = asyncio.Semaphore(pipeline)
+
+        async def send():
+            for i in range(share):
+                await window.acquire()
+                sent.append(time.perf_counter())
+                writer.write(message)
+                await writer.drain()
+
+        sending = asyncio.create_task(send())
+        for i in range(share):
+            await read_response(reader)
+            latencies.append(time.perf_counter() - sent[i])
+            window.release()
+        await sending
+        writer.close()
+
+    shares = [requests // connections + (i < requests % connections)
+              for i in range(connections)
+             ]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(share) for share in shares if share))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {'requests': requests,
+            'requests_per_second': requests / elapsed,
+            'p50': latencies[len(latencies) // 2],
+            'p99': latencies[min(len(latencies) - 1,
+                                 int(len(latencies) * 0.99)
+                                )],
+           }
+
+def _ParseRequest(request):
+    '''Returns (length, pattern, count, require_all) of a request.'''
+
+    if not isinstance(request, dict):
+        raise RequestError('Requisição inválida.')
+    try:
+        length = int(request.get('length', 8))
+        pattern = int(request.get('pattern', 15))
+        count = int(request.get('count', 1))
+    except (TypeError, ValueError):
+        raise RequestError('Parâmetros devem ser números inteiros.')
+    require_all = str(request.get('require_all', '')).lower() in ('1', 'true')
+    if not 1 <= count <= MAX_COUNT:
+        raise RequestError(f'A quantidade deve estar entre 1 e {MAX_COUNT}.')
+    return (length, pattern, count, require_all)
+
+def Main(arguments=None):
+    '''Command line interface.'''
+
+    parser = argparse.ArgumentParser(prog=__title__,
+                                     description=__description__
+                                    )
+    parser.add_argument('command', choices=('serve', 'loadtest'))
+    parser.add_argument('-s', '--socket', help='soquete Unix do serviço')
+    parser.add_argument('-p', '--port', type=int,
+                        help=f'porta HTTP em {HTTP_HOST}'
+                       )
+    parser.add_argument('-n', '--requests', type=int, default=10000,
+                        help='requisições do teste de carga'
+                       )
+    parser.add_argument('-c', '--connections', type=int, default=16,
+                        help='conexões simultâneas do teste de carga'
+                       )
+    parser.add_argument('-d', '--pipeline', type=int, default=8,
+                        help='requisições pendentes por conexão'
+                       )
+    parser.add_argument('--count', type=int, default=1,
+                        help='senhas por requisição do teste de carga'
+                       )
+    options = parser.parse_args(arguments)
+    if not options.socket and not options.port:
+        parser.error('informe --socket e/ou --port.')
+
+    if options.command == 'serve':
+        try:
+            asyncio.run(Serve(options.socket, options.port))
+        except KeyboardInterrupt:
+            pass
+        except (OSError, ValueError) as error:
+            parser.error(str(error))
+        return 0
+
+    result = asyncio.run(LoadTest(options.socket, options.port,
+                                  requests=options.requests,
+                                  connections=options.connections,
+                                  pipeline=options.pipeline,
+                                  count=options.count
+                                 ))
+    print (f'{result["requests"]} requisições, '
+           f'{result["requests_per_second"]:,.0f} requisições/s, '
+           f'p50 {result["p50"] * 1000:.2f} ms, '
+           f'p99 {result["p99"] * 1000:.2f} ms'
+          )
+    return 0
+
+# main ------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(Main())
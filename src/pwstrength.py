@@ -0,0 +1,794 @@
+#!/usr/bin/python3
+
+'''
+pwstrength.py
+
+Password strength estimator.
+
+Estimates how many guesses an attacker needs to find a password, in the
+spirit of zxcvbn: the password is split into dictionary words, keyboard
+walks, repeats, sequences and dates, and the cheapest combination of
+these and brute force gives the strength, in bits.
+
+Usage:
+python3 pwstrength.py < passwords.txt
+python3 pwstrength.py --workers 4 passwords.txt
+'''
+
+__title__     = 'pwstrength'
+__author__    = 'Odmar Miranda'
+__version__   = '00.01.00'
+__date__      = '2026-10-17'
+__description__ = 'Estimativa da robustez de senhas.'
+
+__license__   = 'GNU GPLv3 http://www.gnu.org/licenses'
+__copyright__ = '© 2014, 2026 Odmar Miranda'
+
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Revisions
+# Version-  ---Date---  --------------------Comments--------------------
+# 0.1.0     2026-10-17  - First version.
+
+# imports ---------------------------------------------------------------------
+import array
+import collections
+import concurrent.futures
+import functools
+import glob
+import itertools
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+
+import pwgen
+
+# classes ---------------------------------------------------------------------
+class Dictionary():
+    '''Ranked dictionary, read through a memory map.
+
+The file, written by 'CompileDictionary', holds a header, an array of
+offsets, the rank of each word (1 for the most common) and the words
+(UTF-8, lowercase), sorted and without repetitions:
+
+    magic (4 bytes) | version (uint32) | count (uint32)
+    offsets (count + 1 uint32, little endian)
+    ranks (count uint32, little endian)
+    words
+
+'rank' looks a word up by binary search, without loading the file.
+'matches' finds the words at a position of a password by narrowing the
+range of words that share a growing prefix, so the search stops as
+soon as no word can match.  Words are compared as UTF-8 bytes, whose
+order is the order of the sorted words.
+'''
+
+    def __init__(self, path):
+        '''Open the compiled dictionary 'path'.'''
+
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.count = DICTIONARY_HEADER.unpack_from(
+                self._map
+            )
+        except struct.error:
+            magic = None
+        if magic != DICTIONARY_MAGIC or version != DICTIONARY_VERSION:
+            self._map.close()
+            raise ValueError(f'Dicionário inválido: {path}.')
+        self._words = DICTIONARY_HEADER.size + 4 * (2 * self.count + 1)
+        # Offsets (count + 1) followed by the ranks (count), read in place
+        # as native integers where they are little endian.
+        index = memoryview(self._map)[DICTIONARY_HEADER.size:self._words]
+        if sys.byteorder == 'little':
+            self._index = index.cast('I')
+        else:
+            self._index = array.array('I', index)
+            self._index.byteswap()
+            index.release()
+        # Range of the words of each first byte: 257 integers, whatever
+        # the size of the dictionary, that save the first probes of each
+        # search.
+        self._first = array.array('I', (self._bisect(bytes([byte]), 0,
+                                                     self.count
+                                                    )
+                                        for byte in range(256)
+                                       ))
+        self._first.append(self.count)
+        self._heads = None
+        self._found = functools.lru_cache(maxsize=MATCH_CACHE_SIZE)(
+            self._find
+        )
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        '''Returns the word at 'index' (in sorted order).'''
+
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('Índice fora do dicionário.')
+        return self._word(index).decode()
+
+    def rank(self, word):
+        '''Returns the rank of 'word', or None if it is not listed.'''
+
+        key = word.encode()
+        index = self._bisect(key, 0, self.count)
+        if index < self.count and self._word(index) == key:
+            return self._index[self.count + 1 + index]
+        return None
+
+    def matches(self, text, start=0):
+        '''Yields (end, rank) for each word equal to text[start:end].
+
+Only words of 'MIN_WORD' characters or more are found.  A position
+whose first characters begin no word (see 'heads') is rejected at
+once.  Otherwise the words that begin text[start:] are searched, and
+the result is kept for the next text that has the same tail (see
+'MATCH_CACHE_SIZE'), as batches of common passwords repeat them.
+'''
+        if text[start:start + MIN_WORD] not in self.heads():
+            return
+        for size, rank in self._found(text[start:]):
+            yield (start + size, rank)
+
+    def heads(self):
+        '''Returns the set of the first 'MIN_WORD' characters of the words.
+
+It is built on the first call with one binary search per head, and
+holds at most one string per word, usually far fewer.  Most positions of a
+random password begin no word and are rejected by a set lookup.
+'''
+        if self._heads is None:
+            heads = set()
+            index = 0
+            while index < self.count:
+                # MIN_WORD characters take at most 4 * MIN_WORD bytes; a
+                # character cut at the end is dropped.
+                head = self._word(index)[:4 * MIN_WORD]
+                head = head.decode(errors='ignore')[:MIN_WORD]
+                if len(head) < MIN_WORD:
+                    index += 1
+                    continue
+                heads.add(head)
+                # The words of a head are contiguous: skip to the next
+                # head (no UTF-8 byte is 0xff).
+                index = self._bisect(head.encode() + b'\xff', index,
+                                     self.count
+                                    )
+            self._heads = heads
+        return self._heads
+
+    def close(self):
+        '''Closes the memory map.'''
+
+        if isinstance(self._index, memoryview):
+            self._index.release()
+        self._map.close()
+
+    def _word(self, index):
+        '''Returns the word at 'index', encoded.'''
+
+        offsets = self._index
+        return self._map[self._words + offsets[index]:
+                         self._words + offsets[index + 1]]
+
+    def _find(self, tail):
+        '''Returns a tuple of (size, rank) for each word equal to
+tail[:size].
+
+Each longer prefix is searched from where the previous one was found,
+and the search stops at the first prefix that begins no word.
+'''
+        found = []
+        count = self.count
+        first = tail[0].encode()[0]
+        low, high = self._first[first], self._first[first + 1]
+        for size in range(MIN_WORD, len(tail) + 1):
+            prefix = tail[:size].encode()
+            low = self._bisect(prefix, low, high)
+            if low == high:
+                break
+            word = self._word(low)
+            if word == prefix:
+                found.append((size, self._index[count + 1 + low]))
+            elif not word.startswith(prefix):
+                break
+        return tuple(found)
+
+    def _bisect(self, key, low, high):
+        '''Returns the first index in [low, high) whose word is not
+less than 'key' (or 'high').'''
+
+        words, offsets, base = self._map, self._index, self._words
+        while low < high:
+            middle = (low + high) // 2
+            if words[base + offsets[middle]:
+                     base + offsets[middle + 1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+# constants -------------------------------------------------------------------
+# Compiled dictionary format (see 'Dictionary').
+DICTIONARY_MAGIC = b'PWDC'
+DICTIONARY_VERSION = 1
+DICTIONARY_HEADER = struct.Struct('<4sII')
+# Dictionaries used by default: the compiled ('.pwd') and text ('.txt')
+# lists of this directory.  Text lists are compiled on first use.
+DICTIONARIES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'assets', 'dictionaries'
+                           )
+
+# Password tails whose dictionary words are kept by each 'Dictionary'.
+MATCH_CACHE_SIZE = 4096
+
+# Shortest dictionary word, keyboard walk and sequence matched.
+MIN_WORD = 3
+MIN_WALK = 3
+MIN_SEQUENCE = 3
+# Largest step between the characters of a sequence (e.g. 'aceg').
+MAX_SEQUENCE_STEP = 5
+
+# Characters commonly substituted for letters.
+L33T = str.maketrans('4@83(1!|05$7+2', 'aabeciiiossttz')
+
+# Keyboard layout: unshifted and shifted rows.  Each row is shifted half
+# a key to the right of the row above.
+KEYBOARD = (('`1234567890-=', '~!@#$%^&*()_+'),
+            ('qwertyuiop[]\\', 'QWERTYUIOP{}|'),
+            ("asdfghjkl;'", 'ASDFGHJKL:"'),
+            ('zxcvbnm,./', 'ZXCVBNM<>?'),
+           )
+
+# Dates: years far from the reference year are as likely as this range.
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = time.localtime().tm_year
+DATE_SEPARATED = re.compile(r'(\d{1,4})([\s/\\._-])(\d{1,2})\2(\d{1,4})')
+YEAR = re.compile(r'19\d\d|20\d\d')
+
+# Bits added for each pattern found, as the attacker does not know how
+# many there are.
+MATCH_BITS = 1.0
+# Smallest number of guesses of a pattern that is part of a password.
+MIN_GUESSES = 50
+
+# Size of the character classes, for the brute force estimate.
+CLASSES = ((str.islower, len(pwgen.LOWER_LETTERS)),
+           (str.isupper, len(pwgen.UPPER_LETTERS)),
+           (str.isdigit, len(pwgen.DIGITS)),
+          )
+# Printable ASCII punctuation and space.
+SYMBOLS = 33
+# Any other character.
+OTHERS = 100
+
+# Passwords sent to a worker process at a time by 'IterEstimate'.
+ESTIMATE_BATCH = 4096
+
+# Repeated blocks, longest and shortest.
+_REPEAT_GREEDY = re.compile(r'(.+)\1+')
+_REPEAT_LAZY = re.compile(r'(.+?)\1+')
+# Runs of digits that may hold a date without separators.
+_DIGITS = re.compile(r'\d{4,}')
+
+# functions -------------------------------------------------------------------
+def Estimate(password, dictionaries=None):
+    '''Estimates the strength of 'password'.
+
+'dictionaries' is a sequence of 'Dictionary' instances or paths; by
+default, those of 'DICTIONARIES', loaded on first use.
+
+Return:
+bits    (int)  - log2 of the number of guesses needed to find the
+                 password.
+matches (list) - patterns found, as tuples (start, end, kind, token),
+                 where kind is 'dictionary', 'spatial', 'repeat',
+                 'sequence', 'date' or 'year'.  The remaining
+                 characters are counted as brute force.
+'''
+    bits, matches = _Estimate(password, _GetDictionaries(dictionaries))
+    return (int(bits), matches)
+
+def EstimateBatch(passwords, dictionaries=None, workers=None):
+    '''Returns a list with the strength, in bits, of each password.
+
+See 'IterEstimate'.
+'''
+    return list(IterEstimate(passwords, dictionaries, workers))
+
+def IterEstimate(passwords, dictionaries=None, workers=None):
+    '''Yields the strength, in bits, of each of 'passwords'.
+
+'passwords' may be any iterable (e.g. the lines of a large file), read
+'ESTIMATE_BATCH' at a time.  With 'workers', the batches are estimated
+by that many processes, each loading the dictionaries once; the results
+are still yielded in order.
+'''
+    if not workers:
+        dictionaries = _GetDictionaries(dictionaries)
+        for password in passwords:
+            yield int(_Estimate(password, dictionaries)[0])
+        return
+
+    if dictionaries is not None:
+        dictionaries = tuple(getattr(dictionary, 'path', dictionary)
+                             for dictionary in dictionaries
+                            )
+    passwords = iter(passwords)
+    batches = iter(lambda: list(itertools.islice(passwords, ESTIMATE_BATCH)),
+                   []
+                  )
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(executor.submit(_EstimateTask, batch,
+                                           dictionaries
+                                          ))
+            # Bounded read-ahead keeps memory constant.
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def CompileDictionary(source, target):
+    '''Compiles a text list into the binary format of 'Dictionary'.
+
+'source' has one word per line, from the most to the least common; in
+lines with several fields (e.g. "word 1234"), the first field is the
+word.  Words are lowercased and only the first occurrence is kept.
+
+Return:
+count (int) - number of words in the compiled dictionary.
+'''
+    ranks = {}
+    with open(source, encoding='UTF-8') as f:
+        for line in f:
+            fields = line.split()
+            if fields:
+                ranks.setdefault(fields[0].lower(), len(ranks) + 1)
+    words = sorted(ranks)
+    encoded = [word.encode() for word in words]
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    with open(target, 'wb') as f:
+        f.write(DICTIONARY_HEADER.pack(DICTIONARY_MAGIC, DICTIONARY_VERSION,
+                                       len(words)
+                                      ))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(struct.pack(f'<{len(words)}I',
+                            *(ranks[word] for word in words)
+                           ))
+        for word in encoded:
+            f.write(word)
+    _OpenDictionary.cache_clear()
+    return len(words)
+
+def _Estimate(password, dictionaries):
+    '''Returns (bits, matches) of 'password'; see 'Estimate'.
+
+The cheapest split of the password is found by dynamic programming:
+each position is reached either by one more brute force character or
+by a pattern that ends there.
+'''
+    length = len(password)
+    if not length:
+        return (0.0, [])
+    cardinality = _Cardinality(password)
+    brute = math.log2(cardinality)
+    ends = collections.defaultdict(list)
+    for match in _Matches(password, dictionaries):
+        start, end, kind, token, guesses = match
+        if end - start < length:
+            guesses = max(guesses, MIN_GUESSES)
+        ends[end].append((start, math.log2(guesses) + MATCH_BITS, match))
+
+    best = [0.0] * (length + 1)
+    previous = [None] * (length + 1)
+    for end in range(1, length + 1):
+        best[end] = best[end - 1] + brute
+        for start, bits, match in ends.get(end, ()):
+            if best[start] + bits < best[end]:
+                best[end] = best[start] + bits
+                previous[end] = match
+
+    matches = []
+    end = length
+    while end > 0:
+        match = previous[end]
+        if match is None:
+            end -= 1
+        else:
+            matches.append(match[:4])
+            end = match[0]
+    matches.reverse()
+    return (best[length], matches)
+
+def _EstimateTask(passwords, dictionaries):
+    '''Estimates a batch of passwords in a worker process.'''
+
+    dictionaries = _GetDictionaries(dictionaries)
+    return [int(_Estimate(password, dictionaries)[0])
+            for password in passwords
+           ]
+
+def _Cardinality(password):
+    '''Size of the character set an attacker would brute force.'''
+
+    cardinality = 0
+    rest = set(password)
+    for test, size in CLASSES:
+        found = {char for char in rest if test(char)}
+        if found:
+            cardinality += size
+            rest -= found
+    if rest:
+        cardinality += SYMBOLS if ''.join(rest).isascii() else OTHERS
+    return cardinality
+
+def _Matches(password, dictionaries):
+    '''Yields (start, end, kind, token, guesses) for each pattern found.'''
+
+    yield from _DictionaryMatches(password, dictionaries)
+    yield from _SpatialMatches(password)
+    yield from _RepeatMatches(password, dictionaries)
+    yield from _SequenceMatches(password)
+    yield from _DateMatches(password)
+
+def _DictionaryMatches(password, dictionaries):
+    '''Dictionary words, also reversed or with l33t substitutions.'''
+
+    length = len(password)
+    lower = password.lower()
+    unleet = lower.translate(L33T)
+    variants = [(lower, False, 1)]
+    if unleet != lower:
+        variants.append((unleet, False, 0))
+    variants.append((lower[::-1], True, 2))
+    for dictionary in dictionaries:
+        heads = dictionary.heads()
+        for text, reverse, factor in variants:
+            for i in range(length - MIN_WORD + 1):
+                if text[i:i + MIN_WORD] not in heads:
+                    continue
+                for j, rank in dictionary.matches(text, i):
+                    if reverse:
+                        start, end = length - j, length - i
+                    else:
+                        start, end = i, j
+                    token = password[start:end]
+                    guesses = rank * _UppercaseVariations(token)
+                    if factor:
+                        guesses *= factor
+                    else:
+                        # One more bit per substituted character.
+                        guesses *= 2 ** sum(a != b for a, b in zip(
+                            lower[start:end], text[start:end]))
+                    yield (start, end, 'dictionary', token, guesses)
+
+def _UppercaseVariations(token):
+    '''Number of ways to capitalize a word like 'token' does.'''
+
+    if token.islower() or not any(map(str.isalpha, token)):
+        return 1
+    if token.isupper() or token[:1].isupper() and token[1:].islower() or \
+       token[-1:].isupper() and token[:-1].islower():
+        return 2
+    upper = sum(map(str.isupper, token))
+    lower = sum(map(str.islower, token))
+    return sum(math.comb(upper + lower, k)
+               for k in range(1, min(upper, lower) + 1)
+              )
+
+@functools.lru_cache(maxsize=None)
+def _KeyboardGraph():
+    '''Returns the keyboard graph used to find walks.
+
+Return:
+shifted (dict)  - {char: whether typed with shift}, for every key.
+steps   (dict)  - {(char, next char): direction} for adjacent keys.
+degree  (float) - mean number of neighbors of a key.
+'''
+    keys = {}
+    shifted = {}
+    for row, (plain, shift) in enumerate(KEYBOARD):
+        for column, (char, upper) in enumerate(zip(plain, shift)):
+            keys[char] = keys[upper] = (row, column)
+            shifted[char] = False
+            shifted[upper] = True
+    steps = {}
+    for char, (row, column) in keys.items():
+        for other, (other_row, other_column) in keys.items():
+            if (other_row, other_column) in _Neighbors((row, column)):
+                steps[(char, other)] = (other_row - row,
+                                        other_column - column
+                                       )
+    positions = set(keys.values())
+    degree = sum(len(_Neighbors(position) & positions)
+                 for position in positions
+                ) / len(positions)
+    return (shifted, steps, degree)
+
+def _Neighbors(position):
+    '''Positions adjacent to a key on the staggered keyboard.'''
+
+    row, column = position
+    return {(row, column - 1), (row, column + 1),
+            (row - 1, column), (row - 1, column + 1),
+            (row + 1, column - 1), (row + 1, column),
+           }
+
+def _SpatialMatches(password):
+    '''Keyboard walks: runs of adjacent keys, such as 'qwerty' or 'zaq1'.'''
+
+    shifted, steps, degree = _KeyboardGraph()
+    nkeys = len(shifted) // 2
+    length = len(password)
+    i = 0
+    while i < length - 1:
+        j = i
+        turns = 0
+        direction = None
+        while j + 1 < length:
+            step = steps.get((password[j], password[j + 1]))
+            if step is None:
+                break
+            if step != direction:
+                turns += 1
+                direction = step
+            j += 1
+        if j - i + 1 >= MIN_WALK:
+            token = password[i:j + 1]
+            shifts = sum(shifted[char] for char in token)
+            yield (i, j + 1, 'spatial', token,
+                   _SpatialGuesses(len(token), turns, shifts, nkeys, degree))
+            i = j
+        else:
+            i += 1
+
+def _SpatialGuesses(length, turns, shifted, nkeys, degree):
+    '''Number of keyboard walks of 'length' keys with up to 'turns'.'''
+
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * nkeys * degree ** j
+    unshifted = length - shifted
+    if shifted and unshifted:
+        guesses *= sum(math.comb(length, k)
+                       for k in range(1, min(shifted, unshifted) + 1)
+                      )
+    elif shifted:
+        guesses *= 2
+    return guesses
+
+def _RepeatMatches(password, dictionaries):
+    '''Repeated characters or blocks, such as 'aaaa' or 'abcabc'.'''
+
+    i = 0
+    while True:
+        greedy = _REPEAT_GREEDY.search(password, i)
+        if greedy is None:
+            return
+        i = greedy.start()
+        lazy = _REPEAT_LAZY.match(password, i)
+        # Prefer the longest match and, for equal lengths, the shortest
+        # repeated block.
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            match, base = greedy, _REPEAT_LAZY.fullmatch(greedy.group(0))[1]
+        else:
+            match, base = lazy, lazy.group(1)
+        token = match.group(0)
+        bits = _Estimate(base, dictionaries)[0]
+        yield (i, i + len(token), 'repeat', token,
+               2 ** bits * (len(token) // len(base))
+              )
+        i += len(token)
+
+def _SequenceMatches(password):
+    '''Sequences with a constant step, such as 'abcd', '7531' or 'zyx'.'''
+
+    codes = [ord(char) for char in password]
+    length = len(codes)
+    i = 0
+    while i < length - 1:
+        step = codes[i + 1] - codes[i]
+        j = i + 1
+        while j + 1 < length and codes[j + 1] - codes[j] == step:
+            j += 1
+        if 0 < abs(step) <= MAX_SEQUENCE_STEP and j - i + 1 >= MIN_SEQUENCE:
+            token = password[i:j + 1]
+            first = token[0]
+            if first in 'aAzZ019':
+                base = 4
+            elif first.isdigit():
+                base = 10
+            elif first.isalpha():
+                base = 26 if first.islower() else 52
+            else:
+                base = SYMBOLS
+            if step < 0:
+                base *= 2
+            yield (i, j + 1, 'sequence', token, base * len(token))
+            i = j
+        else:
+            i += 1
+
+def _DateMatches(password):
+    '''Dates, with or without separators, and years.'''
+
+    for match in DATE_SEPARATED.finditer(password):
+        first, separator, middle, last = match.groups()
+        year = _DateYear((int(first), int(middle), int(last)),
+                         (len(first), len(middle), len(last))
+                        )
+        if year is not None:
+            yield (match.start(), match.end(), 'date', match.group(0),
+                   _DateGuesses(year) * 4
+                  )
+    for digits in _DIGITS.finditer(password):
+        for i in range(digits.start(), digits.end() - 3):
+            for j in range(i + 4, min(digits.end(), i + 8) + 1):
+                token = password[i:j]
+                year = _DigitsYear(token)
+                if year is not None:
+                    yield (i, j, 'date', token, _DateGuesses(year))
+    for match in YEAR.finditer(password):
+        yield (match.start(), match.end(), 'year', match.group(0),
+               max(abs(int(match.group(0)) - REFERENCE_YEAR), MIN_YEAR_SPACE)
+              )
+
+def _DigitsYear(token):
+    '''Year of the most recent date that 'token' (digits only) can be.'''
+
+    years = []
+    for size in (2, 4):
+        rest = len(token) - size
+        if not 2 <= rest <= 4:
+            continue
+        for year, day_month in ((token[:size], token[size:]),
+                                (token[-size:], token[:-size])
+                               ):
+            for split in range(1, len(day_month)):
+                first, second = day_month[:split], day_month[split:]
+                if len(first) > 2 or len(second) > 2:
+                    continue
+                found = _DateYear((int(year), int(first), int(second)),
+                                  (size, len(first), len(second))
+                                 )
+                if found is not None:
+                    years.append(found)
+    return min(years, key=lambda year: abs(year - REFERENCE_YEAR),
+               default=None
+              )
+
+def _DateYear(values, sizes):
+    '''Returns the year of a date given as (year, day, month) in any
+order, or None if the values do not form a date.
+'''
+    for order in ((0, 1, 2), (2, 1, 0), (2, 0, 1), (0, 2, 1)):
+        year, day, month = (values[k] for k in order)
+        size = sizes[order[0]]
+        if size not in (2, 4) or sizes[order[1]] > 2 or sizes[order[2]] > 2:
+            continue
+        if size == 2:
+            year += 1900 if year >= 50 else 2000
+        for day, month in ((day, month), (month, day)):
+            if 1 <= day <= 31 and 1 <= month <= 12 and 1000 <= year <= 2050:
+                return year
+    return None
+
+def _DateGuesses(year):
+    '''Number of dates as likely as one of 'year'.'''
+
+    return 365 * max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+def _GetDictionaries(dictionaries):
+    '''Returns the 'Dictionary' instances to use.'''
+
+    if dictionaries is None:
+        return _DefaultDictionaries()
+    return tuple(dictionary if isinstance(dictionary, Dictionary)
+                 else _OpenDictionary(dictionary)
+                 for dictionary in dictionaries
+                )
+
+@functools.lru_cache(maxsize=None)
+def _DefaultDictionaries():
+    '''Opens the dictionaries of 'DICTIONARIES' on first use.
+
+Text lists are compiled once into the per-user cache of
+'pwgen.CompileCached', and again whenever they change.
+'''
+    paths = {}
+    for path in sorted(glob.glob(os.path.join(DICTIONARIES, '*.txt'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        paths[name] = pwgen.CompileCached(path, CompileDictionary, '.pwd')
+    for path in sorted(glob.glob(os.path.join(DICTIONARIES, '*.pwd'))):
+        paths[os.path.splitext(os.path.basename(path))[0]] = path
+    return tuple(_OpenDictionary(path) for path in paths.values())
+
+@functools.lru_cache(maxsize=16)
+def _OpenDictionary(path):
+    '''Returns the 'Dictionary' of 'path', kept open for reuse.'''
+
+    return Dictionary(path)
+
+def Main(arguments=None):
+    '''Command line interface.
+
+Reads passwords, one per line, from the files given (or the standard
+input) and writes the strength in bits and the password, separated by a
+tab.
+'''
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=__title__,
+                                     description=__description__
+                                    )
+    parser.add_argument('files', nargs='*',
+                        help='arquivos com uma senha por linha '
+                             '(padrão: entrada padrão)'
+                       )
+    parser.add_argument('-w', '--workers', type=int,
+                        help='avalia as senhas em paralelo com WORKERS '
+                             'processos'
+                       )
+    parser.add_argument('-d', '--dictionary', action='append',
+                        help='dicionário compilado (pode ser repetido; '
+                             f'padrão: os de {DICTIONARIES})'
+                       )
+    options = parser.parse_args(arguments)
+
+    def passwords():
+        for path in options.files or ['-']:
+            if path == '-':
+                lines = sys.stdin
+            else:
+                lines = open(path, encoding='UTF-8', errors='replace')
+            with lines:
+                for line in lines:
+                    yield line.rstrip('\r\n')
+
+    first, second = itertools.tee(passwords())
+    output = sys.stdout
+    try:
+        for bits, password in zip(IterEstimate(first, options.dictionary,
+                                               options.workers
+                                              ),
+                                  second
+                                 ):
+            output.write(f'{bits}\t{password}\n')
+        output.flush()
+    except BrokenPipeError:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    return 0
+
+# main ------------------------------------------------------------------------
+if __name__ == '__main__':
+    sys.exit(Main())